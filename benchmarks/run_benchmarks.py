@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""End-to-end agent loop benchmarks against a scripted model and fake backend.
+
+Each scenario runs in its own subprocess so peak RSS is per scenario. Results
+are printed as a table and written to a JSON file for comparing commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenarios slack_scroll_read --steps 20
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path to import the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.scenarios import SCENARIOS, ScriptedClient, slack_scroll_read
+from src.computer_use_agent import AgentConfig, ComputerUseAgent
+from src.computer_use_agent.actions import FakeBackend
+from src.computer_use_agent.utils.log_stats import percentile
+
+CATEGORIES = ["model", "execute", "scroll", "capture", "encode", "sleep"]
+SCROLL_ACTIONS = ("scroll_document", "scroll_at")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class StepTimer:
+    """Attributes wall time to per-step categories by wrapping hot-path calls.
+
+    A new step starts at every model call; work before the first call
+    (initial screenshot) is recorded as step 0.
+    """
+
+    def __init__(self):
+        """Initialize with an empty setup step."""
+        self.steps: List[Dict[str, Any]] = [self._new_step(time.perf_counter())]
+        self._active: set = set()
+
+    @staticmethod
+    def _new_step(start: float) -> Dict[str, Any]:
+        """Create an empty step bucket."""
+        return {"start": start, "payload_bytes": 0, **{c: 0.0 for c in CATEGORIES}}
+
+    def begin_step(self, request: Dict[str, Any]) -> None:
+        """Start a new step at a model call.
+
+        Args:
+            request: Summary of the request contents
+        """
+        step = self._new_step(time.perf_counter())
+        step["payload_bytes"] = request["image_bytes"] + request["text_chars"]
+        step["inline_images"] = request["images"]
+        self.steps.append(step)
+
+    def wrap(self, owner: Any, attribute: str, category: str) -> None:
+        """Replace owner.attribute with a wrapper timing it under category.
+
+        Args:
+            owner: Object or module holding the callable
+            attribute: Attribute name of the callable
+            category: Category the time is attributed to
+        """
+        original = getattr(owner, attribute)
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            # Simulated model latency is model time, not an agent sleep
+            if category == "sleep" and "model" in self._active:
+                return original(*args, **kwargs)
+            self._active.add(category)
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.steps[-1][category] += time.perf_counter() - start
+                self._active.discard(category)
+
+        setattr(owner, attribute, timed)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Mean, p50, p95 and total of a sample.
+
+    Args:
+        values: Sample values
+
+    Returns:
+        Summary dictionary
+    """
+    return {
+        "mean": statistics.fmean(values) if values else 0.0,
+        "p50": percentile(values, 0.5) or 0.0,
+        "p95": percentile(values, 0.95) or 0.0,
+        "total": sum(values),
+    }
+
+
+def run_scenario(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario in this process and collect its measurements.
+
+    Args:
+        args: Parsed command-line arguments (single scenario)
+
+    Returns:
+        Result dictionary for the scenario
+    """
+    factory: Callable = SCENARIOS[args.scenario]
+    scenario = (
+        slack_scroll_read(args.steps)
+        if args.scenario == "slack_scroll_read" and args.steps
+        else factory()
+    )
+    timer = StepTimer()
+
+    backend = FakeBackend(
+        realtime=not args.no_realtime,
+        pixel_scroll=args.pixel_scroll,
+        **scenario.backend_kwargs,
+    )
+    client = ScriptedClient(
+        scenario.turns, latency=args.model_latency, on_request=timer.begin_step
+    )
+    config = AgentConfig(
+        goal=scenario.description,
+        verbose=False,
+        save_progress=False,
+        countdown_seconds=0,
+        max_iterations=len(scenario.turns) + 1,
+        adaptive_settle=not args.fixed_sleeps,
+        input_pause=0.5 if args.fixed_sleeps else 0.1,
+        screenshot_format=args.screenshot_format,
+        trace=args.trace,
+        stream_responses=args.stream,
+        pipeline_capture=args.pipeline,
+        delta_screenshots=args.delta,
+        spool_screenshots=args.spool,
+        # Scripted turns can't react to loop hints (slack_scroll_read scrolls
+        # up at the top of its document on purpose)
+        loop_detection=False,
+        pixel_scroll=args.pixel_scroll,
+        **scenario.config_kwargs,
+    )
+    agent = ComputerUseAgent(config, backend=backend, client=client)
+
+    if args.stream:
+        # Actions overlap the stream; "execute" is only the wait after it ends
+        timer.wrap(agent, "_stream_model_response", "model")
+        timer.wrap(agent.dispatcher, "collect", "execute")
+    else:
+        timer.wrap(client.models, "generate_content", "model")
+        timer.wrap(agent.executor, "execute_function_calls", "execute")
+    for action in SCROLL_ACTIONS:
+        timer.wrap(agent.executor, f"_{action}", "scroll")
+    timer.wrap(backend, "screenshot", "capture")
+    timer.wrap(agent.screen.encoder, "encode", "encode")
+    timer.wrap(time, "sleep", "sleep")
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        success = agent.run()
+        wall = time.perf_counter() - start
+        agent.close()
+
+    steps = timer.steps[1:]
+    for index, step in enumerate(steps):
+        end = steps[index + 1]["start"] if index + 1 < len(steps) else start + wall
+        step["wall"] = end - step["start"]
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    peak_rss_mb = max_rss / (1024 * 1024 if platform.system() == "Darwin" else 1024)
+    payloads = [float(step["payload_bytes"]) for step in steps]
+
+    result = {
+        "description": scenario.description,
+        "success": success,
+        "steps": len(steps),
+        "wall_seconds": wall,
+        "peak_rss_mb": peak_rss_mb,
+        "setup": {c: timer.steps[0][c] for c in CATEGORIES},
+        "per_step": {
+            c: summarize([step[c] for step in steps]) for c in CATEGORIES + ["wall"]
+        },
+        "payload_bytes": {
+            "mean": statistics.fmean(payloads) if payloads else 0.0,
+            "max": max(payloads, default=0.0),
+            "total": sum(payloads),
+        },
+        "inline_images_max": max((s.get("inline_images", 0) for s in steps), default=0),
+    }
+    # Scroll handler time per 1000 units of the model's scroll magnitude
+    scroll_units = sum(
+        call_args.get("magnitude", 0)
+        for turn in scenario.turns
+        if not isinstance(turn, str)
+        for name, call_args in turn
+        if name in SCROLL_ACTIONS
+    )
+    if scroll_units:
+        scroll_seconds = sum(step["scroll"] for step in timer.steps)
+        result["scroll_ms_per_1000_units"] = (
+            scroll_seconds * 1000 / (scroll_units / 1000)
+        )
+    if agent.frame_pipeline is not None:
+        result["pipeline"] = asdict(agent.frame_pipeline.stats)
+        result["pipeline"]["saved_per_step"] = (
+            agent.frame_pipeline.stats.saved_seconds / len(steps) if steps else 0.0
+        )
+    if agent.spool is not None:
+        result["spool"] = asdict(agent.spool.stats)
+    if args.trace:
+        trace_path = RESULTS_DIR / (
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{args.scenario}.trace.json"
+        )
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        agent.tracer.export_chrome_trace(trace_path)
+        result["trace_file"] = str(trace_path)
+        result["spans"] = agent.tracer.totals()
+    return result
+
+
+def git_commit() -> str:
+    """Get the current git commit hash (or 'unknown')."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    """Print per-scenario step latency breakdown.
+
+    Args:
+        results: Results keyed by scenario name
+    """
+    for name, result in results.items():
+        if "error" in result:
+            print(f"\n❌ {name}: {result['error']}")
+            continue
+        print(f"\n{'=' * 72}")
+        print(
+            f"{name}: {result['description']} — {result['steps']} steps, "
+            f"{result['wall_seconds']:.1f}s wall, "
+            f"peak RSS {result['peak_rss_mb']:.0f} MB"
+        )
+        print(f"{'=' * 72}")
+        print(f"{'per step (ms)':<16}{'mean':>10}{'p50':>10}{'p95':>10}{'total s':>10}")
+        for category in CATEGORIES + ["wall"]:
+            stats = result["per_step"][category]
+            print(
+                f"{category:<16}{stats['mean'] * 1000:>10.1f}"
+                f"{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}"
+                f"{stats['total']:>10.2f}"
+            )
+        payload = result["payload_bytes"]
+        print(
+            f"payload KB: mean {payload['mean'] / 1024:.0f}, "
+            f"max {payload['max'] / 1024:.0f}, total {payload['total'] / 1024:.0f}; "
+            f"max inline images {result['inline_images_max']}"
+        )
+        if "pipeline" in result:
+            pipeline = result["pipeline"]
+            print(
+                f"pipeline: {pipeline['hits']} prefetched / {pipeline['misses']} "
+                f"on demand, {pipeline['discarded']} discarded; saved "
+                f"{pipeline['saved_per_step'] * 1000:.1f} ms per step"
+            )
+        if "scroll_ms_per_1000_units" in result:
+            print(
+                f"scroll: {result['scroll_ms_per_1000_units']:.0f} ms "
+                "per 1000 units of magnitude"
+            )
+        if "spool" in result:
+            spool = result["spool"]
+            print(
+                f"spool: {spool['spilled']} screenshots spilled "
+                f"({spool['spool_bytes'] / 1024:.0f} KB), at most "
+                f"{spool['peak_resident_bytes'] / 1024:.0f} KB resident"
+            )
+        if "trace_file" in result:
+            print(f"trace: {result['trace_file']}")
+    print(
+        "\n(scroll, capture, encode and sleep overlap execute; "
+        "they are not additive)"
+    )
+
+
+def main() -> None:
+    """Run the selected scenarios and write a JSON results file."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)  # child mode
+    parser.add_argument("--steps", type=int, help="Scroll steps for slack_scroll_read")
+    parser.add_argument(
+        "--model-latency",
+        type=float,
+        default=0.05,
+        help="Simulated model latency per call in seconds (default: 0.05)",
+    )
+    parser.add_argument("--fixed-sleeps", action="store_true")
+    parser.add_argument("--screenshot-format", default="png")
+    parser.add_argument(
+        "--no-realtime",
+        action="store_true",
+        help="Don't simulate pyautogui movement/typing/pause durations",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Also write a Chrome trace per scenario to benchmarks/results/",
+    )
+    parser.add_argument(
+        "--pixel-scroll",
+        action="store_true",
+        help="Scroll with pixel-delta gestures instead of 5-click chunks",
+    )
+    parser.add_argument(
+        "--spool",
+        action="store_true",
+        help="Spool conversation screenshots to disk between model calls",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Send changed screen regions instead of full frames for small changes",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Encode settled frames in the background (pipelined capture)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream scripted responses and dispatch actions early",
+    )
+    parser.add_argument("--output", type=Path, help="JSON results file")
+    args = parser.parse_args()
+
+    if args.scenario:
+        # Child: run in a scratch directory so logs don't pile up in the repo
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            result = run_scenario(args)
+        print(json.dumps(result))
+        return
+
+    passthrough = [
+        f"--model-latency={args.model_latency}",
+        f"--screenshot-format={args.screenshot_format}",
+    ]
+    if args.steps:
+        passthrough.append(f"--steps={args.steps}")
+    if args.fixed_sleeps:
+        passthrough.append("--fixed-sleeps")
+    if args.no_realtime:
+        passthrough.append("--no-realtime")
+    if args.trace:
+        passthrough.append("--trace")
+    if args.stream:
+        passthrough.append("--stream")
+    if args.pipeline:
+        passthrough.append("--pipeline")
+    if args.delta:
+        passthrough.append("--delta")
+    if args.spool:
+        passthrough.append("--spool")
+    if args.pixel_scroll:
+        passthrough.append("--pixel-scroll")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in args.scenarios:
+        print(f"▶️  Running {name}...")
+        child = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--scenario", name]
+            + passthrough,
+            capture_output=True,
+            text=True,
+        )
+        if child.returncode != 0:
+            results[name] = {"error": child.stderr.strip().splitlines()[-1:]}
+            continue
+        results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    print_table(results)
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{git_commit()}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "settings": {
+            "model_latency": args.model_latency,
+            "fixed_sleeps": args.fixed_sleeps,
+            "screenshot_format": args.screenshot_format,
+            "realtime": not args.no_realtime,
+            "stream": args.stream,
+            "pipeline": args.pipeline,
+            "delta": args.delta,
+            "spool": args.spool,
+            "pixel_scroll": args.pixel_scroll,
+        },
+        "scenarios": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n📄 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
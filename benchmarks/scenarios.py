@@ -0,0 +1,259 @@
+"""Scripted model scenarios for the agent loop benchmarks."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from google.genai import types
+
+from src.computer_use_agent.utils.replay import summarize_contents
+from src.computer_use_agent.utils.streaming import split_response
+
+# A model turn: list of (function_name, args), or a final text answer
+Turn = List[Tuple[str, Dict[str, Any]]] | str
+
+
+@dataclass
+class Scenario:
+    """A scripted benchmark scenario.
+
+    Attributes:
+        name: Scenario identifier
+        description: What the scenario exercises
+        turns: Model turns served in order
+        backend_kwargs: FakeBackend overrides (e.g. a taller document)
+        config_kwargs: AgentConfig overrides the scenario depends on
+    """
+
+    name: str
+    description: str
+    turns: List[Turn]
+    backend_kwargs: Dict[str, Any] = field(default_factory=dict)
+    config_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+class _ScriptedModels:
+    """models namespace of ScriptedClient."""
+
+    def __init__(self, client: "ScriptedClient"):
+        """Initialize scripted models namespace.
+
+        Args:
+            client: Owning scripted client
+        """
+        self._client = client
+
+    def generate_content(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> types.GenerateContentResponse:
+        """Serve the next scripted turn after the simulated latency."""
+        return self._client.next_response(contents)
+
+    def generate_content_stream(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> Iterator[types.GenerateContentResponse]:
+        """Stream the next scripted turn one part at a time."""
+        return self._client.stream_response(contents)
+
+
+class ScriptedClient:
+    """Stand-in for genai.Client that plays back a scenario's turns."""
+
+    def __init__(
+        self,
+        turns: List[Turn],
+        latency: float = 0.0,
+        on_request: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """Initialize scripted client.
+
+        Args:
+            turns: Model turns to serve in order
+            latency: Simulated model latency per call in seconds
+            on_request: Callback receiving a summary of every request
+        """
+        self.turns = turns
+        self.latency = latency
+        self.on_request = on_request
+        self.position = 0
+        self.models = _ScriptedModels(self)
+
+    def next_response(self, contents: Any) -> types.GenerateContentResponse:
+        """Build the response for the next scripted turn.
+
+        Args:
+            contents: Request contents (summarized for payload accounting)
+
+        Returns:
+            Response with function calls, or final text when the script ends
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return self._build_response(contents)
+
+    def stream_response(self, contents: Any) -> Iterator[types.GenerateContentResponse]:
+        """Yield the next scripted turn as per-part chunks.
+
+        The simulated latency is spread evenly across the chunks, so later
+        function calls arrive after earlier ones as they would from the API.
+
+        Args:
+            contents: Request contents (summarized for payload accounting)
+
+        Yields:
+            Response chunks
+        """
+        chunks = split_response(self._build_response(contents))
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    def _build_response(self, contents: Any) -> types.GenerateContentResponse:
+        """Build the response for the next scripted turn without waiting.
+
+        Args:
+            contents: Request contents (summarized for payload accounting)
+
+        Returns:
+            Response with function calls, or final text when the script ends
+        """
+        if self.on_request:
+            self.on_request(summarize_contents(contents))
+
+        turn = self.turns[self.position] if self.position < len(self.turns) else "Done."
+        self.position += 1
+
+        if isinstance(turn, str):
+            parts = [types.Part(text=turn)]
+        else:
+            parts = [
+                types.Part(function_call=types.FunctionCall(name=name, args=args))
+                for name, args in turn
+            ]
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=0, candidates_token_count=len(parts) * 20
+        )
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(content=types.Content(role="model", parts=parts))
+            ],
+            usage_metadata=usage,
+        )
+
+
+def slack_scroll_read(steps: int = 60) -> Scenario:
+    """Read a long Slack channel: scroll up to the start, then down to the end.
+
+    Args:
+        steps: Number of scroll steps before the final summary
+
+    Returns:
+        Scenario
+    """
+    turns: List[Turn] = [[("key_combination", {"keys": "command+k"})]]
+    turns.append([("type_text_at", {"x": 500, "y": 60, "text": "#engineering"})])
+    for step in range(steps):
+        direction = "up" if step < steps // 2 else "down"
+        if step % 10 == 9:
+            turns.append([("wait_5_seconds", {})])
+        turns.append([("scroll_document", {"direction": direction, "magnitude": 1500})])
+    turns.append("Summary: the channel discussed the release plan.")
+    return Scenario(
+        name="slack_scroll_read",
+        description=f"{steps}-step scroll-heavy channel read",
+        turns=turns,
+        backend_kwargs={"document_screens": 40},
+    )
+
+
+def slack_scroll_until_end(document_screens: int = 10) -> Scenario:
+    """Read a Slack channel with scroll_until_end instead of scroll steps.
+
+    Args:
+        document_screens: Channel height in screens
+
+    Returns:
+        Scenario
+    """
+    turns: List[Turn] = [
+        [("key_combination", {"keys": "command+k"})],
+        [("type_text_at", {"x": 500, "y": 60, "text": "#engineering"})],
+        [("scroll_until_end", {"direction": "down"})],
+        [("scroll_until_end", {"direction": "up"})],
+        "Summary: the channel discussed the release plan.",
+    ]
+    return Scenario(
+        name="slack_scroll_until_end",
+        description=f"{document_screens}-screen channel read with scroll_until_end",
+        turns=turns,
+        backend_kwargs={"document_screens": document_screens},
+        config_kwargs={"scroll_until_end": True},
+    )
+
+
+def multi_action_turns(turn_count: int = 15) -> Scenario:
+    """Turns that each batch several actions (click, type, shortcut).
+
+    Args:
+        turn_count: Number of multi-action turns
+
+    Returns:
+        Scenario
+    """
+    turns: List[Turn] = []
+    for index in range(turn_count):
+        turns.append(
+            [
+                ("click_at", {"x": 300 + index * 10, "y": 400}),
+                ("type_text_at", {"x": 500, "y": 900, "text": f"reply {index}"}),
+                ("key_combination", {"keys": "command+k"}),
+            ]
+        )
+    turns.append("Sent all replies.")
+    return Scenario(
+        name="multi_action_turns",
+        description=f"{turn_count} turns with 3 actions each",
+        turns=turns,
+    )
+
+
+def long_typing(prompt_chars: int = 2000, prompts: int = 3) -> Scenario:
+    """Type long multi-line prompts into a chat box (e.g. Cline).
+
+    Args:
+        prompt_chars: Characters per prompt
+        prompts: Number of prompts typed
+
+    Returns:
+        Scenario
+    """
+    sentence = "Refactor the auth module, keep the public API stable and add tests. "
+    text = (sentence * (prompt_chars // len(sentence) + 1))[:prompt_chars]
+    text = "\n".join(text[i : i + 250] for i in range(0, len(text), 250))
+
+    turns: List[Turn] = []
+    for _ in range(prompts):
+        turns.append(
+            [
+                (
+                    "type_text_at",
+                    {"x": 500, "y": 900, "text": text, "press_enter": True},
+                )
+            ]
+        )
+        turns.append([("wait_5_seconds", {})])
+    turns.append("Prompts submitted.")
+    return Scenario(
+        name="long_typing",
+        description=f"{prompts} prompts of {prompt_chars} chars",
+        turns=turns,
+    )
+
+
+SCENARIOS: Dict[str, Callable[[], Scenario]] = {
+    "slack_scroll_read": slack_scroll_read,
+    "slack_scroll_until_end": slack_scroll_until_end,
+    "multi_action_turns": multi_action_turns,
+    "long_typing": long_typing,
+}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for screenshot encoding options on synthetic frames."""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageDraw
+
+from src.computer_use_agent.actions.encoding import ScreenshotEncoder
+
+# Native display sizes to simulate
+FRAME_SIZES = {
+    "5k": (5120, 2880),
+    "retina": (2880, 1800),
+    "1440p": (1440, 900),
+}
+
+# (label, encoder kwargs)
+ENCODING_OPTIONS = [
+    ("png native lvl6", dict(image_format="png", target_size=None)),
+    ("png 1440x900 lvl6", dict(image_format="png")),
+    ("png 1440x900 lvl1", dict(image_format="png", png_compress_level=1)),
+    ("png 1440x900 gray", dict(image_format="png", grayscale=True)),
+    ("jpeg 1440x900 q85", dict(image_format="jpeg", quality=85)),
+    ("jpeg 1440x900 q70", dict(image_format="jpeg", quality=70)),
+    ("webp 1440x900 q80", dict(image_format="webp", quality=80)),
+]
+
+
+def make_frame(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Draw a UI-like synthetic frame (sidebar, text rows, avatars).
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        seed: Random seed for reproducible content
+
+    Returns:
+        Synthetic RGB frame
+    """
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+
+    sidebar = width // 6
+    draw.rectangle([0, 0, sidebar, height], fill=(63, 14, 64))
+    row_height = max(12, height // 60)
+    for y in range(row_height, height, row_height * 2):
+        # Sidebar entries
+        draw.rectangle(
+            [row_height, y, sidebar - row_height, y + row_height // 2],
+            fill=(200, 180, 200),
+        )
+        # Avatar + "text" made of short dark dashes
+        draw.ellipse(
+            [sidebar + row_height, y, sidebar + 2 * row_height, y + row_height]
+        )
+        x = sidebar + 3 * row_height
+        while x < width - row_height:
+            word = rng.randint(row_height, row_height * 5)
+            shade = rng.randint(20, 90)
+            draw.rectangle(
+                [x, y + 2, x + word, y + row_height - 2], fill=(shade, shade, shade)
+            )
+            x += word + row_height // 2
+
+    return image
+
+
+def benchmark(image: Image.Image, repeats: int) -> None:
+    """Encode a frame with each option and print timing and size.
+
+    Args:
+        image: Frame to encode
+        repeats: Encodes per option (best time is reported)
+    """
+    print(f"{'option':<22}{'best ms':>10}{'mean ms':>10}{'KB':>10}")
+    for label, kwargs in ENCODING_OPTIONS:
+        encoder = ScreenshotEncoder(**kwargs)
+        timings = []
+        data = b""
+        for _ in range(repeats):
+            start = time.perf_counter()
+            data = encoder.encode(image)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{label:<22}{min(timings):>10.1f}"
+            f"{sum(timings) / len(timings):>10.1f}{len(data) / 1024:>10.0f}"
+        )
+
+
+def main() -> None:
+    """Run the encoding benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(FRAME_SIZES),
+        default=list(FRAME_SIZES),
+        help="Synthetic frame sizes to benchmark",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Encodes per option")
+    args = parser.parse_args()
+
+    for name in args.sizes:
+        width, height = FRAME_SIZES[name]
+        print(f"\n{'=' * 52}")
+        print(f"FRAME {name} ({width}x{height})")
+        print(f"{'=' * 52}")
+        benchmark(make_frame(width, height), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
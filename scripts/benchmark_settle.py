@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Measure settle-wait latency per action against the old fixed 1 s sleep.
+
+Run it on a real display (the pyautogui backend, macOS needs screen recording
+permission) to compare the cost of a full screenshot with the backend's cheap
+sample capture, and the time an adaptive settle takes after an input event.
+The action is a bare shift key press, so the screen stays unchanged and the
+settle time is pure detection overhead.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path to import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.computer_use_agent.actions.backends import BACKENDS, create_backend
+from src.computer_use_agent.actions.settle import VisualSettleDetector
+
+# Fixed delay the settle wait replaced after most actions
+OLD_SLEEP_SECONDS = 1.0
+
+
+def time_calls(fn: Callable[[], object], repeats: int) -> List[float]:
+    """Time repeated calls of a function.
+
+    Args:
+        fn: Function to call
+        repeats: Number of calls
+
+    Returns:
+        Seconds per call
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print mean and median of timings in milliseconds.
+
+    Args:
+        label: Row label
+        timings: Seconds per sample
+    """
+    print(
+        f"{label:<28}{statistics.mean(timings) * 1000:>10.1f}"
+        f"{statistics.median(timings) * 1000:>10.1f}"
+    )
+
+
+def main() -> None:
+    """Run the settle benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        default="pyautogui",
+        help="Desktop backend (fake only exercises the code path)",
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Samples per row")
+    args = parser.parse_args()
+
+    backend = create_backend(args.backend)
+    backend.set_pause(0.0)
+    try:
+        full = backend.screenshot()
+        sample = backend.sample()
+        print(f"full frame {full.size}, sample frame {sample.size}\n")
+        print(f"{'ms':<28}{'mean':>10}{'p50':>10}")
+        report("screenshot()", time_calls(backend.screenshot, args.repeats))
+        report("sample()", time_calls(backend.sample, args.repeats))
+
+        for label, grab_sample in (
+            ("settle, full-frame samples", None),
+            ("settle, cheap samples", backend.sample),
+        ):
+            detector = VisualSettleDetector(backend.screenshot, grab_sample=grab_sample)
+
+            def action() -> None:
+                backend.press("shift")
+                detector.wait()
+
+            report(label, time_calls(action, args.repeats))
+        report(
+            f"old fixed sleep ({OLD_SLEEP_SECONDS:.0f} s)",
+            time_calls(lambda: time.sleep(OLD_SLEEP_SECONDS), 1),
+        )
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
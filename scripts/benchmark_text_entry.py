@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark keystroke typing vs clipboard paste against the fake backend."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.computer_use_agent.actions.backends import FakeBackend, FakeClipboard
+from src.computer_use_agent.actions.text_entry import TextTyper
+
+
+class TimedClipboard(FakeClipboard):
+    """In-memory clipboard with a simulated pbcopy/pbpaste round trip."""
+
+    def __init__(self, latency: float = 0.01):
+        """Initialize clipboard.
+
+        Args:
+            latency: Simulated seconds per clipboard command
+        """
+        super().__init__()
+        self.latency = latency
+
+    def get(self) -> str:
+        """Read the clipboard."""
+        time.sleep(self.latency)
+        return super().get()
+
+    def set(self, text: str) -> None:
+        """Write the clipboard."""
+        time.sleep(self.latency)
+        super().set(text)
+
+
+def make_prompt(length: int) -> str:
+    """Build a multi-line prompt of roughly the requested length.
+
+    Args:
+        length: Target character count
+
+    Returns:
+        Prompt text with a newline every ~200 characters
+    """
+    sentence = "Refactor the authentication module and keep the API stable. "
+    text = (sentence * (length // len(sentence) + 1))[:length]
+    return "\n".join(text[i : i + 200] for i in range(0, len(text), 200))
+
+
+def main() -> None:
+    """Run the text entry benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[40, 400],
+        help="Prompt lengths in characters (keystroke mode takes ~0.05 s/char)",
+    )
+    parser.add_argument(
+        "--pause", type=float, default=0.1, help="Simulated pyautogui.PAUSE"
+    )
+    args = parser.parse_args()
+
+    print(f"{'chars':>8}{'mode':>8}{'seconds':>10}{'chars/sec':>12}")
+    for size in args.sizes:
+        text = make_prompt(size)
+        for mode, threshold in (("keys", len(text) + 1), ("paste", 0)):
+            backend = FakeBackend()
+            backend.set_pause(args.pause)
+            typer = TextTyper(
+                backend,
+                clipboard=TimedClipboard(),
+                paste_threshold=threshold,
+            )
+            start = time.perf_counter()
+            used = typer.type_text(text)
+            elapsed = time.perf_counter() - start
+            assert used == mode
+            print(
+                f"{len(text):>8}{mode:>8}{elapsed:>10.2f}{len(text) / elapsed:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
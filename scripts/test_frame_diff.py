@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test that screenshot dedupe never hides a one-character change."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageDraw
+
+from src.computer_use_agent.actions.frame_diff import FrameComparator
+
+# Characters with the fewest pixels, e.g. a short typed value
+SMALL_CHARACTERS = [".", ",", "1", "i", "l", "'"]
+
+# Native display sizes (standard and Retina)
+FRAME_SIZES = [(1440, 900), (2880, 1800)]
+
+
+def make_frame(size, text: str = "") -> Image.Image:
+    """Draw a text field, optionally holding some text.
+
+    Args:
+        size: Frame (width, height)
+        text: Text typed into the field
+
+    Returns:
+        RGB frame
+    """
+    frame = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(frame)
+    width, height = size
+    draw.rectangle(
+        (width // 4, height // 2, width * 3 // 4, height // 2 + 40), outline="gray"
+    )
+    if text:
+        draw.text((width // 4 + 8, height // 2 + 12), text, fill="black")
+    return frame
+
+
+def test_one_character_is_a_change() -> None:
+    """A single typed character must be reported as a changed screen."""
+    for size in FRAME_SIZES:
+        for char in SMALL_CHARACTERS:
+            comparator = FrameComparator()
+            comparator.compare(make_frame(size))
+            change = comparator.compare(make_frame(size, char))
+            assert change is not None and not change.unchanged, (size, char)
+            assert change.changed_pixels > 0, (size, char)
+
+
+def test_identical_frame_is_unchanged() -> None:
+    """An identical frame is reported as unchanged and keeps the reference."""
+    for size in FRAME_SIZES:
+        comparator = FrameComparator()
+        comparator.compare(make_frame(size, "abc"))
+        change = comparator.compare(make_frame(size, "abc"))
+        assert change is not None and change.unchanged, size
+        change = comparator.compare(make_frame(size, "abc."))
+        assert change is not None and not change.unchanged, size
+
+
+def main() -> None:
+    """Run the tests."""
+    for test in (test_one_character_is_a_change, test_identical_frame_is_unchanged):
+        test()
+        print(f"✅ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
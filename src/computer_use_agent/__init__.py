@@ -6,7 +6,8 @@ for macOS desktop automation with safety-first design.
 """
 
 from .agent import ComputerUseAgent
+from .async_agent import AsyncComputerUseAgent
 from .config.settings import AgentConfig
 
 __version__ = "1.0.0"
-__all__ = ["ComputerUseAgent", "AgentConfig"]
+__all__ = ["ComputerUseAgent", "AsyncComputerUseAgent", "AgentConfig"]
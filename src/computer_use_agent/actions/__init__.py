@@ -1,6 +1,41 @@
 """Action handlers for Computer Use Agent."""
 
 from .executor import ActionExecutor
+from .dispatch import ActionDispatcher
 from .screen import ScreenManager
+from .encoding import ScreenshotEncoder
+from .pipeline import FramePipeline, PipelineStats
+from .frame_diff import FrameChange, FrameComparator
+from .scroll_capture import SCROLL_UNTIL_END_DECLARATION, sheet_cell, stitch_frames
+from .settle import VisualSettleDetector, SettleResult
+from .text_entry import Clipboard, TextTyper
+from .backends import (
+    DesktopBackend,
+    PyAutoGUIBackend,
+    XvfbBackend,
+    FakeBackend,
+    create_backend,
+)
 
-__all__ = ["ActionExecutor", "ScreenManager"]
+__all__ = [
+    "ActionExecutor",
+    "ActionDispatcher",
+    "ScreenManager",
+    "ScreenshotEncoder",
+    "FramePipeline",
+    "PipelineStats",
+    "FrameChange",
+    "FrameComparator",
+    "SCROLL_UNTIL_END_DECLARATION",
+    "sheet_cell",
+    "stitch_frames",
+    "VisualSettleDetector",
+    "SettleResult",
+    "Clipboard",
+    "TextTyper",
+    "DesktopBackend",
+    "PyAutoGUIBackend",
+    "XvfbBackend",
+    "FakeBackend",
+    "create_backend",
+]
@@ -0,0 +1,564 @@
+"""Input/screen backends: pyautogui, Xvfb and an in-memory fake."""
+
+import os
+import select
+import shutil
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageGrab
+
+from .text_entry import Clipboard
+
+
+class DesktopBackend(ABC):
+    """Mouse, keyboard, scroll and screenshot primitives used by the agent."""
+
+    clipboard: Any
+    # Whether scroll_pixels() is available (otherwise only wheel clicks)
+    supports_pixel_scroll: bool = False
+
+    @abstractmethod
+    def size(self) -> Tuple[int, int]:
+        """Get the screen size in pixels.
+
+        Returns:
+            Tuple of (width, height)
+        """
+
+    @abstractmethod
+    def screenshot(self) -> Image.Image:
+        """Capture the current screen.
+
+        Returns:
+            Screenshot at native resolution
+        """
+
+    def sample(self) -> Image.Image:
+        """Capture a cheap frame for change detection.
+
+        Backends with a faster capture path than screenshot() return it here,
+        possibly at a lower resolution; the default is a full screenshot.
+
+        Returns:
+            Screenshot at native or reduced resolution
+        """
+        return self.screenshot()
+
+    @abstractmethod
+    def move_to(self, x: int, y: int, duration: float = 0.0) -> None:
+        """Move the mouse to a pixel position.
+
+        Args:
+            x: Target x coordinate
+            y: Target y coordinate
+            duration: Seconds the (animated) movement takes
+        """
+
+    @abstractmethod
+    def click(self) -> None:
+        """Click the left mouse button at the current position."""
+
+    @abstractmethod
+    def drag(self, dx: int, dy: int, duration: float = 0.0) -> None:
+        """Drag from the current position by an offset.
+
+        Args:
+            dx: Horizontal offset in pixels
+            dy: Vertical offset in pixels
+            duration: Seconds the drag takes
+        """
+
+    @abstractmethod
+    def scroll(self, clicks: int) -> None:
+        """Scroll the wheel at the current position.
+
+        Args:
+            clicks: Wheel clicks (positive scrolls up, negative scrolls down)
+        """
+
+    def scroll_pixels(self, dy: int, duration: float = 0.0) -> None:
+        """Scroll by a pixel delta with high-resolution (continuous) events.
+
+        Only available when supports_pixel_scroll is True.
+
+        Args:
+            dy: Pixels to scroll (positive scrolls up, negative scrolls down)
+            duration: Seconds to spread the events over (0 = a single event)
+
+        Raises:
+            NotImplementedError: If the backend has no pixel scrolling
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no pixel scrolling")
+
+    @abstractmethod
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """Type text key by key.
+
+        Args:
+            text: Text to type
+            interval: Seconds between keystrokes
+        """
+
+    @abstractmethod
+    def press(self, key: str) -> None:
+        """Press and release a single key.
+
+        Args:
+            key: Key name (pyautogui naming)
+        """
+
+    @abstractmethod
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """Press a key combination.
+
+        Args:
+            keys: Key names, modifiers first
+            interval: Seconds between key downs
+        """
+
+    def set_pause(self, seconds: float) -> None:
+        """Set the delay inserted after every input call.
+
+        Args:
+            seconds: Delay in seconds
+        """
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class PyAutoGUIBackend(DesktopBackend):
+    """Backend driving the real desktop through pyautogui."""
+
+    def __init__(self, failsafe: bool = True):
+        """Initialize pyautogui backend.
+
+        pyautogui is imported here rather than at module level because it
+        needs a display as soon as it is imported.
+
+        Args:
+            failsafe: Abort when the mouse hits a screen corner
+        """
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        self._pyautogui.FAILSAFE = failsafe
+        self.clipboard = Clipboard()
+
+        # pyautogui depends on pyobjc's Quartz bindings on macOS
+        try:
+            import Quartz
+        except ImportError:
+            Quartz = None
+        self._quartz = Quartz
+        self.supports_pixel_scroll = Quartz is not None
+
+    def size(self) -> Tuple[int, int]:
+        """Get the screen size in pixels."""
+        width, height = self._pyautogui.size()
+        return width, height
+
+    def screenshot(self) -> Image.Image:
+        """Capture the current screen."""
+        return self._pyautogui.screenshot()
+
+    def sample(self) -> Image.Image:
+        """Capture the main display in-process at 1x (nominal) resolution.
+
+        pyautogui shells out to screencapture and decodes a Retina PNG; a
+        Quartz window-list image skips the subprocess, the file and the codec
+        and has a quarter of the pixels.
+        """
+        quartz = self._quartz
+        if quartz is None:
+            return self.screenshot()
+        image = quartz.CGWindowListCreateImage(
+            quartz.CGDisplayBounds(quartz.CGMainDisplayID()),
+            quartz.kCGWindowListOptionOnScreenOnly,
+            quartz.kCGNullWindowID,
+            quartz.kCGWindowImageNominalResolution,
+        )
+        if image is None:  # No screen recording permission
+            return self.screenshot()
+        data = quartz.CGDataProviderCopyData(quartz.CGImageGetDataProvider(image))
+        return Image.frombuffer(
+            "RGBA",
+            (quartz.CGImageGetWidth(image), quartz.CGImageGetHeight(image)),
+            bytes(data),
+            "raw",
+            "BGRA",
+            quartz.CGImageGetBytesPerRow(image),
+            1,
+        )
+
+    def move_to(self, x: int, y: int, duration: float = 0.0) -> None:
+        """Move the mouse to a pixel position."""
+        self._pyautogui.moveTo(x, y, duration=duration)
+
+    def click(self) -> None:
+        """Click at the current position."""
+        self._pyautogui.click()
+
+    def drag(self, dx: int, dy: int, duration: float = 0.0) -> None:
+        """Drag from the current position by an offset."""
+        self._pyautogui.drag(dx, dy, duration=duration)
+
+    def scroll(self, clicks: int) -> None:
+        """Scroll the wheel at the current position."""
+        self._pyautogui.scroll(clicks)
+
+    def scroll_pixels(self, dy: int, duration: float = 0.0) -> None:
+        """Post continuous pixel scroll events at about 60 Hz via Quartz."""
+        if self._quartz is None:
+            raise NotImplementedError("Pixel scrolling needs macOS Quartz")
+        quartz = self._quartz
+        steps = max(1, round(duration * 60))
+        sent = 0
+        for step in range(steps):
+            # Spread dy evenly; the last event absorbs the rounding
+            delta = int(dy * (step + 1) / steps) - sent
+            sent += delta
+            event = quartz.CGEventCreateScrollWheelEvent(
+                None, quartz.kCGScrollEventUnitPixel, 1, delta
+            )
+            # Flag as trackpad-style continuous scrolling (no line acceleration)
+            quartz.CGEventSetIntegerValueField(
+                event, quartz.kCGScrollWheelEventIsContinuous, 1
+            )
+            quartz.CGEventPost(quartz.kCGHIDEventTap, event)
+            if step < steps - 1:
+                time.sleep(duration / steps)
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """Type text key by key."""
+        self._pyautogui.write(text, interval=interval)
+
+    def press(self, key: str) -> None:
+        """Press a single key."""
+        self._pyautogui.press(key)
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """Press a key combination."""
+        self._pyautogui.hotkey(*keys, interval=interval)
+
+    def set_pause(self, seconds: float) -> None:
+        """Set pyautogui.PAUSE."""
+        self._pyautogui.PAUSE = seconds
+
+
+class XvfbBackend(PyAutoGUIBackend):
+    """pyautogui backend running against a private headless Xvfb display."""
+
+    # macOS shortcuts the model emits are translated for X11 applications
+    KEY_MAP = {"command": "ctrl", "option": "alt"}
+
+    def __init__(
+        self,
+        width: int = 1440,
+        height: int = 900,
+        display: Optional[int] = None,
+        startup_timeout: float = 5.0,
+    ):
+        """Start Xvfb and attach pyautogui to it.
+
+        pyautogui opens its X connection when first imported and keeps it for
+        the life of the process, so a process can drive only one Xvfb display.
+        The display is set in $DISPLAY just for that import; screenshots and
+        the clipboard name it explicitly.
+
+        Args:
+            width: Virtual screen width
+            height: Virtual screen height
+            display: X display number to use (None = the first free one)
+            startup_timeout: Seconds to wait for Xvfb to accept connections
+
+        Raises:
+            RuntimeError: If Xvfb is missing or fails to start (e.g. the
+                requested display is already in use), or pyautogui is already
+                attached to another display
+        """
+        if not shutil.which("Xvfb"):
+            raise RuntimeError("Xvfb not found; install xvfb to use this backend")
+        if "pyautogui" in sys.modules:
+            raise RuntimeError(
+                "pyautogui is already attached to a display in this process"
+            )
+
+        # Xvfb writes the display number to this pipe once it is ready
+        read_fd, write_fd = os.pipe()
+        command = ["Xvfb"]
+        if display is not None:
+            command.append(f":{display}")
+        command += [
+            "-displayfd",
+            str(write_fd),
+            "-screen",
+            "0",
+            f"{width}x{height}x24",
+            "-nolisten",
+            "tcp",
+        ]
+        try:
+            self._process = subprocess.Popen(
+                command,
+                pass_fds=(write_fd,),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        finally:
+            os.close(write_fd)
+
+        try:
+            with os.fdopen(read_fd, "rb") as ready:
+                # Empty when Xvfb exits first, e.g. because the display is taken
+                if select.select([ready], [], [], startup_timeout)[0]:
+                    number = ready.readline().strip()
+                else:
+                    number = b""
+        except OSError:
+            number = b""
+        if not number.isdigit() or self._process.poll() is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            requested = "" if display is None else f" on display :{display}"
+            raise RuntimeError(f"Xvfb failed to start{requested}")
+        self.display = f":{number.decode()}"
+
+        saved = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = self.display
+        try:
+            super().__init__(failsafe=False)
+        except Exception:
+            self.close()
+            raise
+        finally:
+            if saved is None:
+                del os.environ["DISPLAY"]
+            else:
+                os.environ["DISPLAY"] = saved
+        self.clipboard = Clipboard(display=self.display)
+        # X11 only has wheel buttons
+        self.supports_pixel_scroll = False
+
+    def screenshot(self) -> Image.Image:
+        """Capture the Xvfb screen."""
+        return ImageGrab.grab(xdisplay=self.display)
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """Press a key combination, mapping macOS modifiers to X11 ones."""
+        super().hotkey(*(self.KEY_MAP.get(key, key) for key in keys), interval=interval)
+
+    def close(self) -> None:
+        """Stop the Xvfb server."""
+        if self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait(timeout=5)
+
+
+class FakeClipboard:
+    """In-memory clipboard."""
+
+    def __init__(self):
+        """Initialize an empty clipboard."""
+        self.text = ""
+
+    def get(self) -> Optional[str]:
+        """Read the clipboard text."""
+        return self.text
+
+    def set(self, text: str) -> None:
+        """Replace the clipboard text."""
+        self.text = text
+
+
+class FakeBackend(DesktopBackend):
+    """In-memory backend that records events and serves synthetic frames.
+
+    Frames are windows onto a tall synthetic document, so scrolling moves the
+    content and stops changing at either end; clicks and typing update a
+    status strip so those actions are visible too.
+    """
+
+    def __init__(
+        self,
+        width: int = 1440,
+        height: int = 900,
+        document_screens: int = 10,
+        pixels_per_click: int = 100,
+        realtime: bool = True,
+        latency: float = 0.0,
+        frame_source: Optional[Callable[["FakeBackend"], Image.Image]] = None,
+        pixel_scroll: bool = True,
+    ):
+        """Initialize fake backend.
+
+        Args:
+            width: Screen width in pixels
+            height: Screen height in pixels
+            document_screens: Synthetic document height in screens
+            pixels_per_click: Document pixels scrolled per wheel click
+            realtime: Sleep for movement durations, key intervals and the
+                input pause like pyautogui does (False = return immediately)
+            latency: Extra seconds added to every input event
+            frame_source: Optional callable producing frames instead of the
+                synthetic document
+            pixel_scroll: Offer scroll_pixels() (False = wheel clicks only)
+        """
+        self.width = width
+        self.height = height
+        self.pixels_per_click = pixels_per_click
+        self.realtime = realtime
+        self.latency = latency
+        self.frame_source = frame_source
+        self.supports_pixel_scroll = pixel_scroll
+        self.pause = 0.0
+        self.clipboard = FakeClipboard()
+
+        self.events: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.mouse = (width // 2, height // 2)
+        self.scroll_offset = 0
+        self.clicks = 0
+        self.typed_chars = 0
+        self.document_height = height * document_screens
+
+    def size(self) -> Tuple[int, int]:
+        """Get the screen size in pixels."""
+        return self.width, self.height
+
+    def screenshot(self) -> Image.Image:
+        """Serve the current synthetic frame."""
+        if self.frame_source:
+            return self.frame_source(self)
+
+        frame = self._render_frame(self.scroll_offset)
+        draw = ImageDraw.Draw(frame)
+        strip = min(self.clicks * 7 + self.typed_chars, self.width)
+        draw.rectangle([0, 0, strip, 8], fill=(29, 155, 209))
+        return frame
+
+    def move_to(self, x: int, y: int, duration: float = 0.0) -> None:
+        """Record a mouse move."""
+        self._record("move_to", (x, y, duration), duration)
+        self.mouse = (x, y)
+
+    def click(self) -> None:
+        """Record a click."""
+        self._record("click", self.mouse)
+        self.clicks += 1
+
+    def drag(self, dx: int, dy: int, duration: float = 0.0) -> None:
+        """Record a drag."""
+        self._record("drag", (dx, dy, duration), duration)
+        self.mouse = (self.mouse[0] + dx, self.mouse[1] + dy)
+
+    def scroll(self, clicks: int) -> None:
+        """Record a scroll and move the synthetic document."""
+        self._record("scroll", (clicks,))
+        self._move_document(clicks * self.pixels_per_click)
+
+    def scroll_pixels(self, dy: int, duration: float = 0.0) -> None:
+        """Record a pixel scroll and move the synthetic document."""
+        if not self.supports_pixel_scroll:
+            raise NotImplementedError("Pixel scrolling is disabled on this backend")
+        self._record("scroll_pixels", (dy, duration), duration)
+        self._move_document(dy)
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """Record typed text."""
+        self._record("write", (text,), interval * len(text))
+        self.typed_chars += len(text)
+
+    def press(self, key: str) -> None:
+        """Record a key press."""
+        self._record("press", (key,))
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """Record a key combination; command+v types the fake clipboard."""
+        self._record("hotkey", keys, interval * (len(keys) - 1))
+        if keys == ("command", "v"):
+            self.typed_chars += len(self.clipboard.text)
+
+    def set_pause(self, seconds: float) -> None:
+        """Set the simulated input pause."""
+        self.pause = seconds
+
+    def _move_document(self, dy: int) -> None:
+        """Scroll the synthetic document, clamped to its ends.
+
+        Args:
+            dy: Pixels to scroll (positive scrolls up)
+        """
+        max_offset = self.document_height - self.height
+        self.scroll_offset = max(0, min(max_offset, self.scroll_offset - dy))
+
+    def _record(self, name: str, args: Tuple[Any, ...], busy: float = 0.0) -> None:
+        """Record an event and simulate its duration.
+
+        Args:
+            name: Event name
+            args: Event arguments
+            busy: Seconds the real backend would spend in the call
+        """
+        self.events.append((name, args))
+        delay = self.latency + ((busy + self.pause) if self.realtime else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _render_frame(self, offset: int) -> Image.Image:
+        """Render the visible window of a tall chat-like document.
+
+        Rows are drawn on demand so long documents cost no memory.
+
+        Args:
+            offset: Document y coordinate at the top of the screen
+
+        Returns:
+            Rendered frame
+        """
+        frame = Image.new("RGB", (self.width, self.height), (255, 255, 255))
+        draw = ImageDraw.Draw(frame)
+        sidebar = self.width // 6
+        draw.rectangle([0, 0, sidebar, self.height], fill=(63, 14, 64))
+        row = 36
+        first = max(0, (offset - row) // (row * 2))
+        last = (offset + self.height) // (row * 2) + 1
+        for index in range(first, last):
+            y = row + index * row * 2 - offset
+            shade = (index * 37) % 160
+            draw.ellipse([sidebar + 16, y, sidebar + 16 + row, y + row])
+            line_width = 200 + (index * 113) % (self.width - sidebar - 300)
+            draw.rectangle(
+                [sidebar + 72, y + 8, sidebar + 72 + line_width, y + row - 8],
+                fill=(shade, shade, shade),
+            )
+        return frame
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "xvfb": XvfbBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_backend(name: str, **kwargs: Any) -> DesktopBackend:
+    """Create a backend by name.
+
+    Args:
+        name: Backend name ("pyautogui", "xvfb" or "fake")
+        **kwargs: Backend constructor arguments
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of {list(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
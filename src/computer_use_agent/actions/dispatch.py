@@ -0,0 +1,89 @@
+"""Early dispatch of streamed function calls to a background worker."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .executor import ActionExecutor
+
+
+class ActionDispatcher:
+    """Executes function calls in arrival order while the response streams in.
+
+    A single worker thread keeps actions strictly sequential, exactly as the
+    blocking loop runs them. Once a call is declined at the safety prompt the
+    remaining calls of the turn are skipped; after halt() every call that has
+    not started yet is skipped.
+    """
+
+    def __init__(
+        self,
+        executor: ActionExecutor,
+        get_safety_confirmation_fn: Callable[[Any], str],
+    ):
+        """Initialize action dispatcher.
+
+        Args:
+            executor: Executor that runs each call
+            get_safety_confirmation_fn: Function to get safety confirmation
+        """
+        self.executor = executor
+        self.get_safety_confirmation_fn = get_safety_confirmation_fn
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actions")
+        self._futures: List[Future] = []
+        self._terminated = False
+        self._halted = False
+
+    @property
+    def dispatched(self) -> int:
+        """Function calls submitted in the current turn."""
+        return len(self._futures)
+
+    def submit(self, function_call) -> None:
+        """Queue a complete function call for execution.
+
+        Args:
+            function_call: FunctionCall from a streamed chunk
+        """
+        self._futures.append(self._pool.submit(self._run, function_call))
+
+    def _run(self, function_call) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Worker body: execute one call unless the turn was terminated.
+
+        Args:
+            function_call: FunctionCall to execute
+
+        Returns:
+            (function name, result dict), or None if skipped
+        """
+        if self._terminated or self._halted:
+            return None
+        result, should_terminate = self.executor.execute_function_call(
+            function_call, self.get_safety_confirmation_fn
+        )
+        if should_terminate:
+            self._terminated = True
+        return result
+
+    def collect(self) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+        """Wait for the turn's calls to finish and reset for the next turn.
+
+        Returns:
+            Tuple of (results list, should_terminate boolean), matching
+            ActionExecutor.execute_function_calls
+        """
+        results = [future.result() for future in self._futures]
+        should_terminate = self._terminated
+        self._futures = []
+        self._terminated = False
+        return [result for result in results if result is not None], should_terminate
+
+    def halt(self) -> None:
+        """Skip all calls that have not started yet, including later submits.
+
+        The call already running (if any) cannot be interrupted and finishes.
+        """
+        self._halted = True
+
+    def shutdown(self) -> None:
+        """Finish queued calls and stop the worker thread."""
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,133 @@
+"""Screenshot encoding pipeline for Computer Use Agent."""
+
+import io
+from typing import Optional, Tuple
+
+from PIL import Image
+
+SCREENSHOT_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+
+class ScreenshotEncoder:
+    """Downscales and encodes screenshots before they are sent to the model."""
+
+    def __init__(
+        self,
+        image_format: str = "png",
+        target_size: Optional[Tuple[int, int]] = (1440, 900),
+        png_compress_level: int = 6,
+        quality: int = 85,
+        grayscale: bool = False,
+    ):
+        """Initialize screenshot encoder.
+
+        Args:
+            image_format: Output format ("png", "jpeg" or "webp")
+            target_size: Maximum (width, height); larger frames are downscaled
+                keeping aspect ratio (None = keep native resolution)
+            png_compress_level: zlib level for PNG (0 = fastest, 9 = smallest)
+            quality: Quality for JPEG/WebP (1-100)
+            grayscale: Convert frames to grayscale before encoding
+
+        Raises:
+            ValueError: If the format or a setting is out of range
+        """
+        image_format = image_format.lower()
+        if image_format == "jpg":
+            image_format = "jpeg"
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(
+                f"Unsupported screenshot format '{image_format}', "
+                f"expected one of {list(SCREENSHOT_FORMATS)}"
+            )
+        if not 0 <= png_compress_level <= 9:
+            raise ValueError("png_compress_level must be between 0 and 9")
+        if not 1 <= quality <= 100:
+            raise ValueError("quality must be between 1 and 100")
+
+        self.image_format = image_format
+        self.target_size = target_size
+        self.png_compress_level = png_compress_level
+        self.quality = quality
+        self.grayscale = grayscale
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of encoded screenshots."""
+        return SCREENSHOT_FORMATS[self.image_format][1]
+
+    def scale_for(self, width: int, height: int) -> float:
+        """Downscale factor applied to a frame of the given size.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+
+        Returns:
+            Scale factor (1.0 if the frame already fits target_size)
+        """
+        if not self.target_size:
+            return 1.0
+        max_width, max_height = self.target_size
+        return min(1.0, max_width / width, max_height / height)
+
+    def prepare(
+        self, image: Image.Image, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Image.Image:
+        """Resize and color-convert a frame without encoding it.
+
+        Args:
+            image: Raw screenshot
+            region: Optional (left, top, right, bottom) crop in frame pixels; the
+                crop is scaled like the full frame would be
+
+        Returns:
+            Frame (or region) at model resolution in the output color mode
+        """
+        scale = self.scale_for(image.width, image.height)
+        if region is not None:
+            image = image.crop(region)
+        if scale < 1:
+            size = (
+                max(1, round(image.width * scale)),
+                max(1, round(image.height * scale)),
+            )
+            # reducing_gap does a fast integer reduce before the filtered resize
+            image = image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+        if self.grayscale:
+            return image.convert("L")
+        if image.mode not in ("RGB", "L"):
+            return image.convert("RGB")
+        return image
+
+    def encode(
+        self, image: Image.Image, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> bytes:
+        """Resize, convert and encode a frame.
+
+        Args:
+            image: Raw screenshot
+            region: Optional (left, top, right, bottom) crop in frame pixels
+
+        Returns:
+            Encoded image bytes
+        """
+        image = self.prepare(image, region)
+        output = io.BytesIO()
+        pil_format = SCREENSHOT_FORMATS[self.image_format][0]
+
+        if self.image_format == "png":
+            image.save(
+                output, format=pil_format, compress_level=self.png_compress_level
+            )
+        elif self.image_format == "webp":
+            image.save(output, format=pil_format, quality=self.quality, method=0)
+        else:
+            image.save(output, format=pil_format, quality=self.quality)
+
+        return output.getvalue()
@@ -1,30 +1,77 @@
 """Action execution for Computer Use Agent."""
 
-import time
 import platform
-import pyautogui
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import termcolor
 
+from .backends import DesktopBackend
+from .frame_diff import FrameComparator
 from .screen import ScreenManager
+from .scroll_capture import SCROLL_UNTIL_END, sheet_cell, stitch_frames
+from .settle import VisualSettleDetector
+from .text_entry import TextTyper
+from ..utils.tracing import NULL_TRACER, Tracer
 
 
 class ActionExecutor:
     """Executes Computer Use actions on the desktop."""
 
-    def __init__(self, screen_manager: ScreenManager, verbose: bool = True):
+    def __init__(
+        self,
+        screen_manager: ScreenManager,
+        verbose: bool = True,
+        settle_detector: Optional[VisualSettleDetector] = None,
+        input_pause: float = 0.5,
+        wait_quiet_window: float = 2.0,
+        wait_max_seconds: float = 30.0,
+        text_typer: Optional[TextTyper] = None,
+        backend: Optional[DesktopBackend] = None,
+        tracer: Optional[Tracer] = None,
+        scroll_until_end_clicks: int = 5,
+        scroll_until_end_max: int = 30,
+        scroll_until_end_sheets: int = 2,
+        pixel_scroll: bool = False,
+        pixels_per_click: int = 100,
+        scroll_duration: float = 0.15,
+    ):
         """Initialize action executor.
 
         Args:
             screen_manager: Screen manager instance
             verbose: Whether to print execution details
+            settle_detector: Adaptive UI settle detector (None = fixed sleeps)
+            input_pause: Delay the backend inserts after every input call
+            wait_quiet_window: Seconds of no screen change that end a wait action
+            wait_max_seconds: Cap for a wait action while the screen keeps changing
+            text_typer: Text entry engine (defaults to keystrokes + paste)
+            backend: Desktop backend (defaults to the screen manager's)
+            tracer: Span recorder for action, settle and sleep timings
+            scroll_until_end_clicks: Wheel clicks per scroll_until_end step
+            scroll_until_end_max: Cap on scroll_until_end steps per call
+            scroll_until_end_sheets: Cap on contact sheets per scroll_until_end
+                call, so its images fit the inline screenshot limit
+            pixel_scroll: Scroll with one smooth pixel-delta gesture when the
+                backend supports it (False = always use chunked wheel clicks)
+            pixels_per_click: Pixels one wheel click stands for in pixel mode
+            scroll_duration: Seconds a pixel scroll gesture is spread over
         """
         self.screen = screen_manager
         self.verbose = verbose
-
-        # Configure pyautogui
-        pyautogui.PAUSE = 0.5
-        pyautogui.FAILSAFE = True
+        self.settle_detector = settle_detector
+        self.wait_quiet_window = wait_quiet_window
+        self.wait_max_seconds = wait_max_seconds
+        self.backend = backend or screen_manager.backend
+        self.tracer = tracer or NULL_TRACER
+        self.scroll_until_end_clicks = scroll_until_end_clicks
+        self.scroll_until_end_max = scroll_until_end_max
+        self.scroll_until_end_sheets = max(1, scroll_until_end_sheets)
+        self.pixel_scroll = pixel_scroll and self.backend.supports_pixel_scroll
+        self.pixels_per_click = pixels_per_click
+        self.scroll_duration = scroll_duration
+        self.text_typer = text_typer or TextTyper(
+            self.backend, clipboard=self.backend.clipboard, tracer=self.tracer
+        )
+        self.backend.set_pause(input_pause)
 
     def execute_function_calls(
         self, candidate, get_safety_confirmation_fn
@@ -49,43 +96,88 @@ class ActionExecutor:
                     function_calls.append(part.function_call)
 
         for function_call in function_calls:
-            action_result = {}
-            fname = function_call.name
-            args = function_call.args or {}
-
-            # Check for safety decision
-            extra_fields = {}
-            if "safety_decision" in args:
-                decision = get_safety_confirmation_fn(args["safety_decision"])
-                if decision == "TERMINATE":
-                    print(
-                        "❌ User declined safety confirmation. Terminating agent loop."
-                    )
-                    should_terminate = True
-                    results.append(
-                        (fname, {"status": "cancelled", "safety_declined": True})
-                    )
-                    break
-                extra_fields["safety_acknowledgement"] = True
-
-            if self.verbose:
-                print(f"  -> Executing: {fname}")
-                print(f"     Args: {args}")
-
-            try:
+            result, should_terminate = self.execute_function_call(
+                function_call, get_safety_confirmation_fn
+            )
+            results.append(result)
+            if should_terminate:
+                break
+
+        return results, should_terminate
+
+    def execute_function_call(
+        self, function_call, get_safety_confirmation_fn
+    ) -> Tuple[Tuple[str, Dict[str, Any]], bool]:
+        """Execute a single function call, asking for safety confirmation first.
+
+        Args:
+            function_call: FunctionCall from the model response
+            get_safety_confirmation_fn: Function to get safety confirmation
+
+        Returns:
+            Tuple of ((function name, result dict), should_terminate boolean)
+        """
+        action_result = {}
+        fname = function_call.name
+        args = function_call.args or {}
+
+        # Check for safety decision
+        extra_fields = {}
+        if "safety_decision" in args:
+            decision = get_safety_confirmation_fn(args["safety_decision"])
+            if decision == "TERMINATE":
+                print("❌ User declined safety confirmation. Terminating agent loop.")
+                return (fname, {"status": "cancelled", "safety_declined": True}), True
+            extra_fields["safety_acknowledgement"] = True
+
+        if self.verbose:
+            print(f"  -> Executing: {fname}")
+            print(f"     Args: {args}")
+
+        # A frame prefetched after the previous action is about to go stale
+        self.screen.discard_prefetch()
+        try:
+            with self.tracer.span(f"action.{fname}"):
                 action_result = self._execute_action(fname, args)
-                # Merge extra fields (like safety_acknowledgement)
-                action_result.update(extra_fields)
-                # Wait for action to complete
-                time.sleep(1)
+            # Merge extra fields (like safety_acknowledgement)
+            action_result.update(extra_fields)
+            # Wait for action to complete (wait actions already did)
+            if fname != "wait_5_seconds":
+                self._wait_for_ui(1.0)
 
-            except Exception as e:
-                print(f"     Error executing {fname}: {e}")
-                action_result = {"status": "error", "error": str(e)}
+        except Exception as e:
+            print(f"     Error executing {fname}: {e}")
+            action_result = {"status": "error", "error": str(e)}
 
-            results.append((fname, action_result))
+        return (fname, action_result), False
 
-        return results, should_terminate
+    def _wait_for_ui(self, fallback_seconds: float) -> None:
+        """Wait for the UI to react to an action.
+
+        Args:
+            fallback_seconds: Fixed sleep used when adaptive settling is disabled
+        """
+        if self.settle_detector is None:
+            self.tracer.sleep(fallback_seconds, "ui")
+            return
+
+        with self.tracer.span("settle.wait") as span:
+            # Encode the likely final frame while the settle is being confirmed
+            result = self.settle_detector.wait(on_stable=self.screen.prefetch_frame)
+            span.attributes.update(settled=result.settled, frames=result.frames)
+        if not result.settled:
+            self.screen.discard_prefetch()
+        if self.verbose and not result.settled:
+            print(f"     Screen still changing after {result.elapsed:.1f}s")
+
+    def _pause(self, seconds: float) -> None:
+        """Sleep for a trailing UI delay unless the settle wait will cover it.
+
+        Args:
+            seconds: Fixed delay used when adaptive settling is disabled
+        """
+        if self.settle_detector is None:
+            self.tracer.sleep(seconds, "pause")
 
     def _execute_action(self, fname: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single action.
@@ -115,6 +207,9 @@ class ActionExecutor:
         elif fname == "scroll_at":
             return self._scroll_at(args)
 
+        elif fname == SCROLL_UNTIL_END:
+            return self._scroll_until_end(args)
+
         elif fname == "hover_at":
             return self._hover_at(args)
 
@@ -148,11 +243,11 @@ class ActionExecutor:
         print(f"     Clicking at ({actual_x}, {actual_y})")
 
         # Animated mouse movement for visibility (0.3s)
-        pyautogui.moveTo(actual_x, actual_y, duration=0.3)
-        time.sleep(0.1)  # Brief pause at target
+        self.backend.move_to(actual_x, actual_y, duration=0.3)
+        self.tracer.sleep(0.1)  # Brief pause at target
 
-        pyautogui.click()
-        time.sleep(0.3)  # Post-click delay for UI to respond and focus to settle
+        self.backend.click()
+        self._pause(0.3)  # Post-click delay for UI to respond and focus to settle
 
         return {"status": "success"}
 
@@ -166,36 +261,29 @@ class ActionExecutor:
         clear_before = args.get("clear_before_typing", False)
 
         # Animated mouse movement to click position
-        pyautogui.moveTo(actual_x, actual_y, duration=0.3)
-        time.sleep(0.1)
+        self.backend.move_to(actual_x, actual_y, duration=0.3)
+        self.tracer.sleep(0.1)
 
         # Click to focus
-        pyautogui.click()
-        time.sleep(0.5)  # Wait for focus to settle
+        self.backend.click()
+        self.tracer.sleep(0.5)  # Wait for focus to settle
 
         if clear_before:
             # Clear field on macOS
-            pyautogui.hotkey("command", "a")
-            time.sleep(0.1)
-            pyautogui.press("backspace")
-            time.sleep(0.1)
-
-        # Type text - handle newlines with Shift+Enter to avoid sending in chat apps
-        # Split by newlines and type each line, using Shift+Enter between them
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            if line:  # Only type non-empty lines
-                pyautogui.write(line, interval=0.05)
-            # Add newline between lines (but not after the last line)
-            if i < len(lines) - 1:
-                time.sleep(0.05)
-                pyautogui.hotkey("shift", "enter")
-                time.sleep(0.05)
+            self.backend.hotkey("command", "a")
+            self.tracer.sleep(0.1)
+            self.backend.press("backspace")
+            self.tracer.sleep(0.1)
+
+        # Type or paste text - newlines become Shift+Enter to avoid sending in chat apps
+        mode = self.text_typer.type_text(text)
+        if self.verbose:
+            print(f"     Entered {len(text)} chars ({mode})")
 
         if press_enter:
-            time.sleep(0.1)
-            pyautogui.press("enter")
-            time.sleep(0.3)  # Wait for enter to be processed
+            self.tracer.sleep(0.1)
+            self.backend.press("enter")
+            self._pause(0.3)  # Wait for enter to be processed
 
         return {"status": "success"}
 
@@ -221,11 +309,11 @@ class ActionExecutor:
 
         # Use interval parameter for macOS to ensure modifier keys register
         if platform.system() == "Darwin":
-            pyautogui.hotkey(*keys, interval=0.25)
-            time.sleep(0.5)  # Post-hotkey delay for UI to respond (e.g., command+k)
+            self.backend.hotkey(*keys, interval=0.25)
+            self._pause(0.5)  # Post-hotkey delay for UI to respond (e.g., command+k)
         else:
-            pyautogui.hotkey(*keys)
-            time.sleep(0.3)
+            self.backend.hotkey(*keys)
+            self._pause(0.3)
 
         return {"status": "success"}
 
@@ -239,38 +327,19 @@ class ActionExecutor:
         # to ensure sufficient coverage when reading all messages in a channel
         magnitude = magnitude * 3
 
-        # macOS has a practical maximum of ~5 clicks per scroll call
-        # For larger scrolls, use multiple scroll operations
         total_clicks = max(1, int(magnitude / 100))
-        max_per_scroll = 5
-        num_scrolls = (
-            total_clicks + max_per_scroll - 1
-        ) // max_per_scroll  # Ceiling division
 
         # Move to center WITHOUT clicking to avoid triggering UI elements
         # Window should already have focus from prior actions
         center_x, center_y = self.screen.get_center()
-        pyautogui.moveTo(center_x, center_y, duration=0.2)
-        time.sleep(0.1)
+        self.backend.move_to(center_x, center_y, duration=0.2)
+        self.tracer.sleep(0.1)
 
-        # Perform multiple scrolls if needed
-        # macOS requires 0.5s delay between consecutive scrolls to work reliably
-        total_scrolled = 0
-        for i in range(num_scrolls):
-            remaining = total_clicks - total_scrolled
-            scroll_clicks = min(max_per_scroll, remaining)
-
-            # PyAutoGUI: positive scrolls UP, negative scrolls DOWN
-            scroll_amount = -scroll_clicks if direction == "down" else scroll_clicks
-            pyautogui.scroll(scroll_amount)
-            total_scrolled += scroll_clicks
-
-            if i < num_scrolls - 1:  # Don't sleep after last scroll
-                time.sleep(0.5)  # macOS needs 0.5s between scrolls
+        num_scrolls = self._scroll_clicks(direction, total_clicks)
 
-        time.sleep(0.3)
+        self._pause(0.3)
         print(
-            f"     Scrolled {direction} by {total_scrolled} clicks ({num_scrolls} operations)"
+            f"     Scrolled {direction} by {total_clicks} clicks ({num_scrolls} operations)"
         )
         return {"status": "success"}
 
@@ -286,19 +355,112 @@ class ActionExecutor:
         # to ensure sufficient coverage when reading all messages in a channel
         magnitude = magnitude * 3
 
+        total_clicks = max(1, int(magnitude / 100))
+
+        # Move mouse to position WITHOUT clicking to avoid triggering links/images
+        # The window should already have focus from previous actions
+        self.backend.move_to(actual_x, actual_y, duration=0.2)
+        self.tracer.sleep(0.1)
+
+        num_scrolls = self._scroll_clicks(direction, total_clicks)
+
+        self._pause(0.3)
+        print(
+            f"     Scrolled {direction} at ({actual_x}, {actual_y}) by {total_clicks} clicks ({num_scrolls} operations)"
+        )
+        return {"status": "success"}
+
+    def _scroll_until_end(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute scroll_until_end action.
+
+        Scrolls one step at a time and compares each settled frame with the
+        previous one; the first step that leaves the screen unchanged means the
+        end was reached. The frames seen are returned as encoded contact
+        sheets under "attachments", in reading order. Scrolling also stops once
+        scroll_until_end_sheets sheets are full; the model calls again to go on.
+        """
+        actual_x = self.screen.denormalize_x(args.get("x", 500))
+        actual_y = self.screen.denormalize_y(args.get("y", 500))
+        direction = args.get("direction", "down")
+        max_scrolls = max(
+            1, min(int(args.get("max_scrolls", 20)), self.scroll_until_end_max)
+        )
+        max_frames = 4 * self.scroll_until_end_sheets  # 2x2 cells per sheet
+
+        # Move mouse to position WITHOUT clicking to avoid triggering links/images
+        self.backend.move_to(actual_x, actual_y, duration=0.2)
+        self.tracer.sleep(0.1)
+
+        # Scrolling moves whole screens; a blinking caret must not look like one
+        comparator = FrameComparator(unchanged_pixels=32)
+        frame = self.screen.capture_image()
+        comparator.compare(frame)
+        cells = [sheet_cell(frame)]
+        reached_end = False
+        scrolls = 0
+        while scrolls < max_scrolls and len(cells) < max_frames:
+            self._scroll_clicks(direction, self.scroll_until_end_clicks)
+            scrolls += 1
+            self._wait_for_ui(0.5)
+            frame = self._settled_frame()
+            change = comparator.compare(frame)
+            if change is not None and change.unchanged:
+                reached_end = True
+                break
+            cells.append(sheet_cell(frame))
+
+        if direction == "up":
+            cells.reverse()  # Reading order: top of the content first
+        with self.tracer.span("scroll.stitch", frames=len(cells)) as span:
+            sheets = [self.screen.encoder.encode(s) for s in stitch_frames(cells)]
+            span.attributes["bytes"] = sum(len(sheet) for sheet in sheets)
+
+        print(
+            f"     Scrolled {direction} {scrolls} times "
+            f"({'reached the end' if reached_end else 'stopped at the cap'}), "
+            f"{len(cells)} frames on {len(sheets)} sheet(s)"
+        )
+        return {
+            "status": "success",
+            "scrolls": scrolls,
+            "reached_end": reached_end,
+            "frames": len(cells),
+            "note": (
+                "Frames seen while scrolling are attached as 2x2 contact sheets "
+                "in reading order (top of the content first)."
+            ),
+            "attachments": sheets,
+        }
+
+    def _scroll_clicks(self, direction: str, total_clicks: int) -> int:
+        """Scroll by wheel clicks in operations the OS handles reliably.
+
+        With pixel scrolling the whole distance goes out as one smooth gesture;
+        otherwise it is split into wheel-click chunks.
+
+        Args:
+            direction: "up" or "down"
+            total_clicks: Wheel clicks to scroll
+
+        Returns:
+            Number of scroll operations performed
+        """
+        if self.pixel_scroll:
+            pixels = total_clicks * self.pixels_per_click
+            # Backend: positive scrolls UP, negative scrolls DOWN
+            self.backend.scroll_pixels(
+                -pixels if direction == "down" else pixels,
+                duration=self.scroll_duration,
+            )
+            return 1
+
         # macOS has a practical maximum of ~5 clicks per scroll call
         # For larger scrolls, use multiple scroll operations
-        total_clicks = max(1, int(magnitude / 100))
         max_per_scroll = 5
         num_scrolls = (
             total_clicks + max_per_scroll - 1
         ) // max_per_scroll  # Ceiling division
 
-        # Move mouse to position WITHOUT clicking to avoid triggering links/images
-        # The window should already have focus from previous actions
-        pyautogui.moveTo(actual_x, actual_y, duration=0.2)
-        time.sleep(0.1)
-
         # Perform multiple scrolls if needed
         # macOS requires 0.5s delay between consecutive scrolls to work reliably
         total_scrolled = 0
@@ -306,19 +468,27 @@ class ActionExecutor:
             remaining = total_clicks - total_scrolled
             scroll_clicks = min(max_per_scroll, remaining)
 
-            # PyAutoGUI: positive scrolls UP, negative scrolls DOWN
+            # Backend: positive scrolls UP, negative scrolls DOWN
             scroll_amount = -scroll_clicks if direction == "down" else scroll_clicks
-            pyautogui.scroll(scroll_amount)
+            self.backend.scroll(scroll_amount)
             total_scrolled += scroll_clicks
 
             if i < num_scrolls - 1:  # Don't sleep after last scroll
-                time.sleep(0.5)  # macOS needs 0.5s between scrolls
+                self.tracer.sleep(0.5)  # macOS needs 0.5s between scrolls
+        return num_scrolls
 
-        time.sleep(0.3)
-        print(
-            f"     Scrolled {direction} at ({actual_x}, {actual_y}) by {total_scrolled} clicks ({num_scrolls} operations)"
-        )
-        return {"status": "success"}
+    def _settled_frame(self):
+        """Get the frame the last UI wait ended on (captured if there was none).
+
+        Returns:
+            Current screen image
+        """
+        if (
+            self.settle_detector is not None
+            and self.settle_detector.last_frame is not None
+        ):
+            return self.settle_detector.last_frame
+        return self.screen.capture_image()
 
     def _hover_at(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute hover_at action."""
@@ -326,8 +496,8 @@ class ActionExecutor:
             args.get("x", 0), args.get("y", 0)
         )
         # Animated mouse movement for visibility
-        pyautogui.moveTo(actual_x, actual_y, duration=0.3)
-        time.sleep(0.2)  # Brief pause to allow hover effects to appear
+        self.backend.move_to(actual_x, actual_y, duration=0.3)
+        self._pause(0.2)  # Brief pause to allow hover effects to appear
         print(f"     Hovering at ({actual_x}, {actual_y})")
         return {"status": "success"}
 
@@ -338,31 +508,59 @@ class ActionExecutor:
         dest_x = self.screen.denormalize_x(args.get("destination_x", 0))
         dest_y = self.screen.denormalize_y(args.get("destination_y", 0))
 
-        pyautogui.moveTo(start_x, start_y)
-        time.sleep(0.2)
-        pyautogui.drag(dest_x - start_x, dest_y - start_y, duration=0.5)
+        self.backend.move_to(start_x, start_y)
+        self.tracer.sleep(0.2)
+        self.backend.drag(dest_x - start_x, dest_y - start_y, duration=0.5)
         print(f"     Dragged from ({start_x}, {start_y}) to ({dest_x}, {dest_y})")
         return {"status": "success"}
 
     def _wait_5_seconds(self) -> Dict[str, Any]:
-        """Execute wait_5_seconds action."""
-        print("     Waiting 5 seconds...")
-        time.sleep(5)
-        return {"status": "success"}
+        """Execute wait_5_seconds action.
+
+        With a settle detector this returns once the screen has been quiet for
+        the configured window, and keeps waiting (up to the cap) while content
+        is still changing, e.g. streaming responses.
+        """
+        if self.settle_detector is None:
+            print("     Waiting 5 seconds...")
+            self.tracer.sleep(5)
+            return {"status": "success", "elapsed_seconds": 5.0}
+
+        print(
+            f"     Waiting until screen is idle for {self.wait_quiet_window:.1f}s "
+            f"(max {self.wait_max_seconds:.0f}s)..."
+        )
+        result = self.settle_detector.wait_for_quiet(
+            self.wait_quiet_window, self.wait_max_seconds, poll_interval=0.25
+        )
+        if result.settled:
+            # The screen is idle, so its last frame is the next observation
+            self.screen.prefetch_frame(self.settle_detector.last_frame)
+        print(
+            f"     Waited {result.elapsed:.1f}s "
+            f"({'screen changed' if result.changed else 'no change'}"
+            f"{'' if result.settled else ', still changing at cap'})"
+        )
+        return {
+            "status": "success",
+            "elapsed_seconds": round(result.elapsed, 1),
+            "screen_changed": result.changed,
+            "screen_settled": result.settled,
+        }
 
     def _go_back(self) -> Dict[str, Any]:
         """Execute go_back action."""
-        pyautogui.hotkey("command", "[")
+        self.backend.hotkey("command", "[")
         return {"status": "success"}
 
     def _go_forward(self) -> Dict[str, Any]:
         """Execute go_forward action."""
-        pyautogui.hotkey("command", "]")
+        self.backend.hotkey("command", "]")
         return {"status": "success"}
 
     def _search(self) -> Dict[str, Any]:
         """Execute search action (Spotlight on macOS)."""
-        pyautogui.hotkey("command", "space")
+        self.backend.hotkey("command", "space")
         return {"status": "success"}
 
     def _navigate(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,152 @@
+"""Frame comparison: detect whether the screen changed since the last observation."""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+@dataclass
+class FrameChange:
+    """Difference between a frame and the last observed one.
+
+    Attributes:
+        changed_pixels: Pixels that differ beyond the tolerance, counted at
+            comparison resolution
+        changed_fraction: changed_pixels as a fraction of the frame
+        unchanged: Whether no pixel changed beyond the tolerance (or at most
+            the comparator's unchanged_pixels)
+        box: Bounding box (left, top, right, bottom) of the changed pixels in
+            native frame pixels (None if nothing changed)
+        box_fraction: Area of box as a fraction of the frame
+    """
+
+    changed_pixels: int
+    changed_fraction: float
+    unchanged: bool
+    box: Optional[Tuple[int, int, int, int]] = None
+    box_fraction: float = 0.0
+
+
+class FrameComparator:
+    """Compares each observed frame against the last one that changed.
+
+    Frames are downsampled (box filter) to grayscale at about comparison_width
+    pixels wide. Identical digests short-circuit to "unchanged"; otherwise the
+    frames are diffed pixel by pixel with a small tolerance. By default a
+    single changed pixel counts as a change: a typed "." or a flipped toggle
+    must never be reported as an unchanged screen. The reference only
+    advances when a frame counts as changed.
+    """
+
+    def __init__(
+        self,
+        comparison_width: int = 1440,
+        pixel_tolerance: int = 24,
+        unchanged_pixels: int = 0,
+    ):
+        """Initialize frame comparator.
+
+        Args:
+            comparison_width: Approximate width frames are reduced to
+            pixel_tolerance: Grayscale delta below which a pixel counts as equal
+            unchanged_pixels: Changed pixels still reported as unchanged; keep
+                0 for observations, only coarse checks such as the end of a
+                scroll may absorb noise here
+        """
+        self.comparison_width = comparison_width
+        self.pixel_tolerance = pixel_tolerance
+        self.unchanged_pixels = unchanged_pixels
+        self._reference: Optional[np.ndarray] = None
+        self._reference_digest: Optional[bytes] = None
+
+    def reduction(self, image: Image.Image) -> int:
+        """Integer factor a frame is reduced by for comparison.
+
+        Args:
+            image: Frame at native resolution
+
+        Returns:
+            Reduction factor (1 = compared at native resolution)
+        """
+        return max(1, image.width // self.comparison_width)
+
+    def prepare(self, image: Image.Image) -> np.ndarray:
+        """Reduce a frame to the grayscale comparison buffer.
+
+        Args:
+            image: Frame at native resolution
+
+        Returns:
+            2D uint8 array
+        """
+        factor = self.reduction(image)
+        if factor > 1:
+            image = image.reduce(factor)
+        return np.asarray(image.convert("L"))
+
+    def compare(self, image: Image.Image) -> Optional[FrameChange]:
+        """Compare a frame with the reference and advance it if changed.
+
+        Args:
+            image: Newly observed frame
+
+        Returns:
+            FrameChange, or None for the first frame (nothing to compare)
+        """
+        current = self.prepare(image)
+        digest = hashlib.blake2b(current.tobytes(), digest_size=16).digest()
+        reference = self._reference
+
+        if reference is None or reference.shape != current.shape:
+            change = None
+        elif digest == self._reference_digest:
+            change = FrameChange(0, 0.0, True)
+        else:
+            delta = np.abs(reference.astype(np.int16) - current.astype(np.int16))
+            mask = delta > self.pixel_tolerance
+            changed = int(np.count_nonzero(mask))
+            change = FrameChange(
+                changed, changed / delta.size, changed <= self.unchanged_pixels
+            )
+            if changed:
+                change.box = self._bounding_box(mask, self.reduction(image), image)
+                left, top, right, bottom = change.box
+                change.box_fraction = (
+                    (right - left) * (bottom - top) / (image.width * image.height)
+                )
+
+        if change is None or not change.unchanged:
+            self._reference = current
+            self._reference_digest = digest
+        return change
+
+    @staticmethod
+    def _bounding_box(
+        mask: np.ndarray, factor: int, image: Image.Image
+    ) -> Tuple[int, int, int, int]:
+        """Bounding box of a change mask, scaled back to native frame pixels.
+
+        Args:
+            mask: Boolean changed-pixel mask at comparison resolution
+            factor: Reduction factor of the mask
+            image: Native frame (bounds the box)
+
+        Returns:
+            (left, top, right, bottom) in native pixels
+        """
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        return (
+            int(cols[0]) * factor,
+            int(rows[0]) * factor,
+            min(image.width, (int(cols[-1]) + 1) * factor),
+            min(image.height, (int(rows[-1]) + 1) * factor),
+        )
+
+    def reset(self) -> None:
+        """Forget the reference frame."""
+        self._reference = None
+        self._reference_digest = None
@@ -0,0 +1,170 @@
+"""Background encoding of settled frames ahead of the observe step."""
+
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from .encoding import ScreenshotEncoder
+from ..utils.tracing import NULL_TRACER, Tracer
+
+
+def _timed_encode(
+    encoder: ScreenshotEncoder, image: Image.Image
+) -> Tuple[bytes, float]:
+    """Encode a frame and measure how long it took.
+
+    Module-level so it can run in a process pool.
+
+    Args:
+        encoder: Screenshot encoder
+        image: Frame to encode
+
+    Returns:
+        Tuple of (encoded bytes, encode seconds)
+    """
+    start = time.perf_counter()
+    data = encoder.encode(image)
+    return data, time.perf_counter() - start
+
+
+@dataclass
+class PipelineStats:
+    """Prefetch counters for a run.
+
+    Attributes:
+        prefetched: Settled frames handed to the pipeline
+        hits: Observations served from a prefetched frame
+        misses: Observations that had to capture and encode on the spot
+        discarded: Prefetched frames dropped because another action followed
+        saved_seconds: Capture and encode time taken off the critical path
+    """
+
+    prefetched: int = 0
+    hits: int = 0
+    misses: int = 0
+    discarded: int = 0
+    saved_seconds: float = 0.0
+
+
+@dataclass
+class _Prefetch:
+    """A frame being encoded in the background."""
+
+    future: Future
+    image: Image.Image
+    capture_seconds: float
+
+
+class FramePipeline:
+    """Encodes the latest settled frame while the agent finishes its actions.
+
+    The settle wait after an action already grabs the final frame, so that
+    frame is encoded in a worker pool and the next observation uses it instead
+    of capturing and encoding again. Only the latest frame is kept; starting
+    another action discards it, since it no longer shows the screen.
+    """
+
+    def __init__(
+        self,
+        encoder: ScreenshotEncoder,
+        workers: int = 1,
+        use_processes: bool = False,
+        tracer: Optional[Tracer] = None,
+    ):
+        """Initialize frame pipeline.
+
+        Args:
+            encoder: Screenshot encoder (shared with the screen manager)
+            workers: Encoder worker count
+            use_processes: Encode in a process pool instead of threads (PIL
+                releases the GIL while compressing, so threads usually suffice)
+            tracer: Span recorder for background encodes and pipeline waits
+        """
+        self.encoder = encoder
+        self.use_processes = use_processes
+        self.tracer = tracer or NULL_TRACER
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._pool = pool_class(max_workers=max(1, workers))
+        self._lock = threading.Lock()
+        self._pending: Optional[_Prefetch] = None
+        self.stats = PipelineStats()
+
+    def submit(self, image: Image.Image, capture_seconds: float = 0.0) -> None:
+        """Start encoding a settled frame, replacing any earlier one.
+
+        Args:
+            image: Settled frame at native resolution
+            capture_seconds: Time the frame took to grab (saved by reusing it)
+        """
+        if self.use_processes:
+            future = self._pool.submit(_timed_encode, self.encoder, image)
+        else:
+            future = self._pool.submit(self._traced_encode, image)
+        with self._lock:
+            self._discard_locked()
+            self._pending = _Prefetch(future, image, capture_seconds)
+            self.stats.prefetched += 1
+
+    def discard(self) -> None:
+        """Drop the pending frame (the screen is about to change)."""
+        with self._lock:
+            self._discard_locked()
+
+    def take(self) -> Optional[Tuple[Image.Image, bytes]]:
+        """Get the pending frame once its encode has finished.
+
+        Returns:
+            Tuple of (frame, encoded screenshot), or None if no frame is pending
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            self.stats.misses += 1
+            return None
+
+        with self.tracer.span("pipeline.take") as span:
+            start = time.perf_counter()
+            try:
+                data, encode_seconds = pending.future.result()
+            except Exception:
+                self.stats.misses += 1
+                return None
+            waited = time.perf_counter() - start
+            # Without the pipeline, capture + encode would sit on the critical path
+            saved = max(0.0, pending.capture_seconds + encode_seconds - waited)
+            span.attributes.update(waited=round(waited, 4), saved=round(saved, 4))
+        self.stats.hits += 1
+        self.stats.saved_seconds += saved
+        return pending.image, data
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        self.discard()
+        self._pool.shutdown(wait=True)
+
+    def _discard_locked(self) -> None:
+        """Drop the pending frame; the caller holds the lock."""
+        if self._pending is not None:
+            self._pending.future.cancel()
+            self._pending = None
+            self.stats.discarded += 1
+
+    def _traced_encode(self, image: Image.Image) -> Tuple[bytes, float]:
+        """Encode on a worker thread inside a span.
+
+        Args:
+            image: Frame to encode
+
+        Returns:
+            Tuple of (encoded bytes, encode seconds)
+        """
+        with self.tracer.span(
+            "screen.encode", format=self.encoder.image_format, prefetched=True
+        ) as span:
+            data, seconds = _timed_encode(self.encoder, image)
+            span.attributes["bytes"] = len(data)
+        return data, seconds
@@ -1,22 +1,59 @@
 """Screen management for Computer Use Agent."""
 
-import io
-import pyautogui
-from typing import Tuple
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+from PIL import Image
+
+from .backends import DesktopBackend
+from .encoding import ScreenshotEncoder
+from .frame_diff import FrameChange, FrameComparator
+from ..utils.tracing import NULL_TRACER, Tracer
+
+if TYPE_CHECKING:
+    from .pipeline import FramePipeline
 
 
 class ScreenManager:
     """Manages screen operations and screenshot capture."""
 
-    def __init__(self, width: int, height: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        backend: DesktopBackend,
+        encoder: Optional[ScreenshotEncoder] = None,
+        tracer: Optional[Tracer] = None,
+        pipeline: Optional["FramePipeline"] = None,
+        comparator: Optional[FrameComparator] = None,
+    ):
         """Initialize screen manager.
 
         Args:
             width: Screen width in pixels
             height: Screen height in pixels
+            backend: Desktop backend used to grab frames
+            encoder: Screenshot encoder (defaults to PNG at 1440x900)
+            tracer: Span recorder for capture and encode timings
+            pipeline: Background encoder for settled frames (None = capture
+                and encode on demand)
+            comparator: Compares each screenshot with the previous one (None =
+                no change detection)
         """
         self.width = width
         self.height = height
+        self.backend = backend
+        self.encoder = encoder or ScreenshotEncoder()
+        self.tracer = tracer or NULL_TRACER
+        self.pipeline = pipeline
+        self.comparator = comparator
+        self.last_capture_seconds = 0.0
+        self.last_change: Optional[FrameChange] = None
+        self.last_frame: Optional[Image.Image] = None
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of captured screenshots."""
+        return self.encoder.mime_type
 
     def denormalize_x(self, x: int) -> int:
         """Convert normalized x coordinate (0-999) to actual pixel coordinate.
@@ -53,15 +90,104 @@ class ScreenManager:
         return self.denormalize_x(x), self.denormalize_y(y)
 
     def capture_screenshot(self) -> bytes:
-        """Capture current screen state as PNG bytes.
+        """Capture current screen state encoded by the configured encoder.
+
+        A settled frame already encoded by the pipeline is used when available.
+        With a comparator, last_change afterwards describes how the screenshot
+        differs from the previous one.
+
+        Returns:
+            Screenshot bytes (see mime_type for the format)
+        """
+        prefetched = self.pipeline.take() if self.pipeline is not None else None
+        if prefetched is not None:
+            image, data = prefetched
+        else:
+            image = self.capture_image()
+            with self.tracer.span(
+                "screen.encode", format=self.encoder.image_format
+            ) as span:
+                data = self.encoder.encode(image)
+                span.attributes["bytes"] = len(data)
+
+        self.last_frame = image
+        if self.comparator is not None:
+            with self.tracer.span("screen.compare") as span:
+                self.last_change = self.comparator.compare(image)
+                if self.last_change is not None:
+                    span.attributes["changed_pixels"] = self.last_change.changed_pixels
+        return data
+
+    def encode_region(self, region: Tuple[int, int, int, int]) -> bytes:
+        """Encode part of the last screenshot at full-frame scale.
+
+        Args:
+            region: (left, top, right, bottom) in native frame pixels
+
+        Returns:
+            Encoded crop (see mime_type for the format)
+        """
+        with self.tracer.span(
+            "screen.encode", format=self.encoder.image_format, region=True
+        ) as span:
+            data = self.encoder.encode(self.last_frame, region)
+            span.attributes["bytes"] = len(data)
+        return data
+
+    def normalize_region(
+        self, region: Tuple[int, int, int, int]
+    ) -> Tuple[int, int, int, int]:
+        """Convert a region of the last screenshot to normalized 0-999 coordinates.
+
+        Args:
+            region: (left, top, right, bottom) in native frame pixels
 
         Returns:
-            Screenshot as PNG bytes
+            (x0, y0, x1, y1) in the model's 0-999 coordinate space
         """
-        screenshot = pyautogui.screenshot()
-        img_byte_arr = io.BytesIO()
-        screenshot.save(img_byte_arr, format="PNG")
-        return img_byte_arr.getvalue()
+        width, height = self.last_frame.size
+        left, top, right, bottom = region
+        return (
+            int(left / width * 1000),
+            int(top / height * 1000),
+            min(999, int(right / width * 1000)),
+            min(999, int(bottom / height * 1000)),
+        )
+
+    def capture_image(self) -> Image.Image:
+        """Capture current screen state as a raw image.
+
+        Returns:
+            Screenshot at native resolution
+        """
+        with self.tracer.span("screen.capture"):
+            start = time.perf_counter()
+            image = self.backend.screenshot()
+            self.last_capture_seconds = time.perf_counter() - start
+        return image
+
+    def capture_sample(self) -> Image.Image:
+        """Capture a cheap, possibly reduced-resolution frame for change detection.
+
+        Returns:
+            Screenshot from the backend's fast capture path
+        """
+        with self.tracer.span("screen.sample"):
+            return self.backend.sample()
+
+    def prefetch_frame(self, image: Image.Image) -> None:
+        """Start encoding a settled frame for the next capture_screenshot().
+
+        Args:
+            image: Frame showing the settled screen
+        """
+        if self.pipeline is not None:
+            self.pipeline.submit(image, capture_seconds=self.last_capture_seconds)
+
+    def discard_prefetch(self) -> None:
+        """Drop a prefetched frame because the screen is about to change."""
+        if self.pipeline is not None:
+            self.pipeline.discard()
 
     def get_center(self) -> Tuple[int, int]:
         """Get center coordinates of screen.
@@ -0,0 +1,105 @@
+"""Composite scroll-until-end action: declaration and frame stitching."""
+
+from typing import List
+
+from google.genai import types
+from PIL import Image, ImageDraw
+
+SCROLL_UNTIL_END = "scroll_until_end"
+
+# Declared next to the predefined Computer Use functions
+SCROLL_UNTIL_END_DECLARATION = types.FunctionDeclaration(
+    name=SCROLL_UNTIL_END,
+    description=(
+        "Scroll a list, page or chat history repeatedly in one direction until "
+        "it stops moving (the end is reached) or max_scrolls is hit. Returns "
+        "the frames seen along the way as contact sheets of 2x2 screenshots "
+        "in reading order (top of the content first); the current screen "
+        "follows them as a separate full screenshot. "
+        "Use it to read long content in one step instead of scrolling "
+        "screen by screen."
+    ),
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "direction": types.Schema(
+                type=types.Type.STRING,
+                enum=["up", "down"],
+                description="Scroll direction",
+            ),
+            "x": types.Schema(
+                type=types.Type.INTEGER,
+                description="X coordinate (0-999) of the area to scroll "
+                "(default: screen center)",
+            ),
+            "y": types.Schema(
+                type=types.Type.INTEGER,
+                description="Y coordinate (0-999) of the area to scroll "
+                "(default: screen center)",
+            ),
+            "max_scrolls": types.Schema(
+                type=types.Type.INTEGER,
+                description="Maximum scroll steps before giving up (default 20)",
+            ),
+        },
+        required=["direction"],
+    ),
+)
+
+
+def sheet_cell(frame: Image.Image, columns: int = 2, rows: int = 2) -> Image.Image:
+    """Shrink a frame to one cell of a contact sheet.
+
+    Frames are shrunk as they are captured so a long scroll only ever holds
+    small copies in memory.
+
+    Args:
+        frame: Frame at native resolution
+        columns: Cells per sheet row
+        rows: Cell rows per sheet
+
+    Returns:
+        RGB frame at 1/columns x 1/rows of its size
+    """
+    size = (max(1, frame.width // columns), max(1, frame.height // rows))
+    return frame.convert("RGB").resize(
+        size, Image.Resampling.BILINEAR, reducing_gap=2.0
+    )
+
+
+def stitch_frames(
+    cells: List[Image.Image], columns: int = 2, rows: int = 2
+) -> List[Image.Image]:
+    """Tile sheet cells into contact sheets the size of one frame.
+
+    A sheet costs about as much as a single screenshot once encoded. Cells
+    are outlined so the model can tell the frames apart.
+
+    Args:
+        cells: Frames shrunk by sheet_cell(), in reading order
+        columns: Cells per sheet row
+        rows: Cell rows per sheet
+
+    Returns:
+        Contact sheets, each holding up to columns * rows frames
+    """
+    if not cells:
+        return []
+    cell_width, cell_height = cells[0].size
+    per_sheet = columns * rows
+
+    sheets = []
+    for start in range(0, len(cells), per_sheet):
+        sheet = Image.new("RGB", (cell_width * columns, cell_height * rows), "white")
+        draw = ImageDraw.Draw(sheet)
+        for index, cell in enumerate(cells[start : start + per_sheet]):
+            left = (index % columns) * cell_width
+            top = (index // columns) * cell_height
+            sheet.paste(cell, (left, top))
+            draw.rectangle(
+                (left, top, left + cell_width - 1, top + cell_height - 1),
+                outline="red",
+                width=2,
+            )
+        sheets.append(sheet)
+    return sheets
@@ -0,0 +1,212 @@
+"""Visual settle detection: wait until the screen stops changing."""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+@dataclass
+class SettleResult:
+    """Outcome of a settle wait.
+
+    Attributes:
+        settled: Whether consecutive frames matched before the timeout
+        changed: Whether any frame differed from the first one sampled
+        elapsed: Seconds spent waiting
+        frames: Number of frames sampled
+    """
+
+    settled: bool
+    changed: bool
+    elapsed: float
+    frames: int
+
+
+class VisualSettleDetector:
+    """Detects when the UI has settled by diffing downsampled frames.
+
+    Frames are sampled through grab_sample, which may be a cheap
+    low-resolution capture; a full frame is only grabbed once the screen
+    looks settled and is kept as last_frame for the next observation.
+    """
+
+    def __init__(
+        self,
+        grab_frame: Callable[[], Image.Image],
+        timeout: float = 2.0,
+        interval: float = 0.1,
+        stable_frames: int = 2,
+        threshold: float = 0.002,
+        sample_size: Tuple[int, int] = (160, 100),
+        pixel_tolerance: int = 8,
+        grab_sample: Optional[Callable[[], Image.Image]] = None,
+        min_wait: float = 0.3,
+    ):
+        """Initialize settle detector.
+
+        Args:
+            grab_frame: Callable returning the current screen as a PIL image
+            timeout: Default maximum seconds to wait for the screen to settle
+            interval: Seconds between sampled frames
+            stable_frames: Consecutive matching frames required to report settled
+            threshold: Fraction of sampled pixels allowed to differ between
+                matching frames (absorbs caret blink and cursor noise)
+            sample_size: Resolution frames are downsampled to before diffing
+            pixel_tolerance: Grayscale delta below which a pixel counts as equal
+            grab_sample: Callable returning a cheap frame to diff (None = use
+                grab_frame for every sample)
+            min_wait: Seconds a screen that never changed must stay stable
+                before it counts as settled, so an app that is slow to start
+                reacting isn't observed before it does
+        """
+        self.grab_frame = grab_frame
+        self.grab_sample = grab_sample
+        self.timeout = timeout
+        self.interval = interval
+        self.stable_frames = max(1, stable_frames)
+        self.threshold = threshold
+        self.sample_size = sample_size
+        self.pixel_tolerance = pixel_tolerance
+        self.min_wait = min_wait
+        # Full frame of the settled screen (None if the last wait never settled)
+        self.last_frame: Optional[Image.Image] = None
+        self._sample_image: Optional[Image.Image] = None
+
+    def sample(self) -> np.ndarray:
+        """Grab a frame and downsample it to a small grayscale buffer.
+
+        Returns:
+            2D uint8 array of shape (sample_height, sample_width)
+        """
+        grab = self.grab_sample or self.grab_frame
+        image = self._sample_image = grab()
+        width, height = self.sample_size
+        factor = min(image.width // width, image.height // height)
+        # Integer reduce is far cheaper than a filtered resize on Retina frames
+        if factor > 1:
+            image = image.reduce(factor)
+        image = image.convert("L").resize(self.sample_size, Image.Resampling.NEAREST)
+        return np.asarray(image)
+
+    def difference(self, previous: np.ndarray, current: np.ndarray) -> float:
+        """Compute the fraction of sampled pixels that changed.
+
+        Args:
+            previous: Earlier sampled frame
+            current: Later sampled frame
+
+        Returns:
+            Changed-pixel fraction in [0, 1]
+        """
+        delta = np.abs(previous.astype(np.int16) - current.astype(np.int16))
+        return float(np.count_nonzero(delta > self.pixel_tolerance) / delta.size)
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        on_stable: Optional[Callable[[Image.Image], None]] = None,
+    ) -> SettleResult:
+        """Block until consecutive frames match or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait (defaults to the configured timeout)
+            on_stable: Called with the full frame whenever a frame first matches
+                its predecessor, i.e. the likely settled frame, while the
+                remaining stable frames are still being confirmed
+
+        Returns:
+            SettleResult describing the wait
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        self.last_frame = None
+        first = previous = self.sample()
+        frames = 1
+        stable = 0
+        changed = False
+
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= timeout:
+                return SettleResult(False, changed, elapsed, frames)
+
+            time.sleep(min(self.interval, max(0.0, timeout - elapsed)))
+            current = self.sample()
+            frames += 1
+
+            if self.difference(previous, current) <= self.threshold:
+                stable += 1
+                if stable == 1:
+                    self._capture_full_frame()
+                    if on_stable is not None:
+                        on_stable(self.last_frame)
+                if stable >= self.stable_frames:
+                    changed = changed or (
+                        self.difference(first, current) > self.threshold
+                    )
+                    # A screen that never changed may not have reacted yet
+                    elapsed = time.monotonic() - start
+                    if changed or elapsed >= self.min_wait:
+                        return SettleResult(True, changed, elapsed, frames)
+            else:
+                stable = 0
+                changed = True
+                self.last_frame = None
+            previous = current
+
+    def wait_for_quiet(
+        self,
+        quiet_window: float,
+        max_wait: float,
+        poll_interval: Optional[float] = None,
+    ) -> SettleResult:
+        """Block until the screen has been unchanged for a quiet window.
+
+        Unlike wait(), the deadline keeps extending while content is still
+        changing (streaming text, spinners), up to max_wait.
+
+        Args:
+            quiet_window: Seconds without change required before returning
+            max_wait: Hard cap on the total wait in seconds
+            poll_interval: Seconds between sampled frames (defaults to interval)
+
+        Returns:
+            SettleResult; settled is False if the cap was hit while changing
+        """
+        poll_interval = self.interval if poll_interval is None else poll_interval
+        start = last_change = time.monotonic()
+        self.last_frame = None
+        previous = self.sample()
+        frames = 1
+        changed = False
+
+        while True:
+            now = time.monotonic()
+            if now - last_change >= quiet_window:
+                self._capture_full_frame()
+                return SettleResult(True, changed, now - start, frames)
+            if now - start >= max_wait:
+                return SettleResult(False, changed, now - start, frames)
+
+            remaining = min(
+                quiet_window - (now - last_change), max_wait - (now - start)
+            )
+            time.sleep(max(0.0, min(poll_interval, remaining)))
+            current = self.sample()
+            frames += 1
+
+            if self.difference(previous, current) > self.threshold:
+                changed = True
+                last_change = time.monotonic()
+            previous = current
+
+    def _capture_full_frame(self) -> None:
+        """Keep a full frame of the screen that just looked settled."""
+        if self.grab_sample is None:
+            # Samples already are full frames
+            self.last_frame = self._sample_image
+        else:
+            self.last_frame = self.grab_frame()
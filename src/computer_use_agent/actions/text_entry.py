@@ -0,0 +1,203 @@
+"""Text entry for Computer Use Agent: keystroke typing and clipboard paste."""
+
+import os
+import platform
+import subprocess
+from typing import Any, List, Optional
+
+from ..utils.tracing import NULL_TRACER, Tracer
+
+
+class Clipboard:
+    """System clipboard access via pbcopy/pbpaste (macOS) or xclip (X11)."""
+
+    def __init__(self, display: Optional[str] = None):
+        """Initialize clipboard commands for the current platform.
+
+        Args:
+            display: X display the clipboard belongs to (None = $DISPLAY)
+        """
+        if platform.system() == "Darwin":
+            self._copy_cmd = ["pbcopy"]
+            self._paste_cmd = ["pbpaste"]
+            # Lists the clipboard's data types, text or not
+            self._info_cmd: Optional[List[str]] = ["osascript", "-e", "clipboard info"]
+        else:
+            self._copy_cmd = ["xclip", "-selection", "clipboard"]
+            self._paste_cmd = ["xclip", "-selection", "clipboard", "-o"]
+            # xclip already fails when there is no text to paste
+            self._info_cmd = None
+        # pbcopy/pbpaste only round-trip non-ASCII text with a UTF-8 locale
+        self._env = {**os.environ, "LANG": "en_US.UTF-8", "LC_CTYPE": "UTF-8"}
+        if display is not None:
+            self._env["DISPLAY"] = display
+
+    def get(self) -> Optional[str]:
+        """Read the clipboard text.
+
+        Returns:
+            Clipboard text, or None if it could not be read as text (e.g. the
+            clipboard holds an image), so callers know not to overwrite it
+        """
+        try:
+            result = subprocess.run(
+                self._paste_cmd, capture_output=True, env=self._env, timeout=2
+            )
+            if result.returncode != 0:
+                return None
+            text = result.stdout.decode("utf-8")
+            # pbpaste prints nothing for images, files and other non-text data
+            if not text and self._info_cmd is not None:
+                info = subprocess.run(
+                    self._info_cmd, capture_output=True, env=self._env, timeout=2
+                )
+                if info.returncode != 0 or info.stdout.strip():
+                    return None
+            return text
+        except Exception:
+            return None
+
+    def set(self, text: str) -> None:
+        """Replace the clipboard text.
+
+        Args:
+            text: Text to place on the clipboard
+
+        Raises:
+            subprocess.SubprocessError: If the clipboard command fails
+        """
+        subprocess.run(
+            self._copy_cmd,
+            input=text.encode("utf-8"),
+            env=self._env,
+            check=True,
+            timeout=2,
+        )
+
+
+class TextTyper:
+    """Enters text by keystrokes or, for long/non-ASCII text, by clipboard paste."""
+
+    def __init__(
+        self,
+        keyboard: Any,
+        clipboard: Optional[Clipboard] = None,
+        paste_threshold: int = 40,
+        chunk_size: int = 2000,
+        type_interval: float = 0.05,
+        paste_delay: float = 0.15,
+        allow_paste: bool = True,
+        tracer: Optional[Tracer] = None,
+    ):
+        """Initialize text typer.
+
+        Args:
+            keyboard: Backend providing write(), press() and hotkey()
+            clipboard: Clipboard to paste through (defaults to the system one)
+            paste_threshold: Minimum text length that is pasted instead of typed
+            chunk_size: Maximum characters pasted per command+v
+            type_interval: Seconds between keystrokes when typing
+            paste_delay: Seconds to let the app read the clipboard after a paste
+            allow_paste: Whether clipboard paste may be used at all
+            tracer: Span recorder for paste and newline delays
+        """
+        self.keyboard = keyboard
+        self.clipboard = clipboard or Clipboard()
+        self.paste_threshold = paste_threshold
+        self.chunk_size = max(1, chunk_size)
+        self.type_interval = type_interval
+        self.paste_delay = paste_delay
+        self.allow_paste = allow_paste
+        self.tracer = tracer or NULL_TRACER
+
+    def should_paste(self, text: str) -> bool:
+        """Decide whether text should be pasted rather than typed.
+
+        Args:
+            text: Text to enter
+
+        Returns:
+            True for long text or text keystrokes cannot produce (non-ASCII)
+        """
+        if not self.allow_paste or not text:
+            return False
+        return len(text) >= self.paste_threshold or not text.isascii()
+
+    def type_text(self, text: str) -> str:
+        """Enter text, using Shift+Enter for newlines so chat apps don't submit.
+
+        A clipboard that can't be read as text (an image, files) is left
+        untouched by typing instead; only text keystrokes can't produce
+        (non-ASCII) is still pasted, which replaces it for good.
+
+        Args:
+            text: Text to enter
+
+        Returns:
+            Entry mode used ("paste" or "keys")
+        """
+        if self.should_paste(text):
+            previous = self.clipboard.get()
+            if previous is None and text.isascii():
+                print("     Clipboard holds non-text data, typing to keep it")
+            elif previous is None:
+                print("     Clipboard holds non-text data; pasting replaces it")
+                self._paste_lines(text.split("\n"), None)
+                return "paste"
+            else:
+                try:
+                    # Probe the clipboard before any keystrokes so a failure
+                    # can still fall back to typing without entering text twice
+                    self.clipboard.set(previous)
+                except Exception as e:
+                    print(f"     Clipboard unavailable ({e}), typing instead")
+                    self.allow_paste = False
+                else:
+                    self._paste_lines(text.split("\n"), previous)
+                    return "paste"
+
+        self._type_lines(text.split("\n"))
+        return "keys"
+
+    def _type_lines(self, lines: List[str]) -> None:
+        """Type lines keystroke by keystroke.
+
+        Args:
+            lines: Lines to type, separated by Shift+Enter
+        """
+        for i, line in enumerate(lines):
+            if line:  # Only type non-empty lines
+                self.keyboard.write(line, interval=self.type_interval)
+            # Add newline between lines (but not after the last line)
+            if i < len(lines) - 1:
+                self._soft_newline()
+
+    def _paste_lines(self, lines: List[str], previous: Optional[str]) -> None:
+        """Paste lines through the clipboard in chunks, restoring it afterwards.
+
+        Args:
+            lines: Lines to paste, separated by Shift+Enter
+            previous: Clipboard text to restore when done (None = the
+                original contents were not text and can't be restored)
+        """
+        try:
+            for i, line in enumerate(lines):
+                for start in range(0, len(line), self.chunk_size):
+                    self.clipboard.set(line[start : start + self.chunk_size])
+                    self.keyboard.hotkey("command", "v")
+                    # The app must read the clipboard before it is overwritten
+                    self.tracer.sleep(self.paste_delay, "paste")
+                if i < len(lines) - 1:
+                    self._soft_newline()
+        finally:
+            if previous is not None:
+                try:
+                    self.clipboard.set(previous)
+                except Exception:
+                    pass
+
+    def _soft_newline(self) -> None:
+        """Insert a newline with Shift+Enter to avoid sending in chat apps."""
+        self.tracer.sleep(0.05, "newline")
+        self.keyboard.hotkey("shift", "enter")
+        self.tracer.sleep(0.05, "newline")
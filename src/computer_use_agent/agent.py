@@ -3,21 +3,46 @@
 import os
 import time
 import logging
+import threading
 import subprocess
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from google import genai
 from google.genai import types
 
 from .config import (
     AgentConfig,
     SCROLLING_INSTRUCTIONS,
+    SCROLL_UNTIL_END_INSTRUCTIONS,
     GENERIC_MACOS_INSTRUCTIONS,
 )
-from .actions import ActionExecutor, ScreenManager
+from .actions import (
+    ActionDispatcher,
+    ActionExecutor,
+    DesktopBackend,
+    FrameComparator,
+    FramePipeline,
+    SCROLL_UNTIL_END_DECLARATION,
+    ScreenManager,
+    ScreenshotEncoder,
+    TextTyper,
+    VisualSettleDetector,
+    create_backend,
+)
 from .actions.executor import get_safety_confirmation
-from .utils import ResponseHandler, RetryableAPICall
+from .utils import ResponseHandler, RetryableAPICall, ScreenshotHistory
+from .utils.blob_spool import BlobSpool
 from .utils.llm_logger import LLMLogger
+from .utils.loop_detector import LoopDetector
+from .utils.log_rotation import LogRotator
+from .utils.run_index import RunIndex
+from .utils.streaming import merge_chunks
+from .utils.screenshot_store import ScreenshotStore, inline_images
+from .utils.replay import RecordingClient, ReplayClient, summarize_contents
+from .utils.token_estimator import TokenEstimate, TokenEstimator
+from .utils.tracing import Tracer
+from .utils.usage import UsageTracker
 
 logger = logging.getLogger(__name__)
 
@@ -25,31 +50,175 @@ logger = logging.getLogger(__name__)
 class ComputerUseAgent:
     """Main orchestrator for Computer Use automation."""
 
-    def __init__(self, config: AgentConfig):
+    def __init__(
+        self,
+        config: AgentConfig,
+        backend: Optional[DesktopBackend] = None,
+        client: Optional[Any] = None,
+    ):
         """Initialize the agent.
 
         Args:
             config: Agent configuration
+            backend: Desktop backend (defaults to the one named in config)
+            client: Model client (defaults to genai.Client, or a ReplayClient
+                when config.replay_file is set)
         """
         self.config = config
+        self.tracer = Tracer(enabled=config.trace)
 
         # Initialize API client
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set")
-        self.client = genai.Client(api_key=api_key)
+        if client is not None:
+            self.client = client
+        elif config.replay_file:
+            self.client = ReplayClient(
+                config.replay_file, latency=config.replay_latency
+            )
+        else:
+            api_key = os.environ.get("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY environment variable not set")
+            self.client = genai.Client(api_key=api_key)
 
         # Get screen dimensions
-        import pyautogui
-
-        width = config.screen_width or pyautogui.size()[0]
-        height = config.screen_height or pyautogui.size()[1]
+        self.backend = backend or create_backend(config.backend)
+        screen_width, screen_height = self.backend.size()
+        width = config.screen_width or screen_width
+        height = config.screen_height or screen_height
 
         # Initialize components
-        self.screen = ScreenManager(width, height)
-        self.executor = ActionExecutor(self.screen, verbose=config.verbose)
-        self.response_handler = ResponseHandler(self.screen)
-        self.llm_logger = LLMLogger()
+        target_size = None
+        if config.screenshot_max_width and config.screenshot_max_height:
+            target_size = (config.screenshot_max_width, config.screenshot_max_height)
+        encoder = ScreenshotEncoder(
+            image_format=config.screenshot_format,
+            target_size=target_size,
+            png_compress_level=config.png_compress_level,
+            quality=config.screenshot_quality,
+            grayscale=config.screenshot_grayscale,
+        )
+        # Settled frames come from the settle detector, so pipelining needs it
+        self.frame_pipeline = None
+        if config.pipeline_capture and config.adaptive_settle:
+            self.frame_pipeline = FramePipeline(
+                encoder,
+                workers=config.encode_workers,
+                use_processes=config.encode_in_process,
+                tracer=self.tracer,
+            )
+        self.screen = ScreenManager(
+            width,
+            height,
+            self.backend,
+            encoder=encoder,
+            tracer=self.tracer,
+            pipeline=self.frame_pipeline,
+            comparator=FrameComparator() if config.dedupe_screenshots else None,
+        )
+        settle_detector = None
+        if config.adaptive_settle:
+            settle_detector = VisualSettleDetector(
+                self.screen.capture_image,
+                timeout=config.settle_timeout,
+                interval=config.settle_interval,
+                stable_frames=config.settle_stable_frames,
+                threshold=config.settle_threshold,
+                grab_sample=self.screen.capture_sample,
+                min_wait=config.settle_min_wait,
+            )
+        self.executor = ActionExecutor(
+            self.screen,
+            verbose=config.verbose,
+            settle_detector=settle_detector,
+            input_pause=config.input_pause,
+            wait_quiet_window=config.wait_quiet_window,
+            wait_max_seconds=config.wait_max_seconds,
+            text_typer=TextTyper(
+                self.backend,
+                clipboard=self.backend.clipboard,
+                paste_threshold=config.paste_threshold,
+                chunk_size=config.paste_chunk_size,
+                allow_paste=config.allow_paste,
+                tracer=self.tracer,
+            ),
+            tracer=self.tracer,
+            scroll_until_end_clicks=config.scroll_until_end_clicks,
+            scroll_until_end_max=config.scroll_until_end_max,
+            # Leave room for the screenshot sent with the sheets
+            scroll_until_end_sheets=config.max_inline_screenshots - 1,
+            pixel_scroll=config.pixel_scroll,
+            pixels_per_click=config.scroll_pixels_per_click,
+            scroll_duration=config.scroll_duration,
+        )
+        # Streaming mode starts each function call as soon as it arrives
+        self.dispatcher = None
+        if config.stream_responses:
+            self.dispatcher = ActionDispatcher(
+                self.executor,
+                lambda sd: get_safety_confirmation(sd, config.yolo_mode),
+            )
+        self.response_handler = ResponseHandler(
+            self.screen,
+            delta_max_fraction=(
+                config.delta_max_fraction if config.delta_screenshots else None
+            ),
+            # A full frame must stay inline for the regions to make sense
+            full_frame_every=config.max_inline_screenshots,
+        )
+        screenshot_store = None
+        if config.archive_screenshots:
+            max_mb = config.screenshot_archive_max_mb
+            screenshot_store = ScreenshotStore(
+                config.screenshot_archive_dir,
+                compression=config.screenshot_archive_compression,
+                max_bytes=max_mb * 1024 * 1024 if max_mb is not None else None,
+            )
+        self.llm_logger = LLMLogger(screenshot_store=screenshot_store)
+        if config.record_model_calls:
+            # Recorded calls sit next to the LLM log for offline replay
+            self.client = RecordingClient(
+                self.client,
+                Path(self.llm_logger.get_log_path()).with_suffix(".replay.jsonl"),
+            )
+        self.history = ScreenshotHistory(
+            max_inline=config.max_inline_screenshots,
+            max_inline_bytes=config.max_inline_screenshot_bytes,
+            placeholder=config.screenshot_placeholder,
+        )
+        self.loop_detector = (
+            LoopDetector(
+                repeat_limit=config.loop_repeat_limit,
+                max_nudges=config.loop_max_nudges,
+            )
+            if config.loop_detection
+            else None
+        )
+        self._loop_frame = None
+        self.spool = BlobSpool(config.spool_dir) if config.spool_screenshots else None
+
+        # Log directory housekeeping and run bookkeeping for the run index
+        log_dir = self.llm_logger.log_dir
+        self.run_index = (
+            RunIndex(log_dir / "runs.sqlite") if config.index_runs else None
+        )
+        self.log_rotator = LogRotator(
+            log_dir,
+            max_age_days=config.log_retention_days,
+            max_total_bytes=(
+                config.log_max_total_mb * 1024 * 1024
+                if config.log_max_total_mb is not None
+                else None
+            ),
+            compress=config.compress_logs,
+            run_index=self.run_index,
+        )
+        self._log_maintenance: Optional[threading.Thread] = None
+        self.started_at: Optional[datetime] = None
+        self.outcome = "incomplete"
+        self.steps_taken = 0
+        self.usage = UsageTracker(token_budget=config.token_budget)
+        self.token_estimator = TokenEstimator()
+        self._last_estimate: Optional[TokenEstimate] = None
 
     def _play_sound(self, sound_name: str) -> None:
         """Play a system sound on macOS.
@@ -76,6 +245,86 @@ class ComputerUseAgent:
         Returns:
             True if successful, False otherwise
         """
+        system_instruction, model_config = self._start_run()
+
+        # Initial screenshot and setup
+        print("📸 Taking initial screenshot...")
+        contents = self._initial_contents()
+
+        if self.config.countdown_seconds:
+            print(
+                f"⏱️  Starting in {self.config.countdown_seconds} seconds... "
+                f"Please make sure {self.config.app_name} is open!"
+            )
+            for i in range(self.config.countdown_seconds, 0, -1):
+                print(f"   {i}...")
+                time.sleep(1)
+
+        # Agent loop
+        self.outcome = "max_iterations"
+        for iteration in range(self.config.max_iterations):
+            self.steps_taken = iteration + 1
+            with self.tracer.span("step", step=iteration + 1):
+                if not self._begin_step(contents, system_instruction, iteration):
+                    return False
+
+                # Get model response with retry logic
+                print("🤔 Analyzing screen and planning next action...")
+                response = self._call_model_with_retry(
+                    contents, model_config, iteration
+                )
+
+                candidate = self._handle_response(response, contents, iteration)
+                if candidate is None:
+                    if self.outcome == "success":
+                        break
+                    return False
+
+                # Execute function calls
+                print("⚙️  Executing actions...")
+                if self.dispatcher is not None:
+                    # Dispatched while the response was streaming
+                    results, should_terminate = self.dispatcher.collect()
+                else:
+                    results, should_terminate = self.executor.execute_function_calls(
+                        candidate,
+                        lambda sd: get_safety_confirmation(sd, self.config.yolo_mode),
+                    )
+
+                if should_terminate:
+                    print("❌ Agent terminated due to safety decision")
+                    self.outcome = "terminated"
+                    break
+
+                print("📸 Capturing new state...")
+                observation = self._observe(results, iteration)
+                if observation is not None:
+                    contents.append(observation)
+                if self._detect_loop(candidate, observation, iteration):
+                    return False
+
+                # The executor already waited for the screen to settle
+                if not self.config.adaptive_settle:
+                    self.tracer.sleep(0.5, "loop")
+
+        return self._finish_run()
+
+    def _start_run(self) -> Tuple[str, types.GenerateContentConfig]:
+        """Start run bookkeeping, print the run header and build the model config.
+
+        Returns:
+            Tuple of (system instruction, model configuration)
+        """
+        self.started_at = datetime.now()
+        # Compress and prune older runs' logs without delaying the first step
+        self._log_maintenance = threading.Thread(
+            target=self.log_rotator.rotate,
+            args=(Path(self.llm_logger.get_log_path()).stem,),
+            name="log-rotation",
+            daemon=True,
+        )
+        self._log_maintenance.start()
+
         print(f"\n{'=' * 60}")
         if self.config.original_goal:
             print(f"📝 ORIGINAL GOAL: {self.config.original_goal}")
@@ -88,122 +337,243 @@ class ComputerUseAgent:
             print(f"🎯 GOAL: {self.config.goal}")
         print(f"📱 APP: {self.config.app_name}")
         print(f"📋 LLM LOG: {self.llm_logger.get_log_path()}")
+        if self.llm_logger.screenshot_store:
+            print(f"🖼️  SCREENSHOTS: {self.llm_logger.screenshot_store.root}")
+        if isinstance(self.client, RecordingClient):
+            print(f"⏺️  RECORDING: {self.client.path}")
+        elif isinstance(self.client, ReplayClient):
+            print(f"⏯️  REPLAYING: {self.config.replay_file}")
         print(f"{'=' * 60}\n")
 
         # Build configuration
         system_instruction = self._build_system_instruction()
-        model_config = self._create_model_config(system_instruction)
+        return system_instruction, self._create_model_config(system_instruction)
 
-        # Initial screenshot and setup
-        print("📸 Taking initial screenshot...")
-        initial_screenshot = self.screen.capture_screenshot()
+    def _initial_contents(self) -> List[types.Content]:
+        """Capture the first screenshot and build the opening user turn.
 
-        # Initialize conversation
-        contents = [
+        Returns:
+            Conversation contents holding the goal and the current screen
+        """
+        initial_screenshot = self.screen.capture_screenshot()
+        return [
             types.Content(
                 role="user",
                 parts=[
                     types.Part(text=self.config.goal),
                     types.Part(
                         inline_data=types.Blob(
-                            mime_type="image/png", data=initial_screenshot
+                            mime_type=self.screen.mime_type,
+                            data=initial_screenshot,
                         )
                     ),
                 ],
             )
         ]
 
-        print(
-            f"⏱️  Starting in 3 seconds... Please make sure {self.config.app_name} is open!"
-        )
-        for i in range(3, 0, -1):
-            print(f"   {i}...")
-            time.sleep(1)
-
-        # Determine app URL
-        app_url = f"{self.config.app_name.lower().replace(' ', '-')}://app"
+    def _begin_step(
+        self, contents: List[types.Content], system_instruction: str, iteration: int
+    ) -> bool:
+        """Announce a step and bring the request within its limits.
 
-        # Agent loop
-        for iteration in range(self.config.max_iterations):
-            # Play step sound notification (quick "Tink" sound)
-            self._play_sound("Tink")
+        Args:
+            contents: Conversation contents (compacted in place)
+            system_instruction: System instruction sent with the request
+            iteration: Current iteration number
 
-            print(f"\n{'=' * 40}")
-            print(f"📍 STEP {iteration + 1}/{self.config.max_iterations}")
-            print(f"{'=' * 40}")
+        Returns:
+            True if the model may be called
+        """
+        # Play step sound notification (quick "Tink" sound)
+        self._play_sound("Tink")
+
+        print(f"\n{'=' * 40}")
+        print(f"📍 STEP {iteration + 1}/{self.config.max_iterations}")
+        print(f"{'=' * 40}")
+
+        # Spilled screenshots are needed again to compact and send the request
+        if self.spool is not None:
+            with self.tracer.span("spool.load"):
+                self.spool.materialize(contents)
+
+        # Keep only the most recent screenshots inline so request size stays flat
+        with self.tracer.span("history.compact"):
+            history_stats = self.history.compact(contents)
+        if self.config.verbose and history_stats.compacted:
+            print(
+                f"🗜️  Compacted {history_stats.compacted} older screenshot(s) "
+                f"({history_stats.inline_images} inline, "
+                f"{history_stats.inline_bytes / 1024:.0f} KB)"
+            )
 
-            # Get model response with retry logic
-            print("🤔 Analyzing screen and planning next action...")
-            response = self._call_model_with_retry(contents, model_config, iteration)
+        # Check the request fits before paying for a round trip
+        return self._preflight(contents, system_instruction, iteration)
 
-            if not response:
-                print("❌ Model returned no response object")
-                self.llm_logger.log_error(
-                    iteration + 1, "No response object from model"
-                )
-                return False
-
-            if not response.candidates:
-                print("❌ Model returned no candidates")
-                print(f"   Response object: {response}")
-                if hasattr(response, "prompt_feedback"):
-                    print(f"   Prompt feedback: {response.prompt_feedback}")
-                self.llm_logger.log_error(
-                    iteration + 1,
-                    f"No candidates in response. Prompt feedback: {getattr(response, 'prompt_feedback', 'N/A')}",
-                )
-                return False
+    def _handle_response(
+        self,
+        response: Optional[types.GenerateContentResponse],
+        contents: List[types.Content],
+        iteration: int,
+    ) -> Optional[types.Candidate]:
+        """Validate a model response and add it to the conversation.
 
-            candidate = response.candidates[0]
+        Args:
+            response: Model response (None if the call failed)
+            contents: Conversation contents (the candidate is appended)
+            iteration: Current iteration number
 
-            # Add model response to history
-            if candidate.content:
-                contents.append(candidate.content)
+        Returns:
+            Candidate whose function calls should run next, or None when the
+            run ends (self.outcome is "success" if the task is complete)
+        """
+        # The request is sent; screenshots can leave memory until the next one
+        if self.spool is not None:
+            with self.tracer.span("spool.spill"):
+                self.spool.spill(contents)
+
+        if not response:
+            print("❌ Model returned no response object")
+            self.llm_logger.log_error(iteration + 1, "No response object from model")
+            self.outcome = "error"
+            return None
+
+        if not response.candidates:
+            print("❌ Model returned no candidates")
+            print(f"   Response object: {response}")
+            if hasattr(response, "prompt_feedback"):
+                print(f"   Prompt feedback: {response.prompt_feedback}")
+            self.llm_logger.log_error(
+                iteration + 1,
+                f"No candidates in response. Prompt feedback: {getattr(response, 'prompt_feedback', 'N/A')}",
+            )
+            self.outcome = "error"
+            return None
+
+        candidate = response.candidates[0]
+
+        # Add model response to history
+        if candidate.content:
+            contents.append(candidate.content)
+
+        # Check if task is complete (a final answer counts even over budget)
+        if not self.response_handler.has_function_calls(candidate):
+            text_response = self.response_handler.extract_text_response(candidate)
+            if text_response:
+                print(f"✅ Agent finished: {text_response}")
+            else:
+                print("✅ Task completed")
+            self.outcome = "success"
+            return None
+
+        # Don't start another step once the budget is used up
+        if self.usage.over_budget:
+            if self.dispatcher is not None:
+                self.dispatcher.collect()  # already streamed; let them finish
+            print(
+                f"💸 Token budget of {self.usage.token_budget:,} used up "
+                f"({self.usage.total_tokens:,} tokens); stopping"
+            )
+            self.llm_logger.log_error(iteration + 1, "Token budget exceeded")
+            self._save_progress(iteration)
+            self.outcome = "budget_exceeded"
+            return None
 
-            # Check if task is complete
-            if not self.response_handler.has_function_calls(candidate):
-                text_response = self.response_handler.extract_text_response(candidate)
-                if text_response:
-                    print(f"✅ Agent finished: {text_response}")
-                else:
-                    print("✅ Task completed")
-                break
+        return candidate
 
-            # Execute function calls
-            print("⚙️  Executing actions...")
-            results, should_terminate = self.executor.execute_function_calls(
-                candidate, lambda sd: get_safety_confirmation(sd, self.config.yolo_mode)
-            )
+    def _observe(self, results: list, iteration: int) -> Optional[types.Content]:
+        """Capture the new screen state as function responses.
 
-            if should_terminate:
-                print("❌ Agent terminated due to safety decision")
-                break
+        Args:
+            results: (function name, result dict) pairs of the executed calls
+            iteration: Current iteration number
 
-            # ALWAYS TAKE SCREENSHOTS: Critical for accuracy
-            # Previously we skipped screenshots during scrolls to save tokens,
-            # but this caused the LLM to hallucinate message content it couldn't see.
-            # Accuracy is more important than token optimization.
-            include_screenshot = True
-            print("📸 Capturing new state...")
+        Returns:
+            User turn holding the function responses, or None if there are none
+        """
+        # ALWAYS TAKE SCREENSHOTS: Critical for accuracy
+        # Previously we skipped screenshots during scrolls to save tokens,
+        # but this caused the LLM to hallucinate message content it couldn't see.
+        # Accuracy is more important than token optimization.
+        include_screenshot = True
+        app_url = f"{self.config.app_name.lower().replace(' ', '-')}://app"
 
+        with self.tracer.span("step.observe"):
             function_responses = self.response_handler.create_function_responses(
                 results, iteration, include_screenshot, app_url
             )
+        if not function_responses:
+            return None
+        return types.Content(
+            role="user",
+            parts=[types.Part(function_response=fr) for fr in function_responses],
+        )
 
-            # Add function responses to conversation
-            if function_responses:
-                contents.append(
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part(function_response=fr)
-                            for fr in function_responses
-                        ],
-                    )
-                )
+    def _detect_loop(
+        self,
+        candidate: types.Candidate,
+        observation: Optional[types.Content],
+        iteration: int,
+    ) -> bool:
+        """Check whether recent steps loop; hint the model or stop the run.
 
-            time.sleep(0.5)
+        Args:
+            candidate: Candidate whose function calls just ran
+            observation: User turn holding their function responses (the hint
+                is added to the last one)
+            iteration: Current iteration number
 
+        Returns:
+            True if the run should stop
+        """
+        if self.loop_detector is None:
+            return False
+
+        settle = self.executor.settle_detector
+        if settle is not None:
+            # The settle wait sees the final screen even when none is sent
+            frame = settle.last_frame
+        elif self.screen.last_frame is not self._loop_frame:
+            frame = self.screen.last_frame
+        else:
+            frame = None  # No screenshot this step (e.g. a scroll-only batch)
+        self._loop_frame = self.screen.last_frame
+
+        function_calls = [
+            part.function_call
+            for part in candidate.content.parts or []
+            if part.function_call
+        ]
+        verdict = self.loop_detector.record(
+            LoopDetector.action_signature(function_calls),
+            LoopDetector.frame_key(frame) if frame is not None else None,
+        )
+        if verdict is None:
+            return False
+
+        if verdict.stop:
+            reason = (
+                f"Agent kept looping ({verdict.kind}) after "
+                f"{self.loop_detector.max_nudges} hints: {verdict.message}"
+            )
+            print(f"🔁 {reason}; stopping")
+            self.llm_logger.log_error(iteration + 1, reason)
+            self._save_progress(iteration)
+            self.outcome = "loop_detected"
+            return True
+
+        print(f"🔁 Loop detected ({verdict.kind}); nudging the model")
+        if observation is not None and observation.parts:
+            response = observation.parts[-1].function_response
+            response.response = dict(response.response or {})
+            response.response["loop_warning"] = verdict.message
+        return False
+
+    def _finish_run(self) -> bool:
+        """Announce completion and clean up the progress file.
+
+        Returns:
+            True (the run completed)
+        """
         print(f"\n{'=' * 60}")
         print("✅ AGENT TASK COMPLETED")
         print(f"{'=' * 60}")
@@ -217,6 +587,83 @@ class ComputerUseAgent:
 
         return True
 
+    def close(self) -> None:
+        """Release resources held by the agent (e.g. a headless display).
+
+        Also flushes the LLM log, records the run in the run index and writes
+        the timing trace when tracing is enabled.
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.shutdown()
+        if self.frame_pipeline is not None:
+            self.frame_pipeline.shutdown()
+            stats = self.frame_pipeline.stats
+            print(
+                f"⏩ PIPELINE: {stats.hits} prefetched observations, "
+                f"{stats.misses} captured on demand, "
+                f"{stats.saved_seconds:.2f}s off the critical path"
+            )
+        if self.usage.steps:
+            print(f"💰 USAGE: {self.usage.summary()}")
+        if self.loop_detector is not None:
+            loops = self.loop_detector.stats
+            if loops.repeats or loops.oscillations:
+                print(
+                    f"🔁 LOOPS: {loops.repeats} repeats, "
+                    f"{loops.oscillations} oscillations, {loops.nudges} nudges"
+                    + (", run stopped" if loops.stopped else "")
+                )
+        if self.spool is not None:
+            self.spool.close()
+            stats = self.spool.stats
+            print(
+                f"💾 SPOOL: {stats.spilled} screenshots spilled "
+                f"({stats.spool_bytes / 1024:.0f} KB on disk), at most "
+                f"{stats.peak_resident_bytes / 1024:.0f} KB in memory"
+            )
+        self.llm_logger.close()
+        if self.llm_logger.dropped:
+            print(f"⚠️  LLM log dropped {self.llm_logger.dropped} entries (queue full)")
+        if self.llm_logger.failed:
+            print(f"⚠️  LLM log could not write {self.llm_logger.failed} entries")
+        if self.run_index is not None and self.started_at is not None:
+            try:
+                self.run_index.record_run(
+                    started_at=self.started_at,
+                    goal=self.config.goal,
+                    app=self.config.app_name,
+                    model=self.config.model_name,
+                    steps=self.steps_taken,
+                    outcome=self.outcome,
+                    duration_seconds=(datetime.now() - self.started_at).total_seconds(),
+                    prompt_tokens=self.usage.prompt_tokens,
+                    output_tokens=self.usage.output_tokens,
+                    log_file=self.llm_logger.get_log_path(),
+                )
+            except Exception as e:
+                logger.error(f"Could not record run in index: {e}")
+        if self._log_maintenance is not None:
+            self._log_maintenance.join()
+        if self.config.trace and self.tracer.spans:
+            self.export_trace()
+        self.backend.close()
+
+    def export_trace(self) -> Path:
+        """Write recorded spans next to the LLM log.
+
+        Two files are written: ``.trace.jsonl`` (one span per line) and
+        ``.trace.json`` (Chrome trace events for chrome://tracing or Perfetto).
+
+        Returns:
+            Path of the Chrome trace file
+        """
+        base = Path(self.llm_logger.get_log_path())
+        self.tracer.export_jsonl(base.with_suffix(".trace.jsonl"))
+        chrome_path = base.with_suffix(".trace.json")
+        self.tracer.export_chrome_trace(chrome_path)
+        print(f"🧭 Trace written to {chrome_path}")
+        return chrome_path
+
     def _build_system_instruction(self) -> str:
         """Build complete system instruction.
 
@@ -225,6 +672,8 @@ class ComputerUseAgent:
         """
         # Start with scrolling instructions (universal for all apps)
         instruction = SCROLLING_INSTRUCTIONS + "\n\n" + GENERIC_MACOS_INSTRUCTIONS
+        if self.config.scroll_until_end:
+            instruction += "\n\n" + SCROLL_UNTIL_END_INSTRUCTIONS
 
         if self.config.app_instructions:
             instruction += "\n\n" + self.config.app_instructions
@@ -244,15 +693,21 @@ class ComputerUseAgent:
         Returns:
             GenerateContentConfig for the model
         """
-        config_params = {
-            "tools": [
-                types.Tool(
-                    computer_use=types.ComputerUse(
-                        environment=types.Environment.ENVIRONMENT_BROWSER,
-                        excluded_predefined_functions=self.config.excluded_functions,
-                    )
+        tools = [
+            types.Tool(
+                computer_use=types.ComputerUse(
+                    environment=types.Environment.ENVIRONMENT_BROWSER,
+                    excluded_predefined_functions=self.config.excluded_functions,
                 )
-            ],
+            )
+        ]
+        if self.config.scroll_until_end:
+            # Custom functions are declared alongside the Computer Use tool
+            tools.append(
+                types.Tool(function_declarations=[SCROLL_UNTIL_END_DECLARATION])
+            )
+        config_params = {
+            "tools": tools,
             "temperature": self.config.temperature,
             "system_instruction": system_instruction,
         }
@@ -278,63 +733,36 @@ class ComputerUseAgent:
         Returns:
             Model response or None if failed
         """
-        retry_helper = RetryableAPICall(
-            max_retries=3,
-            initial_delay=2.0,
-            on_503_callback=lambda retry, delay: print(
-                f"⚠️  API temporarily unavailable (attempt {retry + 1}/3)\n"
-                f"   Waiting {delay} seconds before retry..."
-            ),
-            on_429_callback=lambda: print(
-                "⚠️  Rate limit reached. Waiting 30 seconds..."
-            ),
-        )
+        retry_helper = self._create_retry_helper()
 
         for retry in range(retry_helper.max_retries):
             try:
-                # Log request
-                prompt_text = (
-                    f"System: {config.system_instruction}\n\nStep {iteration + 1}"
-                )
-                self.llm_logger.log_request(iteration + 1, prompt_text, image_data=True)
+                request = self._log_request(contents, config, iteration)
 
                 # Call API
-                response = self.client.models.generate_content(
-                    model=self.config.model_name,
-                    contents=contents,
-                    config=config,
-                )
-
-                # Log response
-                if response and response.candidates:
-                    candidate = response.candidates[0]
-                    response_text = (
-                        self.response_handler.extract_text_response(candidate) or ""
-                    )
-                    function_calls = []
-                    if candidate.content and candidate.content.parts:
-                        for part in candidate.content.parts:
-                            if hasattr(part, "function_call") and part.function_call:
-                                function_calls.append(
-                                    {
-                                        "name": part.function_call.name,
-                                        "args": (
-                                            dict(part.function_call.args)
-                                            if part.function_call.args
-                                            else {}
-                                        ),
-                                    }
-                                )
-                    self.llm_logger.log_response(
-                        iteration + 1, response_text, function_calls
-                    )
+                with self.tracer.span(
+                    "model.call", step=iteration + 1, attempt=retry + 1
+                ) as span:
+                    if self.dispatcher is not None:
+                        response = self._stream_model_response(contents, config, span)
+                    else:
+                        response = self.client.models.generate_content(
+                            model=self.config.model_name,
+                            contents=contents,
+                            config=config,
+                        )
 
+                self._record_response(response, request, iteration)
                 return response
 
             except Exception as e:
                 self.llm_logger.log_error(iteration + 1, str(e))
-                if retry < retry_helper.max_retries - 1 and retry_helper.should_retry(
-                    e
+                # Never resend a request whose actions already ran on screen
+                dispatched = self.dispatcher is not None and self.dispatcher.dispatched
+                if (
+                    not dispatched
+                    and retry < retry_helper.max_retries - 1
+                    and retry_helper.should_retry(e)
                 ):
                     retry_helper.retry_count = retry
                     retry_helper.wait_and_retry()
@@ -342,11 +770,196 @@ class ComputerUseAgent:
                 else:
                     # Final failure
                     print(f"❌ API Error: {e}")
+                    if dispatched:
+                        self.dispatcher.collect()
                     self._save_progress(iteration)
                     return None
 
         return None
 
+    def _create_retry_helper(self) -> RetryableAPICall:
+        """Create the retry policy for one step's model call.
+
+        Returns:
+            RetryableAPICall printing retry notices
+        """
+        return RetryableAPICall(
+            max_retries=3,
+            initial_delay=2.0,
+            on_503_callback=lambda retry, delay: print(
+                f"⚠️  API temporarily unavailable (attempt {retry + 1}/3)\n"
+                f"   Waiting {delay} seconds before retry..."
+            ),
+            on_429_callback=lambda: print(
+                "⚠️  Rate limit reached. Waiting 30 seconds..."
+            ),
+            tracer=self.tracer,
+        )
+
+    def _log_request(self, contents, config, iteration: int) -> Dict[str, Any]:
+        """Log a model request.
+
+        Args:
+            contents: Conversation contents
+            config: Model configuration
+            iteration: Current iteration number
+
+        Returns:
+            Request summary for usage accounting
+        """
+        prompt_text = f"System: {config.system_instruction}\n\nStep {iteration + 1}"
+        self.llm_logger.log_request(
+            iteration + 1, prompt_text, image_data=inline_images(contents)
+        )
+        return summarize_contents(contents)
+
+    def _record_response(
+        self,
+        response: Optional[types.GenerateContentResponse],
+        request: Dict[str, Any],
+        iteration: int,
+    ) -> None:
+        """Account a model response's usage and write it to the LLM log.
+
+        Args:
+            response: Model response
+            request: Request summary from _log_request
+            iteration: Current iteration number
+        """
+        usage = self.usage.record(
+            iteration + 1, getattr(response, "usage_metadata", None), request
+        )
+        if self._last_estimate is not None:
+            self.token_estimator.calibrate(self._last_estimate, usage.prompt_tokens)
+        if self.config.verbose:
+            print(
+                f"🪙 {usage.prompt_tokens:,} prompt + {usage.output_tokens:,} "
+                f"output tokens, {usage.request_image_bytes / 1024:.0f} KB "
+                f"of images (run total {self.usage.total_tokens:,} tokens)"
+            )
+
+        # Log response
+        if response and response.candidates:
+            candidate = response.candidates[0]
+            response_text = self.response_handler.extract_text_response(candidate) or ""
+            function_calls = []
+            if candidate.content and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if hasattr(part, "function_call") and part.function_call:
+                        function_calls.append(
+                            {
+                                "name": part.function_call.name,
+                                "args": (
+                                    dict(part.function_call.args)
+                                    if part.function_call.args
+                                    else {}
+                                ),
+                            }
+                        )
+            self.llm_logger.log_response(
+                iteration + 1,
+                response_text,
+                function_calls,
+                usage=self.usage.log_fields(usage),
+            )
+
+    def _stream_model_response(
+        self, contents, config, span
+    ) -> types.GenerateContentResponse:
+        """Stream a model response, dispatching function calls as they arrive.
+
+        Thinking text is printed as it streams. Each complete function call is
+        handed to the action dispatcher right away, so the first action runs
+        while later parts are still being generated.
+
+        Args:
+            contents: Conversation contents
+            config: Model configuration
+            span: model.call span (gets time_to_first_action, in seconds)
+
+        Returns:
+            Response assembled from the streamed chunks
+        """
+        chunks = []
+        thinking = False
+        start = time.perf_counter()
+        for chunk in self.client.models.generate_content_stream(
+            model=self.config.model_name,
+            contents=contents,
+            config=config,
+        ):
+            chunks.append(chunk)
+            candidate = chunk.candidates[0] if chunk.candidates else None
+            parts = candidate.content.parts if candidate and candidate.content else None
+            for part in parts or []:
+                if part.thought and part.text:
+                    if not thinking:
+                        print("💭 ", end="")
+                        thinking = True
+                    print(part.text, end="", flush=True)
+                if part.function_call:
+                    if not self.dispatcher.dispatched:
+                        span.attributes["time_to_first_action"] = round(
+                            time.perf_counter() - start, 4
+                        )
+                    self.dispatcher.submit(part.function_call)
+        if thinking:
+            print()
+        return merge_chunks(chunks)
+
+    def _preflight(
+        self, contents: list, system_instruction: str, iteration: int
+    ) -> bool:
+        """Estimate the next request locally and keep it within limits.
+
+        A request that would overflow the context window first gets its
+        screenshot history cut down to the latest screen. If it still does not
+        fit, or it would push the run past its token budget, the run stops
+        cleanly instead of failing with an API error.
+
+        Args:
+            contents: Conversation contents (compacted in place if needed)
+            system_instruction: System instruction sent with the request
+            iteration: Current iteration number
+
+        Returns:
+            True if the request may be sent
+        """
+        with self.tracer.span("preflight"):
+            estimate = self.token_estimator.estimate(contents, system_instruction)
+            limit = self.config.context_token_limit
+            if limit is not None and estimate.total > limit:
+                stats = self.history.compact(contents, max_inline=1)
+                print(
+                    f"🗜️  Request estimated at {estimate.total:,} tokens "
+                    f"(limit {limit:,}); compacted {stats.compacted} screenshot(s)"
+                )
+                estimate = self.token_estimator.estimate(contents, system_instruction)
+        self._last_estimate = estimate
+
+        budget = self.usage.token_budget
+        outcome = reason = None
+        if limit is not None and estimate.total > limit:
+            outcome = "context_exceeded"
+            reason = (
+                f"Request would exceed the context window "
+                f"(~{estimate.total:,} of {limit:,} tokens)"
+            )
+        elif budget is not None and self.usage.total_tokens + estimate.total > budget:
+            outcome = "budget_exceeded"
+            reason = (
+                f"Next request (~{estimate.total:,} tokens) would exceed the "
+                f"token budget ({self.usage.total_tokens:,} of {budget:,} used)"
+            )
+        if reason is None:
+            return True
+
+        print(f"❌ {reason}; stopping")
+        self.llm_logger.log_error(iteration + 1, reason)
+        self._save_progress(iteration)
+        self.outcome = outcome
+        return False
+
     def _save_progress(self, iteration: int):
         """Save progress for recovery.
 
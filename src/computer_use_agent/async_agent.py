@@ -0,0 +1,315 @@
+"""asyncio-native variant of the agent orchestrator."""
+
+import asyncio
+import threading
+from typing import Any, List, Optional
+
+from google.genai import types
+
+from .actions import DesktopBackend
+from .actions.executor import get_safety_confirmation
+from .agent import ComputerUseAgent
+from .config import AgentConfig
+
+
+class AsyncComputerUseAgent(ComputerUseAgent):
+    """ComputerUseAgent whose loop runs on an asyncio event loop.
+
+    Model calls go through the SDK's async client (``client.aio``) when the
+    client has one. Desktop input, screen capture and screenshot encoding run
+    in worker threads, and LLM log writes happen on the logger's own thread,
+    so the event loop is free while a step waits on the network or the screen
+    and many runs can share one loop.
+
+    Cancellation is cooperative: cancel() stops the run at the next step
+    boundary, and cancelling the task stops it at the next await. Blocking
+    work already handed to a worker thread (e.g. a half-typed text) runs to
+    completion either way, since threads cannot be interrupted. When a step
+    exceeds step_timeout, actions that have not started are skipped and the
+    run waits for the running ones before it returns, so no input reaches
+    the desktop after run() has finished.
+    """
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        backend: Optional[DesktopBackend] = None,
+        client: Optional[Any] = None,
+    ):
+        """Initialize the agent.
+
+        Args:
+            config: Agent configuration (step_timeout sets the per-step deadline)
+            backend: Desktop backend (defaults to the one named in config)
+            client: Model client (defaults to genai.Client, or a ReplayClient
+                when config.replay_file is set)
+        """
+        super().__init__(config, backend=backend, client=client)
+        self._cancel_requested = threading.Event()
+        # Worker thread currently driving the desktop, kept past a step timeout
+        self._desktop_work: Optional[asyncio.Future] = None
+
+    def cancel(self) -> None:
+        """Ask the run to stop at the next step boundary (thread-safe)."""
+        self._cancel_requested.set()
+
+    async def run(self) -> bool:
+        """Run the agent to accomplish the goal.
+
+        Returns:
+            True if successful, False otherwise
+
+        Raises:
+            asyncio.CancelledError: If the task running the agent is cancelled
+        """
+        system_instruction, model_config = self._start_run()
+
+        # Initial screenshot and setup
+        print("📸 Taking initial screenshot...")
+        contents = await asyncio.to_thread(self._initial_contents)
+
+        if self.config.countdown_seconds:
+            print(
+                f"⏱️  Starting in {self.config.countdown_seconds} seconds... "
+                f"Please make sure {self.config.app_name} is open!"
+            )
+            for i in range(self.config.countdown_seconds, 0, -1):
+                print(f"   {i}...")
+                await asyncio.sleep(1)
+
+        # Agent loop
+        self.outcome = "max_iterations"
+        iteration = 0
+        try:
+            for iteration in range(self.config.max_iterations):
+                if self._cancel_requested.is_set():
+                    self._stop_cancelled(iteration)
+                    return False
+                self.steps_taken = iteration + 1
+
+                try:
+                    async with asyncio.timeout(self.config.step_timeout):
+                        finished = await self._step(
+                            contents, system_instruction, model_config, iteration
+                        )
+                except TimeoutError:
+                    reason = f"Step exceeded its {self.config.step_timeout}s deadline"
+                    print(f"⏰ {reason}; stopping")
+                    await self._drain_desktop_work()
+                    self.llm_logger.log_error(iteration + 1, reason)
+                    self._save_progress(iteration)
+                    self.outcome = "step_timeout"
+                    return False
+
+                if finished is False:
+                    return False
+                if finished:
+                    break
+        except asyncio.CancelledError:
+            self._stop_cancelled(iteration)
+            raise
+
+        return self._finish_run()
+
+    async def aclose(self) -> None:
+        """Release resources without blocking the event loop (see close())."""
+        await asyncio.to_thread(self.close)
+
+    async def _step(
+        self,
+        contents: List[types.Content],
+        system_instruction: str,
+        model_config: types.GenerateContentConfig,
+        iteration: int,
+    ) -> Optional[bool]:
+        """Run one step: call the model, execute its actions, observe.
+
+        Args:
+            contents: Conversation contents (updated in place)
+            system_instruction: System instruction sent with the request
+            model_config: Model configuration
+            iteration: Current iteration number
+
+        Returns:
+            None to continue, True if the loop is done (task complete or
+            terminated), False if the run failed
+        """
+        with self.tracer.span("step", step=iteration + 1):
+            # Spool reads, compaction and preflight decodes block the loop
+            if not await asyncio.to_thread(
+                self._begin_step, contents, system_instruction, iteration
+            ):
+                return False
+
+            # Get model response with retry logic
+            print("🤔 Analyzing screen and planning next action...")
+            response = await self._call_model_with_retry_async(
+                contents, model_config, iteration
+            )
+
+            candidate = await asyncio.to_thread(
+                self._handle_response, response, contents, iteration
+            )
+            if candidate is None:
+                return self.outcome == "success"
+
+            if self._cancel_requested.is_set():
+                # Don't start actions the caller no longer wants
+                if self.dispatcher is not None:
+                    await self._run_desktop(self.dispatcher.collect)
+                self._stop_cancelled(iteration)
+                return False
+
+            # Execute function calls
+            print("⚙️  Executing actions...")
+            if self.dispatcher is not None:
+                # Dispatched while the response was streaming
+                results, should_terminate = await self._run_desktop(
+                    self.dispatcher.collect
+                )
+            else:
+                results, should_terminate = await self._run_desktop(
+                    self.executor.execute_function_calls,
+                    candidate,
+                    lambda sd: get_safety_confirmation(sd, self.config.yolo_mode),
+                )
+
+            if should_terminate:
+                print("❌ Agent terminated due to safety decision")
+                self.outcome = "terminated"
+                return True
+
+            print("📸 Capturing new state...")
+            observation = await self._run_desktop(self._observe, results, iteration)
+            if observation is not None:
+                contents.append(observation)
+            if await asyncio.to_thread(
+                self._detect_loop, candidate, observation, iteration
+            ):
+                return False
+
+            # The executor already waited for the screen to settle
+            if not self.config.adaptive_settle:
+                with self.tracer.span("sleep", seconds=0.5, reason="loop"):
+                    await asyncio.sleep(0.5)
+
+        return None
+
+    async def _run_desktop(self, fn, *args) -> Any:
+        """Run blocking desktop work in a thread that a step timeout can't orphan.
+
+        The thread is shielded from cancellation and remembered, so a timed-out
+        step can wait for it in _drain_desktop_work().
+
+        Args:
+            fn: Blocking function (actions, capture)
+            *args: Its arguments
+
+        Returns:
+            The function's result
+        """
+        self._desktop_work = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        return await asyncio.shield(self._desktop_work)
+
+    async def _drain_desktop_work(self) -> None:
+        """Stop pending actions and wait for running ones after a step timeout."""
+        if self.dispatcher is not None:
+            # Streamed calls that have not started are skipped
+            self.dispatcher.halt()
+            await asyncio.to_thread(self.dispatcher.collect)
+        if self._desktop_work is not None and not self._desktop_work.done():
+            print("⏳ Waiting for the running action to finish...")
+            await asyncio.wait([self._desktop_work])
+
+    async def _call_model_with_retry_async(
+        self, contents, config, iteration: int
+    ) -> Optional[types.GenerateContentResponse]:
+        """Call model with retry logic, awaiting the network.
+
+        Args:
+            contents: Conversation contents
+            config: Model configuration
+            iteration: Current iteration number
+
+        Returns:
+            Model response or None if failed
+        """
+        retry_helper = self._create_retry_helper()
+
+        for retry in range(retry_helper.max_retries):
+            try:
+                request = self._log_request(contents, config, iteration)
+
+                # Call API
+                with self.tracer.span(
+                    "model.call", step=iteration + 1, attempt=retry + 1
+                ) as span:
+                    response = await self._generate(contents, config, span)
+
+                self._record_response(response, request, iteration)
+                return response
+
+            except Exception as e:
+                self.llm_logger.log_error(iteration + 1, str(e))
+                # Never resend a request whose actions already ran on screen
+                dispatched = self.dispatcher is not None and self.dispatcher.dispatched
+                # should_retry sleeps through rate limits, so keep it off the loop
+                if (
+                    not dispatched
+                    and retry < retry_helper.max_retries - 1
+                    and await asyncio.to_thread(retry_helper.should_retry, e)
+                ):
+                    retry_helper.retry_count = retry
+                    await retry_helper.wait_and_retry_async()
+                    continue
+                else:
+                    # Final failure
+                    print(f"❌ API Error: {e}")
+                    if dispatched:
+                        await asyncio.to_thread(self.dispatcher.collect)
+                    self._save_progress(iteration)
+                    return None
+
+        return None
+
+    async def _generate(self, contents, config, span) -> types.GenerateContentResponse:
+        """Request a model response without blocking the event loop.
+
+        Args:
+            contents: Conversation contents
+            config: Model configuration
+            span: model.call span (streaming records time_to_first_action)
+
+        Returns:
+            Model response
+        """
+        if self.dispatcher is not None:
+            # The streaming path dispatches actions from its own iteration
+            return await asyncio.to_thread(
+                self._stream_model_response, contents, config, span
+            )
+        aio = getattr(self.client, "aio", None)
+        if aio is not None:
+            return await aio.models.generate_content(
+                model=self.config.model_name,
+                contents=contents,
+                config=config,
+            )
+        # Recording, replay and scripted clients only have the blocking API
+        return await asyncio.to_thread(
+            self.client.models.generate_content,
+            model=self.config.model_name,
+            contents=contents,
+            config=config,
+        )
+
+    def _stop_cancelled(self, iteration: int) -> None:
+        """Record a cancelled run.
+
+        Args:
+            iteration: Iteration the run stopped at
+        """
+        print("🛑 Agent run cancelled")
+        self.llm_logger.log_error(iteration + 1, "Run cancelled")
+        self._save_progress(iteration)
+        self.outcome = "cancelled"
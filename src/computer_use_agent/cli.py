@@ -3,6 +3,7 @@
 import sys
 import os
 import argparse
+import json
 import termcolor
 import logging
 from pathlib import Path
@@ -11,12 +12,54 @@ from dotenv import load_dotenv
 from .agent import ComputerUseAgent
 from .config import AgentConfig
 from .utils import rewrite_goal
+from .utils.log_stats import (
+    compute_stats,
+    iter_entries,
+    iter_log_files,
+    iter_steps,
+    print_stats,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def stats_main(argv: list[str]) -> None:
+    """Entry point for ``computer-agent stats``.
+
+    Args:
+        argv: Arguments after the ``stats`` subcommand
+    """
+    parser = argparse.ArgumentParser(
+        prog="computer-agent stats",
+        description="Latency, retry, action and error statistics from LLM logs",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path("logs")],
+        help="Log files or directories (default: logs/)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON instead")
+    parser.add_argument(
+        "--top", type=int, default=15, help="Actions shown in the histogram"
+    )
+    args = parser.parse_args(argv)
+
+    steps = iter_steps(iter_entries(iter_log_files(args.paths)))
+    stats = compute_stats(steps, top_actions=args.top)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_stats(stats)
+
+
 def main():
     """Main entry point for CLI."""
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        stats_main(sys.argv[2:])
+        return
+
     # Load environment variables from .env file
     load_dotenv()
 
@@ -52,6 +95,119 @@ Examples:
         default=60,
         help="Maximum number of steps (default: 60)",
     )
+    parser.add_argument(
+        "--max-screenshots",
+        type=int,
+        default=3,
+        help="Recent screenshots kept at full size in history (default: 3)",
+    )
+    parser.add_argument(
+        "--screenshot-format",
+        choices=["png", "jpeg", "webp"],
+        default="png",
+        help="Screenshot encoding sent to the model (default: png)",
+    )
+    parser.add_argument(
+        "--fixed-sleeps",
+        action="store_true",
+        help="Use fixed post-action sleeps instead of waiting for the screen to settle",
+    )
+    parser.add_argument(
+        "--no-paste",
+        action="store_true",
+        help="Always type text keystroke by keystroke instead of pasting long text",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pyautogui", "xvfb", "fake"],
+        default="pyautogui",
+        help="Input/screen backend (xvfb and fake run headless; default: pyautogui)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Record model calls next to the LLM log for offline replay",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="FILE",
+        help="Replay model responses from a recording instead of calling the API",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        metavar="SECONDS",
+        help="Fixed simulated latency per replayed call (default: as recorded)",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        metavar="N",
+        help="Stop cleanly once the run has used N prompt + output tokens",
+    )
+    parser.add_argument(
+        "--log-retention-days",
+        type=float,
+        metavar="DAYS",
+        help="Delete the agent's run logs older than DAYS (default: keep all)",
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=int,
+        metavar="MB",
+        help="Delete the oldest run logs once they add up to more than MB",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write per-step timing spans (JSONL + Chrome trace) next to the LLM log",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Send every screenshot, even when the screen did not change",
+    )
+    parser.add_argument(
+        "--pixel-scroll",
+        action="store_true",
+        help="Scroll with smooth pixel-delta gestures instead of 5-click chunks",
+    )
+    parser.add_argument(
+        "--scroll-until-end",
+        action="store_true",
+        help="Offer a scroll_until_end action that reads long content in one step",
+    )
+    parser.add_argument(
+        "--no-loop-detection",
+        action="store_true",
+        help="Don't hint or stop when the agent repeats actions without effect",
+    )
+    parser.add_argument(
+        "--spool",
+        action="store_true",
+        help="Keep conversation screenshots on disk between model calls",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Send only the changed region of the screen when the change is small",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Encode the settled screen in the background after each action",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream model responses and start actions before the response ends",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Don't archive request screenshots under logs/screenshots",
+    )
     parser.add_argument("--quiet", action="store_true", help="Reduce output verbosity")
     parser.add_argument(
         "--thinking",
@@ -74,7 +230,7 @@ Examples:
     # Check API key
     import os
 
-    if not os.environ.get("GEMINI_API_KEY"):
+    if not args.replay and not os.environ.get("GEMINI_API_KEY"):
         termcolor.cprint("❌ Error: GEMINI_API_KEY not set", "red")
         print("Please set your Gemini API key:")
         print("  export GEMINI_API_KEY='your-api-key-here'")
@@ -86,7 +242,7 @@ Examples:
     # Rewrite goal by default (unless --no-rewrite is specified)
     final_goal = args.goal
     original_goal = ""
-    if not args.no_rewrite:
+    if not args.no_rewrite and not args.replay:
         print("\n🔄 Rewriting goal with Gemini 2.5 Pro...")
         print(f"📝 Original: {args.goal}")
         rewritten = rewrite_goal(args.goal)
@@ -106,11 +262,34 @@ Examples:
         original_goal=original_goal,
         app_instructions=app_instructions,
         max_iterations=args.max_iterations,
+        max_inline_screenshots=args.max_screenshots,
+        screenshot_format=args.screenshot_format,
+        adaptive_settle=not args.fixed_sleeps,
+        input_pause=0.5 if args.fixed_sleeps else 0.1,
+        allow_paste=not args.no_paste,
+        backend=args.backend,
+        record_model_calls=args.record,
+        replay_file=args.replay,
+        replay_latency=args.replay_latency,
+        trace=args.trace,
+        stream_responses=args.stream,
+        pipeline_capture=args.pipeline,
+        dedupe_screenshots=not args.no_dedupe,
+        delta_screenshots=args.delta,
+        spool_screenshots=args.spool,
+        loop_detection=not args.no_loop_detection,
+        scroll_until_end=args.scroll_until_end,
+        pixel_scroll=args.pixel_scroll,
+        token_budget=args.token_budget,
+        log_retention_days=args.log_retention_days,
+        log_max_total_mb=args.log_max_mb,
+        archive_screenshots=not args.no_archive,
         verbose=not args.quiet,
         enable_thinking=args.thinking,
         yolo_mode=args.yolo_mode,
     )
 
+    agent = None
     try:
         # Initialize and run agent
         agent = ComputerUseAgent(config)
@@ -124,6 +303,9 @@ Examples:
         termcolor.cprint(f"❌ Fatal error: {e}", "red")
         logger.exception("Fatal error")
         sys.exit(1)
+    finally:
+        if agent:
+            agent.close()
 
 
 if __name__ == "__main__":
@@ -3,11 +3,13 @@
 from .settings import AgentConfig
 from .prompts import (
     SCROLLING_INSTRUCTIONS,
+    SCROLL_UNTIL_END_INSTRUCTIONS,
     GENERIC_MACOS_INSTRUCTIONS,
 )
 
 __all__ = [
     "AgentConfig",
     "SCROLLING_INSTRUCTIONS",
+    "SCROLL_UNTIL_END_INSTRUCTIONS",
     "GENERIC_MACOS_INSTRUCTIONS",
 ]
@@ -20,6 +20,16 @@ Never reduce magnitude mid-scroll
 **Default Rule:** When in doubt, scroll MORE rather than less. Better to scroll too much than miss content.
 """
 
+# Added when the scroll_until_end function is offered
+SCROLL_UNTIL_END_INSTRUCTIONS = """
+SCROLL UNTIL END (scroll_until_end):
+- To read long content (a whole Slack channel, a long page or thread), call scroll_until_end instead of repeating scroll_document
+- It scrolls locally until the content stops moving and returns every frame it saw as 2x2 contact sheets in reading order (top first), followed by the current screen
+- Slack history: scroll_until_end with direction "up" returns the history above the current view in reading order; there is no need to scroll back down to read it
+- If reached_end is false the cap was hit; call it again to continue
+- Keep using scroll_document / scroll_at for short, targeted scrolls (e.g. bringing one item into view)
+"""
+
 # Generic macOS instructions
 GENERIC_MACOS_INSTRUCTIONS = """
 GENERAL macOS DESKTOP CONTROL:
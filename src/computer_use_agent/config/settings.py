@@ -24,6 +24,84 @@ class AgentConfig:
         screen_width: Screen width in pixels (recommended: 1440)
         screen_height: Screen height in pixels (recommended: 900)
         progress_file: Path to progress tracking file
+        countdown_seconds: Countdown before the first step (0 = start immediately)
+        max_inline_screenshots: Most recent screenshots kept at full size in history
+        max_inline_screenshot_bytes: Byte budget for inline screenshots (None = no cap)
+        screenshot_placeholder: Replacement for older screenshots ("text"/"thumbnail")
+        spool_screenshots: Keep conversation screenshots in a temporary spool
+            file between model calls instead of in memory
+        spool_dir: Directory for the spool file (None = system temp dir)
+        screenshot_format: Screenshot encoding ("png", "jpeg" or "webp")
+        screenshot_max_width: Downscale screenshots to this width (None = native)
+        screenshot_max_height: Downscale screenshots to this height (None = native)
+        png_compress_level: PNG zlib level (0 = fastest, 9 = smallest)
+        screenshot_quality: JPEG/WebP quality (1-100)
+        screenshot_grayscale: Send grayscale screenshots
+        dedupe_screenshots: Replace a screenshot identical to the previous one
+            with a "screen unchanged" note
+        delta_screenshots: Send only the changed region when a small part of the
+            screen changed (needs dedupe_screenshots; a full frame still goes
+            out every max_inline_screenshots screenshots)
+        delta_max_fraction: Largest changed area, as a fraction of the screen,
+            sent as a region
+        scroll_until_end: Offer the scroll_until_end function, which scrolls
+            locally until the content stops moving and returns the frames seen
+            as contact sheets
+        scroll_until_end_clicks: Wheel clicks per scroll_until_end step (keep
+            it under a screen so frames overlap)
+        scroll_until_end_max: Cap on scroll_until_end steps per call
+        pixel_scroll: Scroll with one smooth pixel-delta gesture where the
+            backend supports it (macOS Quartz) instead of 5-click chunks with
+            0.5s pauses. Off by default until scroll_pixels_per_click has
+            been measured on real displays, since it changes how far every
+            scroll moves
+        scroll_pixels_per_click: Pixels one wheel click stands for when
+            converting scroll magnitudes for pixel scrolling (an estimate)
+        scroll_duration: Seconds a pixel scroll gesture is spread over
+        loop_detection: Hint the model, then stop the run, when steps keep
+            repeating the same actions on an unchanged screen
+        loop_repeat_limit: Identical action/screen steps in a row that count
+            as a loop
+        loop_max_nudges: Loop hints sent before the run is stopped
+        adaptive_settle: Wait for the screen to stop changing instead of fixed sleeps
+        settle_timeout: Maximum seconds to wait for the screen to settle
+        settle_interval: Seconds between settle-detection frames
+        settle_stable_frames: Matching consecutive frames that count as settled
+        settle_threshold: Fraction of sampled pixels allowed to differ when settled
+        settle_min_wait: Seconds to keep watching after an action that has not
+            changed the screen yet, for apps slow to start reacting
+        pipeline_capture: Encode the settled frame in the background after each
+            action so the next observation is ready (needs adaptive_settle)
+        encode_workers: Background encoder workers for pipeline_capture
+        encode_in_process: Run background encodes in a process pool
+        input_pause: Delay the backend inserts after every input call
+        wait_quiet_window: Seconds without screen change that end a wait action
+        wait_max_seconds: Maximum wait action length while the screen keeps changing
+        allow_paste: Allow entering text through the clipboard
+        paste_threshold: Text length from which type_text_at pastes instead of typing
+        paste_chunk_size: Maximum characters per clipboard paste
+        backend: Desktop backend ("pyautogui", "xvfb" or "fake")
+        record_model_calls: Record model requests/responses next to the LLM log
+        replay_file: Serve model responses from a recording instead of the API
+        replay_latency: Fixed simulated latency per replayed call (None = recorded)
+        trace: Record per-step timing spans and export them next to the LLM log
+        stream_responses: Stream model responses and start each action as soon
+            as its function call arrives
+        step_timeout: Deadline per step in seconds for AsyncComputerUseAgent
+            (None = no deadline)
+        archive_screenshots: Store request screenshots by content hash for the log
+        screenshot_archive_dir: Directory of the content-addressed archive
+        screenshot_archive_max_mb: Archive size budget in MB (None = unbounded)
+        screenshot_archive_compression: "auto", "zstd", "lz4", "zlib" or "none"
+        log_retention_days: Delete run logs older than this (None = keep
+            forever; deletion is opt-in)
+        log_max_total_mb: Delete the oldest run logs above this size (None = no
+            cap; deletion is opt-in)
+        compress_logs: Gzip logs of finished runs
+        index_runs: Record each run in the logs/runs.sqlite index
+        token_budget: Stop once prompt + output tokens reach this (None = no cap)
+        context_token_limit: Estimated request size that triggers compaction or a
+            clean stop before sending (None = no pre-flight check)
     """
 
     goal: str
@@ -43,6 +121,64 @@ class AgentConfig:
     screen_width: Optional[int] = None
     screen_height: Optional[int] = None
     progress_file: Path = field(default_factory=lambda: Path(".agent_progress.txt"))
+    countdown_seconds: int = 3
+    max_inline_screenshots: int = 3
+    max_inline_screenshot_bytes: Optional[int] = None
+    screenshot_placeholder: str = "text"  # "text" or "thumbnail"
+    spool_screenshots: bool = False
+    spool_dir: Optional[Path] = None
+    screenshot_format: str = "png"
+    screenshot_max_width: Optional[int] = 1440
+    screenshot_max_height: Optional[int] = 900
+    png_compress_level: int = 6
+    screenshot_quality: int = 85
+    screenshot_grayscale: bool = False
+    dedupe_screenshots: bool = True
+    delta_screenshots: bool = False
+    delta_max_fraction: float = 0.25
+    scroll_until_end: bool = False
+    scroll_until_end_clicks: int = 5
+    scroll_until_end_max: int = 30
+    pixel_scroll: bool = False
+    scroll_pixels_per_click: int = 100
+    scroll_duration: float = 0.15
+    loop_detection: bool = True
+    loop_repeat_limit: int = 3
+    loop_max_nudges: int = 2
+    adaptive_settle: bool = True
+    settle_timeout: float = 2.0
+    settle_interval: float = 0.1
+    settle_stable_frames: int = 2
+    settle_threshold: float = 0.002
+    settle_min_wait: float = 0.3
+    pipeline_capture: bool = False
+    encode_workers: int = 1
+    encode_in_process: bool = False
+    input_pause: float = 0.1
+    wait_quiet_window: float = 2.0
+    wait_max_seconds: float = 30.0
+    allow_paste: bool = True
+    paste_threshold: int = 40
+    paste_chunk_size: int = 2000
+    backend: str = "pyautogui"
+    record_model_calls: bool = False
+    replay_file: Optional[Path] = None
+    replay_latency: Optional[float] = None
+    trace: bool = False
+    stream_responses: bool = False
+    step_timeout: Optional[float] = None
+    archive_screenshots: bool = True
+    screenshot_archive_dir: Path = field(
+        default_factory=lambda: Path("logs/screenshots")
+    )
+    screenshot_archive_max_mb: Optional[int] = 1024
+    screenshot_archive_compression: str = "auto"
+    log_retention_days: Optional[float] = None
+    log_max_total_mb: Optional[int] = None
+    compress_logs: bool = True
+    index_runs: bool = True
+    token_budget: Optional[int] = None
+    context_token_limit: Optional[int] = 128_000
 
     def __post_init__(self):
         """Post-initialization processing."""
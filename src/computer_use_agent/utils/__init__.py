@@ -3,6 +3,16 @@
 from .response_handler import ResponseHandler
 from .retry import retry_with_exponential_backoff, RetryableAPICall
 from .goal_rewriter import GoalRewriter, rewrite_goal
+from .history import ScreenshotHistory, HistoryStats
+from .replay import RecordingClient, ReplayClient, ReplayError
+from .tracing import Tracer, Span
+from .screenshot_store import ScreenshotStore
+from .blob_spool import BlobSpool, SpoolStats
+from .loop_detector import LoopDetector, LoopStats, LoopVerdict
+from .log_rotation import LogRotator, RotationStats
+from .run_index import RunIndex
+from .usage import UsageTracker, StepUsage
+from .streaming import merge_chunks, split_response
 
 __all__ = [
     "ResponseHandler",
@@ -10,4 +20,24 @@ __all__ = [
     "RetryableAPICall",
     "GoalRewriter",
     "rewrite_goal",
+    "ScreenshotHistory",
+    "HistoryStats",
+    "RecordingClient",
+    "ReplayClient",
+    "ReplayError",
+    "Tracer",
+    "Span",
+    "ScreenshotStore",
+    "BlobSpool",
+    "SpoolStats",
+    "LoopDetector",
+    "LoopStats",
+    "LoopVerdict",
+    "LogRotator",
+    "RotationStats",
+    "RunIndex",
+    "UsageTracker",
+    "StepUsage",
+    "merge_chunks",
+    "split_response",
 ]
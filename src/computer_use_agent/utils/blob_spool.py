@@ -0,0 +1,148 @@
+"""Disk spool that keeps conversation screenshots out of memory between requests."""
+
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.genai import types
+
+
+@dataclass
+class SpoolStats:
+    """Spool counters for a run.
+
+    Attributes:
+        spilled: Images written to the spool file
+        loaded: Images read back to build a request
+        spool_bytes: Bytes written to the spool file
+        resident_bytes: Image bytes currently held in the conversation
+        peak_resident_bytes: Most image bytes held in memory at once
+    """
+
+    spilled: int = 0
+    loaded: int = 0
+    spool_bytes: int = 0
+    resident_bytes: int = 0
+    peak_resident_bytes: int = 0
+
+
+def _image_blobs(contents: List[types.Content]) -> Iterator[Any]:
+    """Yield every image blob in the conversation, including function responses.
+
+    Args:
+        contents: Conversation contents
+
+    Yields:
+        Blob or FunctionResponseBlob objects with an image MIME type
+    """
+    for content in contents:
+        for part in content.parts or []:
+            blobs = [part.inline_data]
+            if part.function_response:
+                blobs += [p.inline_data for p in part.function_response.parts or []]
+            for blob in blobs:
+                if blob and blob.mime_type and blob.mime_type.startswith("image/"):
+                    yield blob
+
+
+class BlobSpool:
+    """Moves screenshot bytes to a temporary file while the model isn't reading them.
+
+    spill() writes the bytes of every image in the conversation to an
+    append-only spool file and empties the blobs; materialize() reads them
+    back in place right before the next request is built. The blob objects
+    themselves stay in the conversation, so history compaction, token
+    estimates and logging work on them unchanged once materialized.
+
+    The spool file is unlinked on creation and released by close(); space of
+    screenshots dropped from the conversation is not reclaimed before then.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize blob spool.
+
+        Args:
+            directory: Directory for the spool file (None = system temp dir)
+        """
+        self._file = tempfile.TemporaryFile(dir=directory, prefix="spool-")
+        self._lock = threading.Lock()
+        # id(blob) -> (blob, offset, length); holding the blob keeps ids unique
+        self._entries: Dict[int, Tuple[Any, int, int]] = {}
+        self.stats = SpoolStats()
+
+    def spill(self, contents: List[types.Content]) -> int:
+        """Write the conversation's screenshots to the spool and drop their bytes.
+
+        Args:
+            contents: Conversation contents (blobs emptied in place)
+
+        Returns:
+            Number of bytes released from memory
+        """
+        released = 0
+        entries: Dict[int, Tuple[Any, int, int]] = {}
+        with self._lock:
+            for blob in _image_blobs(contents):
+                entry = self._entries.get(id(blob))
+                if blob.data:
+                    if entry is None:
+                        entry = (blob, self._append(blob.data), len(blob.data))
+                        self.stats.spilled += 1
+                    released += len(blob.data)
+                    blob.data = None
+                if entry is not None:
+                    entries[id(blob)] = entry
+            # Screenshots no longer in the conversation are forgotten
+            self._entries = entries
+            self.stats.resident_bytes = 0
+        return released
+
+    def materialize(self, contents: List[types.Content]) -> int:
+        """Read spilled screenshots back into the conversation.
+
+        Args:
+            contents: Conversation contents (blobs filled in place)
+
+        Returns:
+            Number of bytes loaded from the spool
+        """
+        loaded = 0
+        resident = 0
+        with self._lock:
+            for blob in _image_blobs(contents):
+                entry = self._entries.get(id(blob))
+                if not blob.data and entry is not None:
+                    _, offset, length = entry
+                    self._file.seek(offset)
+                    blob.data = self._file.read(length)
+                    loaded += length
+                    self.stats.loaded += 1
+                resident += len(blob.data or b"")
+            self.stats.resident_bytes = resident
+            self.stats.peak_resident_bytes = max(
+                self.stats.peak_resident_bytes, resident
+            )
+        return loaded
+
+    def close(self) -> None:
+        """Release the spool file."""
+        with self._lock:
+            self._entries = {}
+            self._file.close()
+
+    def _append(self, data: bytes) -> int:
+        """Append bytes to the spool file; the caller holds the lock.
+
+        Args:
+            data: Bytes to store
+
+        Returns:
+            Offset the bytes were written at
+        """
+        offset = self._file.seek(0, 2)
+        self._file.write(data)
+        self._file.flush()
+        self.stats.spool_bytes += len(data)
+        return offset
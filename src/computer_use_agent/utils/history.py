@@ -0,0 +1,199 @@
+"""Bounded screenshot history for the agent conversation."""
+
+import io
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from google.genai import types
+from PIL import Image
+
+SCREENSHOT_PLACEHOLDER = "[Older screenshot omitted to save context]"
+PLACEHOLDER_MODES = ("text", "thumbnail")
+
+
+@dataclass
+class HistoryStats:
+    """Inline screenshot statistics after a compaction pass.
+
+    Attributes:
+        inline_images: Full screenshots still inline in the conversation
+        inline_bytes: Total bytes of those screenshots
+        compacted: Screenshots replaced during this pass
+    """
+
+    inline_images: int = 0
+    inline_bytes: int = 0
+    compacted: int = 0
+
+
+class ScreenshotHistory:
+    """Keeps only the most recent screenshots inline in the conversation."""
+
+    def __init__(
+        self,
+        max_inline: int = 3,
+        max_inline_bytes: Optional[int] = None,
+        placeholder: str = "text",
+        thumbnail_size: Tuple[int, int] = (256, 160),
+    ):
+        """Initialize screenshot history.
+
+        Args:
+            max_inline: Number of most recent screenshots to keep at full size
+            max_inline_bytes: Byte budget for inline screenshots (None = unlimited)
+            placeholder: Replacement for older screenshots ("text" or "thumbnail")
+            thumbnail_size: Maximum thumbnail dimensions in thumbnail mode
+
+        Raises:
+            ValueError: If placeholder mode is unknown
+        """
+        if placeholder not in PLACEHOLDER_MODES:
+            raise ValueError(
+                f"Unknown screenshot placeholder '{placeholder}', "
+                f"expected one of {PLACEHOLDER_MODES}"
+            )
+        self.max_inline = max(1, max_inline)
+        self.max_inline_bytes = max_inline_bytes
+        self.placeholder = placeholder
+        self.thumbnail_size = thumbnail_size
+        # Blobs we produced ourselves (thumbnails) must not be compacted again
+        self._thumbnail_ids: Set[int] = set()
+
+    def compact(
+        self, contents: List[types.Content], max_inline: Optional[int] = None
+    ) -> HistoryStats:
+        """Replace screenshots beyond the count/byte budget, newest kept first.
+
+        Args:
+            contents: Conversation contents (modified in place)
+            max_inline: Override of the screenshot count for this pass, e.g.
+                to shrink a request that would not fit the context window
+
+        Returns:
+            HistoryStats describing the inline screenshots after compaction
+        """
+        stats = HistoryStats()
+        limit = self.max_inline if max_inline is None else max(1, max_inline)
+
+        for content in reversed(contents):
+            for part in reversed(content.parts or []):
+                if part.inline_data and self._is_full_image(part.inline_data):
+                    if self._keep(stats, len(part.inline_data.data or b""), 1, limit):
+                        continue
+                    self._compact_part(part)
+                    stats.compacted += 1
+
+                response = part.function_response
+                if not response or not response.parts:
+                    continue
+                # A response's images (e.g. scroll contact sheets) stay or go
+                # together, but each of them counts against the limit
+                blobs = [
+                    fr_part.inline_data
+                    for fr_part in response.parts
+                    if fr_part.inline_data and self._is_full_image(fr_part.inline_data)
+                ]
+                if not blobs:
+                    continue
+                size = sum(len(blob.data or b"") for blob in blobs)
+                if self._keep(stats, size, len(blobs), limit):
+                    continue
+                self._compact_function_response(response)
+                stats.compacted += 1
+
+        return stats
+
+    def _keep(self, stats: HistoryStats, size: int, count: int, limit: int) -> bool:
+        """Decide whether screenshots fit the remaining budget and record them.
+
+        Args:
+            stats: Running statistics for the current pass
+            size: Total size of the screenshots in bytes
+            count: Number of screenshots kept or dropped together
+            limit: Maximum screenshots kept inline
+
+        Returns:
+            True if the screenshots should stay inline
+        """
+        # The newest screenshots are always kept so the model can see the screen
+        if stats.inline_images > 0:
+            if stats.inline_images + count > limit:
+                return False
+            if (
+                self.max_inline_bytes is not None
+                and stats.inline_bytes + size > self.max_inline_bytes
+            ):
+                return False
+        stats.inline_images += count
+        stats.inline_bytes += size
+        return True
+
+    def _is_full_image(self, blob) -> bool:
+        """Check whether a blob is a full-size screenshot.
+
+        Args:
+            blob: Blob or FunctionResponseBlob
+
+        Returns:
+            True if the blob is an image that has not been compacted
+        """
+        return bool(
+            blob.mime_type
+            and blob.mime_type.startswith("image/")
+            and id(blob) not in self._thumbnail_ids
+        )
+
+    def _compact_part(self, part: types.Part) -> None:
+        """Replace an inline image part with a placeholder.
+
+        Args:
+            part: Content part holding a screenshot (modified in place)
+        """
+        thumbnail = self._make_thumbnail(part.inline_data)
+        if thumbnail:
+            part.inline_data = types.Blob(mime_type="image/jpeg", data=thumbnail)
+            self._thumbnail_ids.add(id(part.inline_data))
+        else:
+            part.inline_data = None
+            part.text = SCREENSHOT_PLACEHOLDER
+
+    def _compact_function_response(self, response: types.FunctionResponse) -> None:
+        """Replace screenshots attached to a function response.
+
+        Args:
+            response: Function response holding screenshots (modified in place)
+        """
+        thumbnail = None
+        for fr_part in response.parts or []:
+            if fr_part.inline_data:
+                thumbnail = self._make_thumbnail(fr_part.inline_data)
+                break
+
+        if thumbnail:
+            blob = types.FunctionResponseBlob(mime_type="image/jpeg", data=thumbnail)
+            self._thumbnail_ids.add(id(blob))
+            response.parts = [types.FunctionResponsePart(inline_data=blob)]
+        else:
+            response.parts = None
+            response.response = dict(response.response or {})
+            response.response["screenshot"] = SCREENSHOT_PLACEHOLDER
+
+    def _make_thumbnail(self, blob) -> Optional[bytes]:
+        """Encode a small JPEG thumbnail of a screenshot blob.
+
+        Args:
+            blob: Blob holding the screenshot
+
+        Returns:
+            Thumbnail JPEG bytes, or None in text mode or if decoding fails
+        """
+        if self.placeholder != "thumbnail" or not blob.data:
+            return None
+        try:
+            image = Image.open(io.BytesIO(blob.data))
+            image.thumbnail(self.thumbnail_size)
+            output = io.BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=50)
+            return output.getvalue()
+        except Exception:
+            return None
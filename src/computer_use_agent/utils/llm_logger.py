@@ -1,44 +1,109 @@
 """LLM request/response logging for debugging and observability."""
 
+import atexit
 import json
+import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from .screenshot_store import ScreenshotStore
+
+logger = logging.getLogger(__name__)
+
+# Queue marker that stops the writer thread; flush() queues a threading.Event
+# that the writer sets once everything before it is written
+_STOP = object()
 
 
 class LLMLogger:
-    """Logs all LLM interactions to file for debugging."""
+    """Logs all LLM interactions to file for debugging.
 
-    def __init__(self, log_dir: str = "logs"):
+    By default entries are handed to a background writer thread through a
+    bounded queue, so logging never waits on the filesystem. The writer keeps
+    the file open and writes in batches; close() (also run at exit) drains the
+    queue and fsyncs the file.
+    """
+
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        buffered: bool = True,
+        queue_size: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+        screenshot_store: Optional[ScreenshotStore] = None,
+    ):
         """Initialize LLM logger.
 
         Args:
             log_dir: Directory to store log files
+            buffered: Write from a background thread (False = write synchronously)
+            queue_size: Maximum queued entries before new ones are dropped
+            batch_size: Queued entries that trigger a write
+            flush_interval: Maximum seconds an entry waits before being written
+            screenshot_store: Archive for request screenshots (None = only note
+                that a request had an image)
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
 
-        # Create timestamped log file
+        # Create timestamped log file, claimed exclusively so that runs started
+        # in the same second (e.g. concurrent async agents) get their own file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = self.log_dir / f"llm_log_{timestamp}.jsonl"
+        suffix = 1
+        while True:
+            try:
+                open(self.log_file, "x").close()
+                break
+            except FileExistsError:
+                suffix += 1
+                self.log_file = self.log_dir / f"llm_log_{timestamp}_{suffix}.jsonl"
         self.step_counter = 0
 
+        self.buffered = buffered
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.screenshot_store = screenshot_store
+        self.dropped = 0
+        # Entries replaced by an error record because they could not be written
+        self.failed = 0
+        self._closed = False
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        if buffered:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="llm-logger", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
     def log_request(self, step: int, prompt: str, image_data: Any = None) -> None:
         """Log LLM request.
 
         Args:
             step: Current step number
             prompt: Text prompt sent to LLM
-            image_data: Screenshot data (not logged, just noted)
+            image_data: Screenshots sent with the request as a list of
+                (bytes, MIME type) tuples, or any truthy value to just note
+                that there were images. Listed screenshots are archived in the
+                screenshot store and logged as content hashes.
         """
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "type": "request",
             "step": step,
             "prompt": prompt,
-            "has_image": image_data is not None,
+            "has_image": bool(image_data),
         }
+        if self.screenshot_store is not None and isinstance(image_data, list):
+            # Hashed and written by the writer thread, off the agent loop
+            log_entry["_images"] = image_data
         self._write_log(log_entry)
 
     def log_response(
@@ -47,6 +112,7 @@ class LLMLogger:
         response_text: str,
         function_calls: list | None = None,
         thinking: str | None = None,
+        usage: Dict[str, Any] | None = None,
     ) -> None:
         """Log LLM response.
 
@@ -55,6 +121,7 @@ class LLMLogger:
             response_text: Text response from LLM
             function_calls: List of function calls made
             thinking: Model's thinking process if available
+            usage: Token and payload accounting for the call
         """
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -64,6 +131,8 @@ class LLMLogger:
             "function_calls": function_calls or [],
             "thinking": thinking,
         }
+        if usage is not None:
+            log_entry["usage"] = usage
         self._write_log(log_entry)
 
     def log_error(self, step: int, error: str) -> None:
@@ -97,13 +166,162 @@ class LLMLogger:
         self._write_log(log_entry)
 
     def _write_log(self, entry: Dict[str, Any]) -> None:
-        """Write log entry to file.
+        """Queue a log entry for the writer thread (or write it directly).
+
+        Entries are dropped and counted when the queue is full or the logger
+        is closed, rather than blocking the agent loop.
 
         Args:
             entry: Log entry dictionary
         """
+        if not self.buffered:
+            with open(self.log_file, "a") as f:
+                f.write(self._serialize(entry))
+            return
+
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _writer_loop(self) -> None:
+        """Drain the queue into the log file in batches until stopped."""
         with open(self.log_file, "a") as f:
-            f.write(json.dumps(entry, indent=None) + "\n")
+            batch: List[Dict[str, Any]] = []
+            markers = 0
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    item = None
+
+                flush = isinstance(item, threading.Event)
+                if flush or item is _STOP:
+                    markers += 1
+                elif item is not None:
+                    batch.append(item)
+
+                if (
+                    item is None
+                    or flush
+                    or item is _STOP
+                    or len(batch) >= self.batch_size
+                ):
+                    try:
+                        if batch:
+                            f.write("".join(self._serialize(e) for e in batch))
+                            f.flush()
+                        if item is _STOP:
+                            os.fsync(f.fileno())
+                    except OSError as e:
+                        # Keep the writer alive; later entries may still fit
+                        self.failed += len(batch)
+                        logger.error(f"Could not write {len(batch)} log entries: {e}")
+                    if flush:
+                        item.set()
+                    for _ in range(len(batch) + markers):
+                        self._queue.task_done()
+                    batch, markers = [], 0
+                    deadline = time.monotonic() + self.flush_interval
+                    if item is _STOP:
+                        return
+
+    def _serialize(self, entry: Dict[str, Any]) -> str:
+        """Turn an entry into a JSON line, or an error record if it can't be.
+
+        Args:
+            entry: Log entry dictionary
+
+        Returns:
+            JSON line including the trailing newline
+        """
+        try:
+            return json.dumps(self._archive_images(entry), indent=None) + "\n"
+        except Exception as e:  # Bad entry; keep the writer running
+            self.failed += 1
+            logger.error(f"Could not serialize {entry.get('type')} log entry: {e}")
+            record = {
+                "timestamp": datetime.now().isoformat(),
+                "type": "log_error",
+                "entry_type": str(entry.get("type")),
+                "step": entry.get("step"),
+                "error": str(e),
+            }
+            return json.dumps(record, default=str, indent=None) + "\n"
+
+    def _archive_images(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace queued screenshot bytes with their archive hashes.
+
+        Args:
+            entry: Log entry, possibly holding "_images"
+
+        Returns:
+            The entry, ready to serialize
+        """
+        images = entry.pop("_images", None)
+        if images is not None:
+            try:
+                entry["image_hashes"] = [
+                    self.screenshot_store.put(data, mime_type)
+                    for data, mime_type in images
+                ]
+            except OSError as e:
+                entry["image_archive_error"] = str(e)
+        return entry
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every entry queued so far has been written.
+
+        Args:
+            timeout: Seconds to wait in total, for room in a full queue and for
+                the writer (entries not yet written by then are still written
+                on the writer's schedule)
+
+        Returns:
+            True if the entries were written, False if the timeout expired
+            or the writer is no longer running
+        """
+        if self._writer is None:
+            return True
+        if not self._writer.is_alive():
+            return False
+        deadline = time.monotonic() + timeout
+        written = threading.Event()
+        try:
+            self._queue.put(written, timeout=timeout)
+        except queue.Full:
+            return False
+        return written.wait(max(0.0, deadline - time.monotonic()))
+
+    def close(self) -> None:
+        """Write remaining entries, fsync the file and stop the writer.
+
+        Safe to call more than once; also registered with atexit.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is None:
+            return
+        atexit.unregister(self.close)
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        if self.dropped:
+            # Record the loss in the log itself, after the writer has stopped
+            with open(self.log_file, "a") as f:
+                entry = {
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "dropped_entries",
+                    "count": self.dropped,
+                }
+                f.write(json.dumps(entry, indent=None) + "\n")
 
     def get_log_path(self) -> str:
         """Get the path to the current log file.
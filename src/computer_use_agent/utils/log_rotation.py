@@ -0,0 +1,191 @@
+"""Retention and compression for the logs/ directory."""
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .run_index import RunIndex
+
+logger = logging.getLogger(__name__)
+
+# Files the agent writes per run: the LLM log and its .replay/.trace siblings,
+# plain or gzipped; anything else in logs/ is never touched
+AGENT_LOG_PATTERN = re.compile(r"^llm_log_\d{8}_\d{6}(_\d+)?(\.[a-z]+)+$")
+
+
+@dataclass
+class RotationStats:
+    """Outcome of a rotation pass.
+
+    Attributes:
+        compressed: Closed logs gzip-compressed during this pass
+        deleted: Logs deleted for exceeding the age or size limit
+        freed_bytes: Disk space released by compression and deletion
+        total_bytes: Size of the log directory after the pass
+    """
+
+    compressed: int = 0
+    deleted: int = 0
+    freed_bytes: int = 0
+    total_bytes: int = 0
+
+
+class LogRotator:
+    """Compresses closed run logs and enforces age and size limits.
+
+    Only top-level files named like the agent's own logs (AGENT_LOG_PATTERN)
+    are managed; subdirectories such as the screenshot archive have their own
+    retention, and other files are never touched. Files belonging to the
+    active run (sharing its log file stem) are left alone, as are recently
+    written files, which may belong to another run still in progress. With a
+    run index, rows follow their log to the .gz file, and log_file is cleared
+    when the log is deleted.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path = Path("logs"),
+        max_age_days: Optional[float] = None,
+        max_total_bytes: Optional[int] = None,
+        compress: bool = True,
+        min_idle_seconds: float = 600,
+        run_index: Optional[RunIndex] = None,
+    ):
+        """Initialize log rotator.
+
+        Args:
+            log_dir: Directory holding the run logs
+            max_age_days: Delete logs older than this (None = keep forever)
+            max_total_bytes: Delete oldest logs above this size (None = no cap)
+            compress: Gzip closed .jsonl/.json logs
+            min_idle_seconds: Leave files modified more recently than this alone
+            run_index: Index whose log_file paths are updated (None = no index)
+        """
+        self.log_dir = Path(log_dir)
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.compress = compress
+        self.min_idle_seconds = min_idle_seconds
+        self.run_index = run_index
+
+    def rotate(self, active_stem: Optional[str] = None) -> RotationStats:
+        """Run one compression and retention pass.
+
+        Args:
+            active_stem: Log file stem of the running agent (e.g.
+                "llm_log_20250101_120000"), whose files are skipped
+
+        Returns:
+            Rotation statistics
+        """
+        stats = RotationStats()
+        if not self.log_dir.is_dir():
+            return stats
+
+        files = self._scan(active_stem)
+        moves: List[Tuple[Path, Optional[Path]]] = []
+        if self.compress:
+            compressed_files = []
+            for path, size, mtime in files:
+                if path.suffix in (".jsonl", ".json"):
+                    new_path, new_size = self._gzip(path, mtime)
+                    moves.append((path, new_path))
+                    stats.compressed += 1
+                    stats.freed_bytes += size - new_size
+                    compressed_files.append((new_path, new_size, mtime))
+                else:
+                    compressed_files.append((path, size, mtime))
+            files = compressed_files
+
+        # Oldest first, so both limits delete the oldest runs
+        files.sort(key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in files)
+        cutoff = (
+            time.time() - self.max_age_days * 86400
+            if self.max_age_days is not None
+            else None
+        )
+        for path, size, mtime in files:
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = self.max_total_bytes is not None and total > self.max_total_bytes
+            if not (too_old or too_big):
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            moves.append((path, None))
+            stats.deleted += 1
+            stats.freed_bytes += size
+            total -= size
+
+        stats.total_bytes = total
+        self._update_index(moves)
+        return stats
+
+    def _update_index(self, moves: List[Tuple[Path, Optional[Path]]]) -> None:
+        """Record compressed and deleted logs in the run index.
+
+        Args:
+            moves: (old path, new path or None if deleted) pairs
+        """
+        if self.run_index is None or not moves:
+            return
+        try:
+            # Applied in order, so a log compressed then deleted ends up NULL
+            self.run_index.move_log_files(moves)
+        except Exception as e:
+            logger.error(f"Could not update run index after rotation: {e}")
+
+    def _scan(self, active_stem: Optional[str]) -> List[Tuple[Path, int, float]]:
+        """List managed log files.
+
+        Args:
+            active_stem: Log file stem of the running agent to skip
+
+        Returns:
+            List of (path, size, mtime) tuples
+        """
+        files = []
+        idle_cutoff = time.time() - self.min_idle_seconds
+        for entry in os.scandir(self.log_dir):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            if not AGENT_LOG_PATTERN.match(entry.name):
+                continue
+            if active_stem and entry.name.startswith(active_stem):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > idle_cutoff:
+                continue
+            files.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return files
+
+    @staticmethod
+    def _gzip(path: Path, mtime: float) -> Tuple[Path, int]:
+        """Gzip a file in place, keeping its modification time.
+
+        Args:
+            path: File to compress
+            mtime: Original modification time (drives age-based retention)
+
+        Returns:
+            Tuple of (compressed path, compressed size)
+        """
+        target = path.with_name(path.name + ".gz")
+        temp = path.with_name(path.name + ".gz.tmp")
+        with open(path, "rb") as src, gzip.open(temp, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+        os.utime(temp, (mtime, mtime))
+        os.replace(temp, target)
+        path.unlink()
+        return target, target.stat().st_size
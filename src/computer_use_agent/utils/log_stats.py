@@ -0,0 +1,292 @@
+"""Streaming analytics over LLM log files (latency, retries, actions, errors)."""
+
+import gzip
+import json
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+# Companion files sharing the logs/ directory that are not LLM logs
+COMPANION_MARKERS = (".replay.", ".trace.")
+
+
+@dataclass
+class StepRecord:
+    """One agent step reconstructed from log entries.
+
+    Attributes:
+        run: Log file stem identifying the run
+        step: Step number within the run
+        model_latency: Seconds from the last request to the response (None if
+            the step never got a response)
+        attempts: Model requests sent for the step (1 + retries)
+        errors: Error entries logged for the step
+        actions: Names of the function calls the model returned
+        agent_time: Seconds from the response to the next step's first request
+            (executing actions and capturing the screen)
+    """
+
+    run: str
+    step: int
+    model_latency: Optional[float] = None
+    attempts: int = 0
+    errors: int = 0
+    actions: List[str] = field(default_factory=list)
+    agent_time: Optional[float] = None
+
+
+def iter_log_files(paths: Iterable[Path]) -> Iterator[Path]:
+    """Expand files and directories into LLM log files.
+
+    Args:
+        paths: Log files or directories containing them
+
+    Yields:
+        Paths of llm_log_*.jsonl and rotated .jsonl.gz files, in name order
+    """
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            candidates = sorted(
+                list(path.glob("llm_log_*.jsonl"))
+                + list(path.glob("llm_log_*.jsonl.gz"))
+            )
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if not any(marker in candidate.name for marker in COMPANION_MARKERS):
+                yield candidate
+
+
+def iter_entries(files: Iterable[Path]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream log entries from plain or gzip-compressed JSONL files.
+
+    Lines that are not valid JSON (e.g. a run killed mid-write) are skipped.
+
+    Args:
+        files: Log files
+
+    Yields:
+        Tuples of (run name, entry)
+    """
+    for path in files:
+        run = path.name.split(".")[0]
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            for line in f:
+                try:
+                    yield run, json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def iter_steps(entries: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[StepRecord]:
+    """Group a run-ordered entry stream into steps.
+
+    Args:
+        entries: (run, entry) tuples as produced by iter_entries
+
+    Yields:
+        One StepRecord per step, in log order
+    """
+    current: Optional[StepRecord] = None
+    last_request: Optional[datetime] = None
+    responded_at: Optional[datetime] = None
+
+    for run, entry in entries:
+        step = entry.get("step")
+        if step is None:
+            continue  # goal rewrites, dropped-entry markers
+        timestamp = datetime.fromisoformat(entry["timestamp"])
+
+        if current is None or (run, step) != (current.run, current.step):
+            if current is not None:
+                if current.run == run and responded_at is not None:
+                    current.agent_time = (timestamp - responded_at).total_seconds()
+                yield current
+            current = StepRecord(run=run, step=step)
+            last_request = responded_at = None
+
+        kind = entry.get("type")
+        if kind == "request":
+            current.attempts += 1
+            last_request = timestamp
+        elif kind == "response":
+            if last_request is not None:
+                current.model_latency = (timestamp - last_request).total_seconds()
+            responded_at = timestamp
+            current.actions.extend(
+                call.get("name", "?") for call in entry.get("function_calls") or []
+            )
+        elif kind == "error":
+            current.errors += 1
+
+    if current is not None:
+        yield current
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile.
+
+    Args:
+        values: Sample values
+        fraction: Percentile in [0, 1]
+
+    Returns:
+        Percentile value (None for no samples)
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    """Count, p50, p95, p99 and max of a sample.
+
+    Args:
+        values: Sample values
+
+    Returns:
+        Summary dictionary (None values for an empty sample)
+    """
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values, default=None),
+    }
+
+
+def compute_stats(steps: Iterable[StepRecord], top_actions: int = 15) -> Dict[str, Any]:
+    """Aggregate step records into latency, retry, action and error stats.
+
+    Args:
+        steps: Step records
+        top_actions: Number of most common actions reported
+
+    Returns:
+        Stats dictionary (JSON serializable)
+    """
+    model_latencies: List[float] = []
+    agent_times: List[float] = []
+    steps_per_run: Counter = Counter()
+    actions: Counter = Counter()
+    requests = retries = errors = failed_steps = 0
+
+    for record in steps:
+        steps_per_run[record.run] = max(steps_per_run[record.run], record.step)
+        requests += record.attempts
+        retries += max(0, record.attempts - 1)
+        errors += record.errors
+        actions.update(record.actions)
+        if record.model_latency is not None:
+            model_latencies.append(record.model_latency)
+        else:
+            failed_steps += 1
+        if record.agent_time is not None:
+            agent_times.append(record.agent_time)
+
+    step_counts = [float(count) for count in steps_per_run.values()]
+    total_steps = sum(steps_per_run.values())
+    return {
+        "runs": len(steps_per_run),
+        "steps": total_steps,
+        "requests": requests,
+        "retries": retries,
+        "errors": errors,
+        "failed_steps": failed_steps,
+        "error_rate": errors / requests if requests else 0.0,
+        "retry_rate": retries / requests if requests else 0.0,
+        "model_latency": summarize_distribution(model_latencies),
+        "agent_time": summarize_distribution(agent_times),
+        "steps_per_run": summarize_distribution(step_counts),
+        "actions": dict(actions.most_common(top_actions)),
+    }
+
+
+def _distribution_table(title: str) -> Table:
+    """Create a table with count and percentile columns.
+
+    Args:
+        title: Table title
+
+    Returns:
+        Empty rich table
+    """
+    table = Table(title=title)
+    for column in ("", "count", "p50", "p95", "p99", "max"):
+        table.add_column(column, justify="right" if column else "left")
+    return table
+
+
+def _add_distribution_row(
+    table: Table, name: str, dist: Dict[str, Any], number_format: str
+) -> None:
+    """Add one summarize_distribution() result as a table row.
+
+    Args:
+        table: Table from _distribution_table()
+        name: Row label
+        dist: Distribution summary
+        number_format: Format for the percentile and max values
+    """
+    table.add_row(
+        name,
+        str(dist["count"]),
+        *(
+            "-" if dist[k] is None else number_format.format(dist[k])
+            for k in ("p50", "p95", "p99", "max")
+        ),
+    )
+
+
+def print_stats(stats: Dict[str, Any]) -> None:
+    """Print stats as rich tables.
+
+    Args:
+        stats: Output of compute_stats
+    """
+    console = Console()
+    console.print(
+        f"📊 {stats['runs']} runs, {stats['steps']} steps, "
+        f"{stats['requests']} requests"
+    )
+
+    latency = _distribution_table("Per-step timings (seconds)")
+    for name, key in (("model latency", "model_latency"), ("agent time", "agent_time")):
+        _add_distribution_row(latency, name, stats[key], "{:.2f}")
+    console.print(latency)
+
+    run_lengths = _distribution_table("Run length (steps)")
+    _add_distribution_row(
+        run_lengths, "steps per run", stats["steps_per_run"], "{:.0f}"
+    )
+    console.print(run_lengths)
+
+    reliability = Table(title="Reliability")
+    reliability.add_column("metric")
+    reliability.add_column("value", justify="right")
+    reliability.add_row("retries", str(stats["retries"]))
+    reliability.add_row("retry rate", f"{stats['retry_rate']:.1%}")
+    reliability.add_row("errors", str(stats["errors"]))
+    reliability.add_row("error rate", f"{stats['error_rate']:.1%}")
+    reliability.add_row("steps without response", str(stats["failed_steps"]))
+    console.print(reliability)
+
+    if stats["actions"]:
+        actions = Table(title="Actions")
+        actions.add_column("action")
+        actions.add_column("count", justify="right")
+        actions.add_column("share", justify="right")
+        total = sum(stats["actions"].values())
+        for name, count in stats["actions"].items():
+            actions.add_row(name, str(count), f"{count / total:.1%}")
+        console.print(actions)
@@ -0,0 +1,201 @@
+"""Detection of repeated or oscillating actions that make no progress."""
+
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
+
+from PIL import Image
+
+# (function name, canonical JSON args) per call of a step
+ActionSignature = Tuple[Tuple[str, str], ...]
+
+# Actions that are meant to repeat on an unchanged screen (e.g. waiting for a
+# long-running task); steps made only of these never count as a loop
+PASSIVE_ACTIONS = frozenset({"wait_5_seconds"})
+
+
+@dataclass
+class LoopStats:
+    """Loop detection counters for a run.
+
+    Attributes:
+        repeats: Steps that repeated the same actions on an unchanged screen
+        oscillations: Steps that alternated between two action/screen pairs
+        nudges: Hints injected into function responses
+        stopped: Whether the run was stopped because of a loop
+    """
+
+    repeats: int = 0
+    oscillations: int = 0
+    nudges: int = 0
+    stopped: bool = False
+
+
+@dataclass
+class LoopVerdict:
+    """Outcome of a detected loop.
+
+    Attributes:
+        kind: "repeat" or "oscillation"
+        message: Explanation for the model (nudge) or the user (stop)
+        stop: Whether the run should stop instead of being nudged
+    """
+
+    kind: str
+    message: str
+    stop: bool
+
+
+class LoopDetector:
+    """Spots steps that keep doing the same thing to the same screen.
+
+    Each step is recorded as the screen it started from plus the actions it
+    ran. The same pair repeat_limit times in a row is a repeat (e.g. clicking
+    a dead button, scrolling at the end of a list); two pairs alternating is
+    an oscillation. A loop is first answered with a hint for the model; if it
+    persists past max_nudges hints the run should stop. Steps that only wait
+    (PASSIVE_ACTIONS) are never part of a loop.
+    """
+
+    def __init__(self, repeat_limit: int = 3, max_nudges: int = 2, window: int = 8):
+        """Initialize loop detector.
+
+        Args:
+            repeat_limit: Identical action/screen pairs in a row that count as
+                a loop (oscillations need repeat_limit - 1 full cycles)
+            max_nudges: Consecutive hints before the run is stopped
+            window: Recent steps kept for detection
+        """
+        self.repeat_limit = max(2, repeat_limit)
+        self.max_nudges = max_nudges
+        self._steps: Deque[Tuple[Optional[bytes], ActionSignature]] = deque(
+            maxlen=max(window, 2 * self.repeat_limit)
+        )
+        self._screen: Optional[bytes] = None
+        self._consecutive = 0
+        self.stats = LoopStats()
+
+    @staticmethod
+    def action_signature(function_calls: List[Any]) -> ActionSignature:
+        """Build a comparable signature of a step's function calls.
+
+        Args:
+            function_calls: FunctionCall objects of the step
+
+        Returns:
+            Tuple of (name, canonical args) pairs
+        """
+        return tuple(
+            (call.name, json.dumps(call.args or {}, sort_keys=True, default=str))
+            for call in function_calls
+        )
+
+    @staticmethod
+    def frame_key(image: Image.Image) -> bytes:
+        """Digest of a coarse, quantized frame.
+
+        Reducing and quantizing first keeps a blinking caret or cursor from
+        making an unchanged screen look new.
+
+        Args:
+            image: Frame at any resolution
+
+        Returns:
+            16-byte digest
+        """
+        factor = max(1, image.width // 90)
+        small = image.reduce(factor).convert("L").point(lambda value: value >> 4)
+        return hashlib.blake2b(small.tobytes(), digest_size=16).digest()
+
+    def record(
+        self, actions: ActionSignature, screen_after: Optional[bytes]
+    ) -> Optional[LoopVerdict]:
+        """Record a finished step and check for a loop.
+
+        Args:
+            actions: Signature of the step's function calls
+            screen_after: frame_key of the screen after the step (None if
+                unknown; steps on an unknown screen never count as a loop)
+
+        Returns:
+            LoopVerdict if the recent steps loop, otherwise None
+        """
+        self._steps.append((self._screen, actions))
+        self._screen = screen_after
+
+        verdict = self._check()
+        if verdict is None:
+            self._consecutive = 0
+            return None
+
+        self._consecutive += 1
+        if self._consecutive > self.max_nudges:
+            verdict.stop = True
+            self.stats.stopped = True
+        else:
+            self.stats.nudges += 1
+        return verdict
+
+    def reset(self) -> None:
+        """Forget recorded steps and counters."""
+        self._steps.clear()
+        self._screen = None
+        self._consecutive = 0
+        self.stats = LoopStats()
+
+    def _check(self) -> Optional[LoopVerdict]:
+        """Look for a repeat or oscillation at the end of the history.
+
+        Returns:
+            LoopVerdict (stop unset) or None
+        """
+        steps = list(self._steps)
+        last = steps[-1]
+        if last[0] is None or self._is_passive(last[1]):
+            return None
+
+        tail = steps[-self.repeat_limit :]
+        if len(tail) == self.repeat_limit and all(step == last for step in tail):
+            self.stats.repeats += 1
+            names = ", ".join(name for name, _ in last[1]) or "no action"
+            return LoopVerdict(
+                "repeat",
+                f"The last {self.repeat_limit} steps ran the same action "
+                f"({names}) on the same screen and nothing changed. Try a "
+                "different approach: another element, a keyboard shortcut, or "
+                "check whether the end of the list or page was reached.",
+                stop=False,
+            )
+
+        span = 2 * (self.repeat_limit - 1)
+        tail = steps[-span:]
+        if (
+            len(tail) == span
+            and tail[0] != tail[1]
+            and all(step[0] is not None for step in tail)
+            and not any(self._is_passive(step[1]) for step in tail)
+            and all(step == tail[index % 2] for index, step in enumerate(tail))
+        ):
+            self.stats.oscillations += 1
+            return LoopVerdict(
+                "oscillation",
+                f"The last {span} steps alternated between the same two "
+                "actions and screens without making progress. Step back and "
+                "choose a different approach.",
+                stop=False,
+            )
+        return None
+
+    @staticmethod
+    def _is_passive(actions: ActionSignature) -> bool:
+        """Check whether a step only waited.
+
+        Args:
+            actions: Signature of the step's function calls
+
+        Returns:
+            True if every call of the step is a passive action
+        """
+        return bool(actions) and all(name in PASSIVE_ACTIONS for name, _ in actions)
@@ -0,0 +1,273 @@
+"""Record/replay stand-ins for the Gemini client used in offline benchmarks."""
+
+import gzip
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.genai import types
+
+from .streaming import merge_chunks, split_response
+
+
+def summarize_contents(contents: List[types.Content]) -> Dict[str, Any]:
+    """Summarize a request's contents without copying image bytes.
+
+    Args:
+        contents: Conversation contents sent to the model
+
+    Returns:
+        Dictionary with message, text and inline image counts and sizes
+    """
+    summary = {
+        "messages": len(contents),
+        "text_chars": 0,
+        "images": 0,
+        "image_bytes": 0,
+    }
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                summary["text_chars"] += len(part.text)
+            if part.inline_data and part.inline_data.data:
+                summary["images"] += 1
+                summary["image_bytes"] += len(part.inline_data.data)
+            response = part.function_response
+            for fr_part in (response.parts or []) if response else []:
+                if fr_part.inline_data and fr_part.inline_data.data:
+                    summary["images"] += 1
+                    summary["image_bytes"] += len(fr_part.inline_data.data)
+    return summary
+
+
+class _RecordingModels:
+    """models namespace of RecordingClient."""
+
+    def __init__(self, client: "RecordingClient"):
+        """Initialize recording models namespace.
+
+        Args:
+            client: Owning recording client
+        """
+        self._client = client
+
+    def generate_content(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> types.GenerateContentResponse:
+        """Call the wrapped client and record the request/response pair."""
+        start = time.monotonic()
+        try:
+            response = self._client.wrapped.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+        except Exception as e:
+            self._client.record(model, contents, start, error=str(e))
+            raise
+        self._client.record(model, contents, start, response=response)
+        return response
+
+    def generate_content_stream(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> Iterator[types.GenerateContentResponse]:
+        """Stream from the wrapped client and record the assembled response."""
+        start = time.monotonic()
+        chunks = []
+        try:
+            for chunk in self._client.wrapped.models.generate_content_stream(
+                model=model, contents=contents, config=config
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._client.record(model, contents, start, error=str(e))
+            raise
+        self._client.record(model, contents, start, response=merge_chunks(chunks))
+
+
+class RecordingClient:
+    """Wraps a genai.Client and writes every model call to a JSONL file."""
+
+    def __init__(self, client: Any, path: Path):
+        """Initialize recording client.
+
+        Args:
+            client: Real genai.Client to forward calls to
+            path: JSONL file to append recorded calls to
+        """
+        self.wrapped = client
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.calls = 0
+        self.models = _RecordingModels(self)
+
+    def record(
+        self,
+        model: str,
+        contents: Any,
+        start: float,
+        response: Optional[types.GenerateContentResponse] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Append one request/response (or error) entry.
+
+        Args:
+            model: Model name used
+            contents: Request contents
+            start: Monotonic time the call started
+            response: Model response on success
+            error: Error message on failure
+        """
+        self.calls += 1
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "call": self.calls,
+            "model": model,
+            "latency": round(time.monotonic() - start, 4),
+            "request": summarize_contents(contents),
+        }
+        if response is not None:
+            entry["response"] = response.model_dump(mode="json", exclude_none=True)
+        if error is not None:
+            entry["error"] = error
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class ReplayError(Exception):
+    """Raised when a recorded call failed, or the recording is exhausted."""
+
+
+class _ReplayModels:
+    """models namespace of ReplayClient."""
+
+    def __init__(self, client: "ReplayClient"):
+        """Initialize replay models namespace.
+
+        Args:
+            client: Owning replay client
+        """
+        self._client = client
+
+    def generate_content(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> types.GenerateContentResponse:
+        """Serve the next recorded response after the simulated latency."""
+        return self._client.next_response()
+
+    def generate_content_stream(
+        self, *, model: str, contents: Any, config: Any = None
+    ) -> Iterator[types.GenerateContentResponse]:
+        """Stream the next recorded response one part at a time."""
+        return self._client.stream_response()
+
+
+class ReplayClient:
+    """Serves recorded model responses locally, in order."""
+
+    def __init__(
+        self,
+        path: Path,
+        latency: Optional[float] = None,
+        latency_scale: float = 1.0,
+    ):
+        """Load a recording.
+
+        Args:
+            path: JSONL file written by RecordingClient (a gzip-compressed
+                ``.gz`` copy left by log rotation is found automatically)
+            latency: Fixed simulated latency per call (None = recorded latency)
+            latency_scale: Multiplier applied to recorded latencies
+
+        Raises:
+            FileNotFoundError: If the recording does not exist
+        """
+        path = Path(path)
+        compressed = path.with_name(path.name + ".gz")
+        if not path.exists() and compressed.exists():
+            path = compressed
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.position = 0
+        self.models = _ReplayModels(self)
+
+    def next_response(self) -> types.GenerateContentResponse:
+        """Pop the next recorded call, sleeping for its simulated latency.
+
+        Returns:
+            Recorded model response
+
+        Raises:
+            ReplayError: If the recorded call failed or no calls are left
+        """
+        entry, delay = self._pop()
+        if delay > 0:
+            time.sleep(delay)
+        return self._response(entry)
+
+    def stream_response(self) -> Iterator[types.GenerateContentResponse]:
+        """Pop the next recorded call and yield it as per-part chunks.
+
+        The simulated latency is spread evenly across the chunks.
+
+        Yields:
+            Response chunks
+
+        Raises:
+            ReplayError: If the recorded call failed or no calls are left
+        """
+        entry, delay = self._pop()
+        if "error" in entry:
+            if delay > 0:
+                time.sleep(delay)
+            raise ReplayError(entry["error"])
+        chunks = split_response(self._response(entry))
+        for chunk in chunks:
+            if delay > 0:
+                time.sleep(delay / len(chunks))
+            yield chunk
+
+    def _pop(self) -> Tuple[Dict[str, Any], float]:
+        """Advance to the next recorded call.
+
+        Returns:
+            Tuple of (entry, simulated latency in seconds)
+
+        Raises:
+            ReplayError: If no calls are left
+        """
+        if self.position >= len(self.entries):
+            raise ReplayError(
+                f"Replay exhausted after {len(self.entries)} recorded calls"
+            )
+        entry = self.entries[self.position]
+        self.position += 1
+
+        delay = self.latency
+        if delay is None:
+            delay = entry.get("latency", 0.0) * self.latency_scale
+        return entry, delay
+
+    @staticmethod
+    def _response(entry: Dict[str, Any]) -> types.GenerateContentResponse:
+        """Rebuild the recorded response of an entry.
+
+        Args:
+            entry: Recorded call
+
+        Returns:
+            Recorded model response
+
+        Raises:
+            ReplayError: If the recorded call failed
+        """
+        if "error" in entry:
+            raise ReplayError(entry["error"])
+        # Validate from JSON so base64 bytes (thought signatures) decode correctly
+        return types.GenerateContentResponse.model_validate_json(
+            json.dumps(entry["response"])
+        )
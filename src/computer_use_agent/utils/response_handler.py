@@ -1,19 +1,36 @@
 """Response handling utilities for Computer Use Agent."""
 
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 from google.genai import types
 
 
 class ResponseHandler:
     """Handles model responses and creates function responses."""
 
-    def __init__(self, screen_manager):
+    def __init__(
+        self,
+        screen_manager,
+        delta_max_fraction: Optional[float] = None,
+        full_frame_every: int = 3,
+        delta_margin: int = 32,
+    ):
         """Initialize response handler.
 
         Args:
-            screen_manager: ScreenManager instance
+            screen_manager: ScreenManager instance (needs a comparator for
+                delta screenshots)
+            delta_max_fraction: Send only the changed region when its bounding
+                box covers at most this fraction of the screen (None = always
+                send full frames)
+            full_frame_every: Send a full frame at least every N screenshots;
+                keep it within the inline screenshot history
+            delta_margin: Pixels of context added around a changed region
         """
         self.screen = screen_manager
+        self.delta_max_fraction = delta_max_fraction
+        self.full_frame_every = max(1, full_frame_every)
+        self.delta_margin = delta_margin
+        self.screenshots_since_full = 0
 
     def create_function_responses(
         self,
@@ -24,6 +41,13 @@ class ResponseHandler:
     ) -> List[types.FunctionResponse]:
         """Create function responses from action results.
 
+        A turn may contain several actions. The screen is captured once after
+        the last action and attached to the final response; earlier actions get
+        a lightweight text acknowledgement since their frames would be stale.
+        Images an action returns itself (a result's "attachments", e.g. the
+        contact sheets of scroll_until_end) go on that action's response; the
+        full current screen is then always sent after them.
+
         Args:
             results: List of (function_name, result_dict) tuples
             iteration: Current iteration number
@@ -33,26 +57,91 @@ class ResponseHandler:
         Returns:
             List of FunctionResponse objects
         """
+        if not results:
+            return []
+
+        # Skip screenshots for scroll-only batches after the first few to save context
+        should_include_screenshot = include_screenshot and any(
+            not (name in ["scroll_document", "scroll_at"] and iteration > 3)
+            for name, _ in results
+        )
+
         function_responses = []
+        last_index = len(results) - 1
 
-        for name, result in results:
+        for index, (name, result) in enumerate(results):
             # Add URL to response (required by Computer Use API)
             response_data = dict(result)
             response_data["url"] = app_url
+            attachments = [
+                types.FunctionResponsePart(
+                    inline_data=types.FunctionResponseBlob(
+                        mime_type=self.screen.mime_type, data=data
+                    )
+                )
+                for data in response_data.pop("attachments", None) or []
+            ]
 
-            # Skip screenshots for scroll operations after the first few to save context
-            should_include_screenshot = include_screenshot and not (
-                name in ["scroll_document", "scroll_at"] and iteration > 3
-            )
+            if index < last_index:
+                if should_include_screenshot:
+                    response_data["description"] = (
+                        "Action completed. Screen state is attached to the last "
+                        "action of this turn."
+                    )
+                elif name in ["scroll_document", "scroll_at"]:
+                    response_data["description"] = "Scrolled successfully."
+                else:
+                    response_data["description"] = "Action completed."
+                function_responses.append(
+                    types.FunctionResponse(
+                        name=name, response=response_data, parts=attachments
+                    )
+                )
+                continue
 
             if should_include_screenshot:
-                # Take screenshot
+                # Take one screenshot for the whole batch
                 screenshot_bytes = self.screen.capture_screenshot()
 
+                change = self.screen.last_change
+                if change is not None:
+                    response_data["screen_unchanged"] = change.unchanged
+                if change is not None and change.unchanged and not attachments:
+                    # The model still has the previous screenshot; don't resend it
+                    response_data["description"] = (
+                        "Screen unchanged since previous step."
+                    )
+                    function_responses.append(
+                        types.FunctionResponse(
+                            name=name, response=response_data, parts=attachments
+                        )
+                    )
+                    continue
+
+                # Attachments are not the current screen, so send it whole
+                region = None if attachments else self._delta_region(change)
+                if region is not None:
+                    # Small change: send the changed region on top of the last frame
+                    screenshot_bytes = self.screen.encode_region(region)
+                    x0, y0, x1, y1 = self.screen.normalize_region(region)
+                    response_data["screen_region"] = [x0, y0, x1, y1]
+                    response_data["description"] = (
+                        f"Only the changed region is attached: x {x0}-{x1}, "
+                        f"y {y0}-{y1} in screen coordinates (0-999). The rest "
+                        "of the screen is unchanged since the previous screenshot."
+                    )
+                    self.screenshots_since_full += 1
+                else:
+                    self.screenshots_since_full = 0
+                if attachments:
+                    response_data["description"] = (
+                        "The image after the attached frames is the current screen."
+                    )
+
                 # Create FunctionResponsePart with inline data
                 function_response_part = types.FunctionResponsePart(
                     inline_data=types.FunctionResponseBlob(
-                        mime_type="image/png", data=screenshot_bytes
+                        mime_type=self.screen.mime_type, data=screenshot_bytes
                     )
                 )
 
@@ -60,7 +149,7 @@ class ResponseHandler:
                     types.FunctionResponse(
                         name=name,
                         response=response_data,
-                        parts=[function_response_part],
+                        parts=attachments + [function_response_part],
                     )
                 )
             else:
@@ -74,12 +163,40 @@ class ResponseHandler:
                     types.FunctionResponse(
                         name=name,
                         response=response_data,
-                        parts=[],
+                        parts=attachments,
                     )
                 )
 
         return function_responses
 
+    def _delta_region(self, change) -> Optional[Tuple[int, int, int, int]]:
+        """Pick the region to send instead of a full frame, if any.
+
+        Args:
+            change: FrameChange of the new screenshot (None if not compared)
+
+        Returns:
+            (left, top, right, bottom) in native frame pixels, or None to send
+            the full frame
+        """
+        if (
+            self.delta_max_fraction is None
+            or change is None
+            or change.box is None
+            or change.box_fraction > self.delta_max_fraction
+            or self.screenshots_since_full + 1 >= self.full_frame_every
+        ):
+            return None
+        width, height = self.screen.last_frame.size
+        left, top, right, bottom = change.box
+        margin = self.delta_margin
+        return (
+            max(0, left - margin),
+            max(0, top - margin),
+            min(width, right + margin),
+            min(height, bottom + margin),
+        )
+
     @staticmethod
     def extract_text_response(candidate) -> str:
         """Extract text from candidate response.
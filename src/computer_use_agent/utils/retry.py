@@ -1,10 +1,13 @@
 """Retry utilities with exponential backoff."""
 
+import asyncio
 import time
 import logging
 from typing import Callable, Any, Optional
 from functools import wraps
 
+from .tracing import NULL_TRACER, Tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +66,7 @@ class RetryableAPICall:
         initial_delay: float = 2.0,
         on_503_callback: Optional[Callable] = None,
         on_429_callback: Optional[Callable] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """Initialize retryable API call context.
 
@@ -71,11 +75,13 @@ class RetryableAPICall:
             initial_delay: Initial delay between retries
             on_503_callback: Callback for 503 errors
             on_429_callback: Callback for 429 rate limit errors
+            tracer: Span recorder for backoff sleeps
         """
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.on_503_callback = on_503_callback
         self.on_429_callback = on_429_callback
+        self.tracer = tracer or NULL_TRACER
         self.retry_count = 0
         self.delay = initial_delay
 
@@ -111,12 +117,24 @@ class RetryableAPICall:
         if any(x in error_msg for x in ["429", "RATE_LIMIT", "rate_limit"]):
             if self.on_429_callback:
                 self.on_429_callback()
-            time.sleep(30)  # Wait longer for rate limits
+            with self.tracer.span("retry.backoff", seconds=30, reason="rate_limit"):
+                time.sleep(30)  # Wait longer for rate limits
             return True
 
         return False
 
     def wait_and_retry(self):
         """Wait before retry with exponential backoff."""
-        time.sleep(self.delay)
+        with self.tracer.span(
+            "retry.backoff", seconds=self.delay, reason="unavailable"
+        ):
+            time.sleep(self.delay)
+        self.delay *= 2  # Exponential backoff
+
+    async def wait_and_retry_async(self):
+        """Wait before retry with exponential backoff, without blocking the loop."""
+        with self.tracer.span(
+            "retry.backoff", seconds=self.delay, reason="unavailable"
+        ):
+            await asyncio.sleep(self.delay)
         self.delay *= 2  # Exponential backoff
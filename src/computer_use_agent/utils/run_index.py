@@ -0,0 +1,181 @@
+"""SQLite index of agent runs for fast queries across many log files."""
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    goal TEXT NOT NULL,
+    app TEXT,
+    model TEXT,
+    steps INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    prompt_tokens INTEGER,
+    output_tokens INTEGER,
+    log_file TEXT  -- follows rotation: .gz once compressed, NULL once deleted
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_duration ON runs (duration_seconds);
+CREATE INDEX IF NOT EXISTS runs_outcome ON runs (outcome);
+"""
+
+RUN_COLUMNS = (
+    "started_at",
+    "finished_at",
+    "goal",
+    "app",
+    "model",
+    "steps",
+    "outcome",
+    "duration_seconds",
+    "prompt_tokens",
+    "output_tokens",
+    "log_file",
+)
+
+
+class RunIndex:
+    """One row per agent run: goal, app, steps, outcome, duration, tokens."""
+
+    def __init__(self, path: Path = Path("logs/runs.sqlite")):
+        """Open (and create if needed) the run index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that tolerates concurrent runs.
+
+        The transaction is committed on success and the connection closed.
+
+        Yields:
+            SQLite connection with dict-like rows
+        """
+        db = sqlite3.connect(self.path, timeout=10.0)
+        try:
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record_run(
+        self,
+        started_at: datetime,
+        goal: str,
+        steps: int,
+        outcome: str,
+        duration_seconds: float,
+        app: str = "",
+        model: str = "",
+        prompt_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        log_file: str = "",
+    ) -> int:
+        """Insert a finished run.
+
+        Args:
+            started_at: Run start time
+            goal: Goal the agent worked on
+            steps: Agent steps taken
+            outcome: "success", "error", "terminated", "max_iterations", ...
+            duration_seconds: Wall-clock run length
+            app: Application name
+            model: Model name
+            prompt_tokens: Total prompt tokens, if known
+            output_tokens: Total output tokens, if known
+            log_file: Path of the run's LLM log (updated by log rotation)
+
+        Returns:
+            Row id of the new run
+        """
+        values = (
+            started_at.isoformat(),
+            datetime.now().isoformat(),
+            goal,
+            app,
+            model,
+            steps,
+            outcome,
+            duration_seconds,
+            prompt_tokens,
+            output_tokens,
+            log_file,
+        )
+        with self._connect() as db:
+            cursor = db.execute(
+                f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in RUN_COLUMNS)})",
+                values,
+            )
+            return cursor.lastrowid
+
+    def move_log_files(self, moves: List[Tuple[Path, Optional[Path]]]) -> int:
+        """Point runs at their rotated logs.
+
+        Args:
+            moves: (old path, new path) pairs; a new path of None means the
+                log was deleted and log_file becomes NULL
+
+        Returns:
+            Number of runs updated
+        """
+        updated = 0
+        with self._connect() as db:
+            for old, new in moves:
+                # Runs store the path as given at the time, relative or not
+                cursor = db.execute(
+                    "UPDATE runs SET log_file = ? WHERE log_file IN (?, ?)",
+                    (
+                        str(new) if new is not None else None,
+                        str(old),
+                        str(Path(old).resolve()),
+                    ),
+                )
+                updated += cursor.rowcount
+        return updated
+
+    def slowest(
+        self, limit: int = 20, since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Longest runs, optionally since a point in time.
+
+        Args:
+            limit: Maximum runs returned
+            since: Only runs started at or after this time
+
+        Returns:
+            Runs as dictionaries, slowest first
+        """
+        return self.query(
+            "SELECT * FROM runs WHERE started_at >= ? "
+            "ORDER BY duration_seconds DESC LIMIT ?",
+            (since.isoformat() if since else "", limit),
+        )
+
+    def query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run an arbitrary read query against the index.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Result rows as dictionaries
+        """
+        with self._connect() as db:
+            return [dict(row) for row in db.execute(sql, params)]
@@ -0,0 +1,269 @@
+"""Content-addressed screenshot archive with a size-bounded retention policy."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from google.genai import types
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install computer-use-agent[archive]
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # optional: pip install computer-use-agent[archive]
+    lz4_frame = None
+
+# File suffix per compression codec
+CODEC_SUFFIXES = {"zstd": ".zst", "lz4": ".lz4", "zlib": ".z", "none": ""}
+MIME_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+
+
+def inline_images(contents: List[types.Content]) -> List[Tuple[bytes, str]]:
+    """Collect inline images from conversation contents, oldest first.
+
+    Args:
+        contents: Conversation contents
+
+    Returns:
+        List of (image bytes, MIME type) tuples
+    """
+    images = []
+    for content in contents:
+        for part in content.parts or []:
+            blobs = [part.inline_data]
+            if part.function_response:
+                blobs += [p.inline_data for p in part.function_response.parts or []]
+            for blob in blobs:
+                if blob and blob.data:
+                    images.append((blob.data, blob.mime_type or "image/png"))
+    return images
+
+
+class ScreenshotStore:
+    """Stores screenshots once per unique content under their SHA-256.
+
+    Files live at ``root/<first 2 hex chars>/<digest><ext>[<codec suffix>]``,
+    so repeated frames (e.g. a list that stopped scrolling) cost one file no
+    matter how many runs capture them. When the archive grows past
+    ``max_bytes`` the least recently stored or re-used files are evicted.
+    """
+
+    def __init__(
+        self,
+        root: Path = Path("logs/screenshots"),
+        compression: str = "auto",
+        max_bytes: Optional[int] = 1024 * 1024 * 1024,
+    ):
+        """Initialize screenshot store.
+
+        Args:
+            root: Archive directory
+            compression: "zstd", "lz4", "zlib", "none" or "auto" (zstd, else
+                lz4, else none; PNG/JPEG/WebP are already deflated so zlib
+                rarely pays off)
+            max_bytes: Archive size budget in bytes (None = unbounded)
+
+        Raises:
+            ValueError: If the codec is unknown or its package isn't installed
+        """
+        if compression == "auto":
+            compression = "zstd" if zstandard else "lz4" if lz4_frame else "none"
+        if compression not in CODEC_SUFFIXES:
+            raise ValueError(
+                f"Unknown compression '{compression}', "
+                f"expected one of {list(CODEC_SUFFIXES)} or 'auto'"
+            )
+        if (compression == "zstd" and zstandard is None) or (
+            compression == "lz4" and lz4_frame is None
+        ):
+            raise ValueError(
+                f"{compression} compression requires the optional dependency; "
+                "install computer-use-agent[archive]"
+            )
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.stored = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+        if max_bytes is not None and self._total_bytes > max_bytes:
+            self.evict()
+
+    def put(self, data: bytes, mime_type: str = "image/png") -> str:
+        """Archive a screenshot (no-op if the same content is already stored).
+
+        Args:
+            data: Encoded screenshot bytes
+            mime_type: MIME type of the screenshot
+
+        Returns:
+            Hex SHA-256 digest identifying the screenshot
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self.find(digest)
+        if existing is not None:
+            try:
+                # Refresh the timestamp so re-used frames survive eviction
+                os.utime(existing)
+                self.deduplicated += 1
+                return digest
+            except FileNotFoundError:
+                pass  # Evicted in the meantime; store it again
+
+        path = (
+            self.root
+            / digest[:2]
+            / (
+                digest
+                + MIME_EXTENSIONS.get(mime_type, ".bin")
+                + CODEC_SUFFIXES[self.compression]
+            )
+        )
+        path.parent.mkdir(exist_ok=True)
+        payload = self._compress(data)
+        # Write-then-rename so concurrent runs never see partial files
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self.stored += 1
+            self._total_bytes += len(payload)
+            over_budget = (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            )
+        if over_budget:
+            self.evict()
+        return digest
+
+    def find(self, digest: str) -> Optional[Path]:
+        """Locate a stored screenshot.
+
+        Args:
+            digest: Hex SHA-256 digest returned by put()
+
+        Returns:
+            Path of the archived file, or None if not stored
+        """
+        bucket = self.root / digest[:2]
+        if not bucket.is_dir():
+            return None
+        for path in bucket.glob(f"{digest}.*"):
+            if not path.name.endswith(".tmp"):
+                return path
+        return None
+
+    def get(self, digest: str) -> bytes:
+        """Load a screenshot's original bytes.
+
+        Args:
+            digest: Hex SHA-256 digest returned by put()
+
+        Returns:
+            Encoded screenshot bytes
+
+        Raises:
+            FileNotFoundError: If the screenshot is not (or no longer) stored
+        """
+        path = self.find(digest)
+        if path is None:
+            raise FileNotFoundError(f"Screenshot {digest} is not in {self.root}")
+        payload = path.read_bytes()
+        if path.suffix == ".zst":
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if path.suffix == ".lz4":
+            return lz4_frame.decompress(payload)
+        if path.suffix == ".z":
+            return zlib.decompress(payload)
+        return payload
+
+    def evict(self, target_fraction: float = 0.9) -> int:
+        """Delete least recently used files until under budget.
+
+        Evicting down to a fraction of the budget avoids evicting on every
+        put once the archive is full.
+
+        Args:
+            target_fraction: Fraction of max_bytes to shrink the archive to
+
+        Returns:
+            Number of files deleted
+        """
+        if self.max_bytes is None:
+            return 0
+        files = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * target_fraction
+        deleted = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass  # Evicted by another run sharing the archive
+            total -= size
+            deleted += 1
+        with self._lock:
+            self._total_bytes = total
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """Archive statistics for this process.
+
+        Returns:
+            Dictionary with stored, deduplicated and total_bytes counts
+        """
+        return {
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "total_bytes": self._total_bytes,
+        }
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress bytes with the configured codec.
+
+        Args:
+            data: Raw bytes
+
+        Returns:
+            Compressed bytes
+        """
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        if self.compression == "lz4":
+            return lz4_frame.compress(data)
+        if self.compression == "zlib":
+            return zlib.compress(data, 6)
+        return data
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """List archived files.
+
+        Returns:
+            List of (path, size, mtime) tuples
+        """
+        files = []
+        for bucket in os.scandir(self.root):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return files
@@ -0,0 +1,118 @@
+"""Helpers for streamed model responses (merging and splitting chunks)."""
+
+from typing import Iterable, List
+
+from google.genai import types
+
+
+def _mergeable(previous: types.Part, part: types.Part) -> bool:
+    """Whether a streamed text part continues the previous one.
+
+    Parts carrying a thought signature are kept separate so the signature is
+    sent back to the model exactly as it was received.
+
+    Args:
+        previous: Last accumulated part
+        part: Newly streamed part
+
+    Returns:
+        True if the text can be appended to the previous part
+    """
+    return (
+        previous.text is not None
+        and part.text is not None
+        and not previous.function_call
+        and not part.function_call
+        and not part.thought_signature
+        and bool(previous.thought) == bool(part.thought)
+    )
+
+
+def merge_chunks(
+    chunks: Iterable[types.GenerateContentResponse],
+) -> types.GenerateContentResponse:
+    """Assemble streamed chunks into one response.
+
+    Consecutive text fragments are joined into a single part; function calls
+    and signed parts are kept as streamed. The finish reason, usage and prompt
+    feedback of the last chunk reporting them win.
+
+    Args:
+        chunks: Responses yielded by generate_content_stream
+
+    Returns:
+        Response equivalent to a non-streaming generate_content call (without
+        candidates if no chunk carried one)
+    """
+    parts: List[types.Part] = []
+    saw_candidate = False
+    finish_reason = None
+    usage = None
+    prompt_feedback = None
+
+    for chunk in chunks:
+        usage = chunk.usage_metadata or usage
+        prompt_feedback = chunk.prompt_feedback or prompt_feedback
+        if not chunk.candidates:
+            continue
+        saw_candidate = True
+        candidate = chunk.candidates[0]
+        finish_reason = candidate.finish_reason or finish_reason
+        for part in (candidate.content.parts if candidate.content else None) or []:
+            if parts and _mergeable(parts[-1], part):
+                parts[-1].text += part.text
+            else:
+                parts.append(part.model_copy())
+
+    candidates = None
+    if saw_candidate:
+        candidates = [
+            types.Candidate(
+                content=types.Content(role="model", parts=parts),
+                finish_reason=finish_reason,
+            )
+        ]
+    return types.GenerateContentResponse(
+        candidates=candidates,
+        usage_metadata=usage,
+        prompt_feedback=prompt_feedback,
+    )
+
+
+def split_response(
+    response: types.GenerateContentResponse,
+) -> List[types.GenerateContentResponse]:
+    """Split a complete response into one chunk per part, as a stream would.
+
+    Used by the offline clients to simulate streaming. Usage metadata and the
+    finish reason travel with the last chunk.
+
+    Args:
+        response: Complete model response
+
+    Returns:
+        Chunks in order (the response itself if it has nothing to split)
+    """
+    if not response.candidates or not response.candidates[0].content:
+        return [response]
+    candidate = response.candidates[0]
+    parts = candidate.content.parts or []
+    if len(parts) <= 1:
+        return [response]
+
+    chunks = []
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        chunks.append(
+            types.GenerateContentResponse(
+                candidates=[
+                    types.Candidate(
+                        content=types.Content(role="model", parts=[part]),
+                        finish_reason=candidate.finish_reason if last else None,
+                    )
+                ],
+                usage_metadata=response.usage_metadata if last else None,
+                prompt_feedback=response.prompt_feedback if last else None,
+            )
+        )
+    return chunks
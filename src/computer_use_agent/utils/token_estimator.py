@@ -0,0 +1,138 @@
+"""Local request size estimates for pre-flight context checks."""
+
+import io
+import json
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from google.genai import types
+from PIL import Image
+
+# Gemini bills an image as one 258-token tile when both sides are at most
+# 384 px, otherwise as 258 tokens per 768x768 tile
+TOKENS_PER_TILE = 258
+IMAGE_TILE_SIZE = 768
+SMALL_IMAGE_SIZE = 384
+
+
+def image_tokens(width: int, height: int) -> int:
+    """Estimate the tokens an image costs from its dimensions.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        Estimated token count
+    """
+    if width <= SMALL_IMAGE_SIZE and height <= SMALL_IMAGE_SIZE:
+        return TOKENS_PER_TILE
+    tiles = math.ceil(width / IMAGE_TILE_SIZE) * math.ceil(height / IMAGE_TILE_SIZE)
+    return tiles * TOKENS_PER_TILE
+
+
+@dataclass
+class TokenEstimate:
+    """Estimated size of a request.
+
+    Attributes:
+        text_tokens: Tokens for text, function calls and function responses
+        image_tokens: Tokens for inline images
+        images: Number of inline images
+        total: Calibrated estimate of the prompt tokens the API will count
+    """
+
+    text_tokens: int = 0
+    image_tokens: int = 0
+    images: int = 0
+    total: int = 0
+
+    @property
+    def raw(self) -> int:
+        """Uncalibrated text plus image tokens."""
+        return self.text_tokens + self.image_tokens
+
+
+class TokenEstimator:
+    """Fast prompt token estimate: characters / 4 for text, tiles for images.
+
+    The estimate is calibrated against the prompt token counts the API
+    reports, which also absorbs fixed overhead such as tool declarations.
+    """
+
+    def __init__(self, chars_per_token: float = 4.0):
+        """Initialize token estimator.
+
+        Args:
+            chars_per_token: Average characters per text token
+        """
+        self.chars_per_token = chars_per_token
+        self.correction = 1.0
+
+    def estimate(
+        self, contents: List[types.Content], system_instruction: str = ""
+    ) -> TokenEstimate:
+        """Estimate the prompt tokens of a request.
+
+        Args:
+            contents: Conversation contents
+            system_instruction: System instruction sent with the request
+
+        Returns:
+            Token estimate
+        """
+        chars = len(system_instruction)
+        estimate = TokenEstimate()
+
+        for content in contents:
+            for part in content.parts or []:
+                if part.text:
+                    chars += len(part.text)
+                if part.function_call:
+                    chars += len(part.function_call.name or "")
+                    chars += len(json.dumps(part.function_call.args or {}, default=str))
+                blobs = [part.inline_data]
+                response = part.function_response
+                if response:
+                    chars += len(response.name or "")
+                    chars += len(json.dumps(response.response or {}, default=str))
+                    blobs += [p.inline_data for p in response.parts or []]
+                for blob in blobs:
+                    if blob and blob.data:
+                        estimate.images += 1
+                        estimate.image_tokens += image_tokens(*self._image_size(blob))
+
+        estimate.text_tokens = math.ceil(chars / self.chars_per_token)
+        estimate.total = math.ceil(estimate.raw * self.correction)
+        return estimate
+
+    def calibrate(self, estimate: TokenEstimate, actual_prompt_tokens: int) -> None:
+        """Nudge the correction factor towards the API's reported count.
+
+        Args:
+            estimate: Estimate made for the request
+            actual_prompt_tokens: prompt_token_count from usage_metadata
+        """
+        if estimate.raw <= 0 or actual_prompt_tokens <= 0:
+            return
+        ratio = actual_prompt_tokens / estimate.raw
+        # Smooth and clamp so a single odd response can't swing the estimate
+        self.correction = min(2.0, max(0.5, 0.7 * self.correction + 0.3 * ratio))
+
+    @staticmethod
+    def _image_size(blob) -> Tuple[int, int]:
+        """Read image dimensions from the encoded header without decoding.
+
+        Args:
+            blob: Blob or FunctionResponseBlob holding an image
+
+        Returns:
+            Tuple of (width, height); a full-screen 1440x900 guess if the
+            header can't be parsed
+        """
+        try:
+            with Image.open(io.BytesIO(blob.data)) as image:
+                return image.size
+        except Exception:
+            return 1440, 900
@@ -0,0 +1,181 @@
+"""Lightweight timing spans for the agent's hot path."""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Span:
+    """A timed section of work.
+
+    Attributes:
+        name: Span name (e.g. "model.call", "action.click_at")
+        start: perf_counter time the span started
+        end: perf_counter time the span ended (0.0 while open)
+        attributes: Extra key/value data attached to the span
+        span_id: Identifier unique within the tracer
+        parent_id: Enclosing span on the same thread (None for top level)
+        thread_id: Thread the span ran on
+    """
+
+    name: str
+    start: float
+    end: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    span_id: int = 0
+    parent_id: Optional[int] = None
+    thread_id: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Span length in seconds."""
+        return self.end - self.start
+
+
+class Tracer:
+    """Collects spans and exports them as JSONL or Chrome trace events."""
+
+    def __init__(self, enabled: bool = True):
+        """Initialize tracer.
+
+        Args:
+            enabled: Record spans (False = span() is a cheap no-op)
+        """
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        # Anchor perf_counter to the wall clock so exports carry real timestamps
+        self._wall_origin = time.time()
+        self._perf_origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block.
+
+        Attributes can be added to the yielded span inside the block, e.g.
+        the size of an encoded screenshot.
+
+        Args:
+            name: Span name
+            **attributes: Initial span attributes
+
+        Yields:
+            The open span
+        """
+        if not self.enabled:
+            yield Span(name, 0.0, attributes=attributes)
+            return
+
+        stack = self._local.__dict__.setdefault("stack", [])
+        span = Span(
+            name,
+            time.perf_counter(),
+            attributes=attributes,
+            span_id=next(self._ids),
+            parent_id=stack[-1].span_id if stack else None,
+            thread_id=threading.get_ident(),
+        )
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+
+    def sleep(self, seconds: float, reason: str = "") -> None:
+        """Sleep inside a "sleep" span.
+
+        Args:
+            seconds: Seconds to sleep
+            reason: What the sleep waits for
+        """
+        with self.span("sleep", seconds=seconds, reason=reason):
+            time.sleep(seconds)
+
+    def wall_time(self, perf_time: float) -> float:
+        """Convert a perf_counter reading to a Unix timestamp.
+
+        Args:
+            perf_time: perf_counter value
+
+        Returns:
+            Seconds since the epoch
+        """
+        return self._wall_origin + (perf_time - self._perf_origin)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate span count and time per name.
+
+        Returns:
+            Dictionary of name -> {"count", "total", "max"} (seconds)
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += span.duration
+            entry["max"] = max(entry["max"], span.duration)
+        return totals
+
+    def export_jsonl(self, path: Path) -> None:
+        """Write one JSON object per span.
+
+        Args:
+            path: Output file
+        """
+        with open(path, "w") as f:
+            for span in sorted(self.spans, key=lambda s: s.start):
+                entry = {
+                    "name": span.name,
+                    "start": round(self.wall_time(span.start), 6),
+                    "end": round(self.wall_time(span.end), 6),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "thread_id": span.thread_id,
+                    "attributes": span.attributes,
+                }
+                f.write(json.dumps(entry, default=str) + "\n")
+
+    def export_chrome_trace(self, path: Path) -> None:
+        """Write spans in Chrome trace-event format.
+
+        The file opens in chrome://tracing, Perfetto or speedscope.
+
+        Args:
+            path: Output file
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": round(self.wall_time(span.start) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attributes,
+            }
+            for span in sorted(self.spans, key=lambda s: s.start)
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+# Shared disabled tracer for components constructed without one
+NULL_TRACER = Tracer(enabled=False)
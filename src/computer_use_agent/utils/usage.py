@@ -0,0 +1,129 @@
+"""Per-step and cumulative token and payload accounting."""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class StepUsage:
+    """Tokens and payload of one model call.
+
+    Attributes:
+        step: Agent step number
+        prompt_tokens: Prompt tokens reported by the API
+        output_tokens: Response tokens (candidates plus thinking)
+        cached_tokens: Prompt tokens served from the context cache
+        request_images: Inline images sent with the request
+        request_image_bytes: Bytes of those images
+        request_text_chars: Characters of text sent with the request
+    """
+
+    step: int
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    request_images: int = 0
+    request_image_bytes: int = 0
+    request_text_chars: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Prompt plus output tokens."""
+        return self.prompt_tokens + self.output_tokens
+
+
+class UsageTracker:
+    """Accumulates usage across a run and enforces an optional token budget."""
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """Initialize usage tracker.
+
+        Args:
+            token_budget: Maximum prompt + output tokens for the run (None = no cap)
+        """
+        self.token_budget = token_budget
+        self.steps: List[StepUsage] = []
+
+    def record(
+        self, step: int, usage_metadata: Any, request: Dict[str, Any]
+    ) -> StepUsage:
+        """Record one model call.
+
+        Args:
+            step: Agent step number
+            usage_metadata: response.usage_metadata (may be None)
+            request: Request summary from summarize_contents()
+
+        Returns:
+            Usage of this call
+        """
+        usage = StepUsage(
+            step=step,
+            request_images=request.get("images", 0),
+            request_image_bytes=request.get("image_bytes", 0),
+            request_text_chars=request.get("text_chars", 0),
+        )
+        if usage_metadata is not None:
+            usage.prompt_tokens = usage_metadata.prompt_token_count or 0
+            usage.output_tokens = (usage_metadata.candidates_token_count or 0) + (
+                usage_metadata.thoughts_token_count or 0
+            )
+            usage.cached_tokens = usage_metadata.cached_content_token_count or 0
+        self.steps.append(usage)
+        return usage
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Cumulative prompt tokens."""
+        return sum(usage.prompt_tokens for usage in self.steps)
+
+    @property
+    def output_tokens(self) -> int:
+        """Cumulative output tokens."""
+        return sum(usage.output_tokens for usage in self.steps)
+
+    @property
+    def total_tokens(self) -> int:
+        """Cumulative prompt plus output tokens."""
+        return self.prompt_tokens + self.output_tokens
+
+    @property
+    def image_bytes(self) -> int:
+        """Cumulative inline image bytes sent."""
+        return sum(usage.request_image_bytes for usage in self.steps)
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the token budget has been used up."""
+        return self.token_budget is not None and self.total_tokens >= self.token_budget
+
+    def log_fields(self, usage: StepUsage) -> Dict[str, Any]:
+        """Usage of one call plus running totals, for the LLM log.
+
+        Args:
+            usage: Usage returned by record()
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        return {
+            **asdict(usage),
+            "cumulative_prompt_tokens": self.prompt_tokens,
+            "cumulative_output_tokens": self.output_tokens,
+            "cumulative_image_bytes": self.image_bytes,
+        }
+
+    def summary(self) -> str:
+        """One-line summary for the end of a run.
+
+        Returns:
+            Human-readable usage summary
+        """
+        line = (
+            f"{self.total_tokens:,} tokens ({self.prompt_tokens:,} prompt, "
+            f"{self.output_tokens:,} output) over {len(self.steps)} calls, "
+            f"{self.image_bytes / (1024 * 1024):.1f} MB of screenshots sent"
+        )
+        if self.token_budget is not None:
+            line += f", budget {self.token_budget:,}"
+        return line